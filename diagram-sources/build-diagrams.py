@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Render every circuit diagram script in diagram-sources/ in one go.
+
+Scripts run inside a pool of worker processes, so Python start-up and the
+schemdraw import are paid once per worker instead of once per diagram.
+A script is skipped when its source hash and the installed schemdraw version
+match the cache (.diagram-cache.json) and its outputs still exist. The hash
+also covers the shared helper modules (circuit_templates.py and friends), so
+editing a template rebuilds the scripts.
+
+`Drawing.save` is redirected while a script runs (see diagram_runner.py):
+the SVG is rendered to bytes, compared with the file on disk and only
+written (atomically) when it differs, so unchanged diagrams keep their mtime
+and do not trigger a Docusaurus rebuild.
+
+Usage:
+    python3 build-diagrams.py                     # Build changed diagrams
+    python3 build-diagrams.py --force             # Rebuild everything
+    python3 build-diagrams.py --jobs 4            # Limit worker processes
+    python3 build-diagrams.py render-circuits.py  # Only the given scripts
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import schemdraw
+
+from diagram_runner import (
+    LIBRARY_FILES, SCRIPT_DIR, find_diagram_scripts, find_helper_modules, render_script,
+    source_hash, update_symbol_sheets, write_if_changed,
+)
+from svg_symbols import SHEET_URL
+
+
+CACHE_PATH = SCRIPT_DIR / '.diagram-cache.json'
+
+
+def load_cache():
+    """Return the cached script entries, or {} when built by another schemdraw
+    or for another symbol sheet URL."""
+    try:
+        cache = json.loads(CACHE_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if cache.get('schemdraw') != schemdraw.__version__ or cache.get('sheet_url') != SHEET_URL:
+        return {}
+    return cache.get('scripts', {})
+
+
+def save_cache(entries):
+    cache = {'schemdraw': schemdraw.__version__, 'sheet_url': SHEET_URL,
+             'scripts': dict(sorted(entries.items()))}
+    write_if_changed(CACHE_PATH, (json.dumps(cache, indent=2) + '\n').encode('utf-8'))
+
+
+def is_fresh(entry, digest):
+    """True when a cache entry matches the script hash and its outputs exist."""
+    return (entry is not None
+            and entry.get('sha256') == digest
+            and entry.get('outputs')
+            and all((SCRIPT_DIR / output).exists() for output in entry['outputs']))
+
+
+def build(scripts, jobs=None, force=False):
+    """Render `scripts`, skipping fresh ones. Returns the number of failures."""
+    entries = load_cache()
+    cached = {} if force else dict(entries)
+    helpers = find_helper_modules() + LIBRARY_FILES
+    digests = {script.name: source_hash(script, helpers) for script in scripts}
+
+    stale = [s for s in scripts if not is_fresh(cached.get(s.name), digests[s.name])]
+    for script in scripts:
+        if script not in stale:
+            print(f"  {script.name}: Unchanged (cached)")
+
+    failures = 0
+    all_outputs, symbols = [], {}
+    if stale:
+        workers = min(jobs or os.cpu_count() or 1, len(stale))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for name, outputs, error, used in pool.map(render_script, stale):
+                all_outputs.extend(path for path, _ in outputs)
+                symbols.update(used)
+                if error is not None:
+                    failures += 1
+                    entries.pop(name, None)
+                    print(f"✗ {name}: Error - {error}")
+                    continue
+
+                entries[name] = {
+                    'sha256': digests[name],
+                    'outputs': [os.path.relpath(path, SCRIPT_DIR) for path, _ in outputs],
+                }
+                written = [Path(path).name for path, was_written in outputs if was_written]
+                if written:
+                    print(f"✓ {name}: Wrote {', '.join(written)}")
+                else:
+                    print(f"  {name}: Output unchanged")
+
+    for sheet in update_symbol_sheets(all_outputs, symbols):
+        print(f"✓ Updated {os.path.relpath(sheet, SCRIPT_DIR)}")
+    save_cache(entries)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render all schemdraw diagram scripts.')
+    parser.add_argument('scripts', nargs='*', help='scripts to build (default: all)')
+    parser.add_argument('-j', '--jobs', type=int, default=0, metavar='N',
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='ignore the cache and re-run every script')
+    args = parser.parse_args()
+
+    if args.scripts:
+        scripts = [Path(name).resolve() for name in args.scripts]
+        missing = [str(path) for path in scripts if not path.is_file()]
+        if missing:
+            print(f"Error: not found: {', '.join(missing)}")
+            sys.exit(1)
+    else:
+        scripts = find_diagram_scripts()
+
+    print(f"Building {len(scripts)} diagram(s) with schemdraw {schemdraw.__version__}...\n")
+    if build(scripts, args.jobs, args.force):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Declarative specs for the templated regulator circuits.
+
+Each entry names its template (see circuit_templates.py), the output SVG
+under doc/static/circuits/ and the parts that differ between instances.
+Parts are (designator, value...) tuples; extra values become extra label
+lines.
+"""
+
+BUCK_U2 = {
+    'name': 'buck-u2-diagram',
+    'template': 'buck',
+    'title': 'LM2596S-ADJ Buck Converter: +15V → +13.5V',
+    'ref': 'U2',
+    'vin': '+15V',
+    'vout': '+13.5V',
+    'c_in_bulk': ('C5', '100µF'),
+    'c_in': ('C6', '100nF'),
+    'inductor': ('L1', '100µH', '4.5A'),
+    'r_top': ('R1', '10kΩ'),
+    'r_bottom': ('R2', '1kΩ'),
+    'c_ff': ('C31', '22nF'),
+    'c_out': ('C3', '470µF', '25V'),
+    'diode': ('D1', 'SS34'),
+}
+
+BUCK_U3 = {
+    'name': 'buck-u3-diagram',
+    'template': 'buck',
+    'title': 'LM2596S-ADJ Buck Converter: +15V → +7.5V',
+    'ref': 'U3',
+    'vin': '+15V',
+    'vout': '+7.5V',
+    'c_in_bulk': ('C7', '100µF'),
+    'c_in': ('C8', '100nF'),
+    'inductor': ('L2', '100µH', '4.5A'),
+    'r_top': ('R3', '5.1kΩ'),
+    'r_bottom': ('R4', '1kΩ'),
+    'c_ff': ('C32', '22nF'),
+    'c_out': ('C4', '470µF', '16V'),
+    'diode': ('D2', 'SS34'),
+}
+
+LDO_U6 = {
+    'name': 'ldo-u6-diagram',
+    'template': 'ldo',
+    'title': 'LM7812 Linear Regulator: +13.5V → +12V',
+    'ref': 'U6',
+    'part': 'LM7812',
+    'pins': {'GND': '2', 'IN': '1', 'OUT': '3'},  # TO-263-2
+    'vin': '+13.5V',
+    'vout': '+12V',
+    'c_in_bulk': ('C20', '470µF'),
+    'c_in': ('C14', '470nF'),
+    'c_out': ('C17', '100nF'),
+    'c_out_bulk': ('C21', '470µF'),
+    'ptc': 'PTC1',
+    'tvs': 'TVS1',
+    'led_resistor': ('R7', '1kΩ'),
+    'led': ('LED2', 'Green'),
+}
+
+LDO_U7 = {
+    'name': 'ldo-u7-diagram',
+    'template': 'ldo',
+    'title': 'LM7805 Linear Regulator: +7.5V → +5V',
+    'ref': 'U7',
+    'part': 'LM7805',
+    'pins': {'GND': '2', 'IN': '1', 'OUT': '3'},  # TO-263-2
+    'vin': '+7.5V',
+    'vout': '+5V',
+    'c_in_bulk': ('C22', '470µF'),
+    'c_in': ('C15', '470nF'),
+    'c_out': ('C18', '100nF'),
+    'c_out_bulk': ('C23', '470µF'),
+    'ptc': 'PTC2',
+    'tvs': 'TVS2',
+    'led_resistor': ('R8', '1kΩ'),
+    'led': ('LED3', 'Blue'),
+}
+
+LDO_U8 = {
+    'name': 'ldo-u8-diagram',
+    'template': 'ldo',
+    'title': 'LM7912 Linear Regulator: -13.5V → -12V (Negative Voltage)',
+    'ref': 'U8',
+    'part': 'LM7912',
+    # 79xx NEGATIVE regulator pinout (different from 78xx positive regulators!)
+    'pins': {'GND': '1', 'IN': '2', 'OUT': '3'},  # TO-252-3
+    'vin': '-13.5V',
+    'vout': '-12V',
+    'negative': True,
+    'c_in_bulk': ('C24', '470µF'),
+    'c_in': ('C16', '470nF'),
+    'c_out': ('C19', '100nF'),
+    'c_out_bulk': ('C25', '470µF'),
+    'ptc': 'PTC3',
+    'tvs': 'TVS3',
+    'led_resistor': ('R9', '1kΩ'),
+    'led': ('LED4', 'Red'),
+}
+
+SPECS = [BUCK_U2, BUCK_U3, LDO_U6, LDO_U7, LDO_U8]
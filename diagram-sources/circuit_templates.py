@@ -0,0 +1,279 @@
+"""
+Topology templates for the repeated regulator circuits.
+
+The buck converters (U2, U3) and linear regulators (U6, U7, U8) share one
+layout each and only differ in designators, values, pin numbers and rail
+voltages. Each template draws its topology from a small spec dict (see
+circuit_specs.py), so a fix to the layout applies to every instance.
+
+All drawings use the project style: transparent background, black
+foreground, Arial font.
+"""
+
+import schemdraw
+from schemdraw import elements as elm
+
+from symbol_pins import ic_pins
+
+
+def new_drawing():
+    """Create a Drawing with the shared diagram style."""
+    d = schemdraw.Drawing(
+        font='Arial',         # Sans-serif font
+        fontsize=11,
+        color='black',        # Foreground: black
+        transparent=True,     # Transparent background
+        show=False
+    )
+    d.config(unit=3)
+    return d
+
+
+def part_label(part):
+    """Join a (designator, value...) tuple into a multi-line label."""
+    return '\n'.join(part)
+
+
+def draw_buck(spec):
+    """LM2596S-ADJ buck converter with feedback divider and flyback diode.
+
+    Spec keys: ref, vin, vout, c_in_bulk, c_in, inductor, r_top, r_bottom,
+    c_ff, c_out, diode. Parts are (designator, value...) tuples.
+    """
+    with new_drawing() as d:
+        # IC as in the symbol, with Output on the right and Feedback on top
+        # so the feedback divider sits above the output stage
+        ic = elm.Ic(
+            pins=ic_pins('LM2596S-ADJ', omit=['TAB'],
+                         sides={'Output': 'right', 'Feedback': 'top'}),
+            edgepadW=2.5,
+            edgepadH=0.8,
+            pinspacing=1.0,
+            leadlen=1.0
+        ).label(f"{spec['ref']}\nLM2596S", loc='center', fontsize=10)
+
+        # ON/OFF tied to GND (enable regulator)
+        elm.Line().at(ic.Gnd).to(ic.ONOFF)
+        elm.Dot()
+        elm.Line().down(1.0)
+        elm.Ground()
+
+        # Input rail: straight horizontal line at Vin level
+        # Vin -> dot -> dot -> junction3
+        junction_y = ic.Vin[1]
+        elm.Dot(open=True).at((ic.Vin[0] - 5.5, junction_y)).label(spec['vin'], loc='left')
+
+        elm.Line().right(0.5)
+        elm.Dot()
+        d.push()
+
+        elm.Line().right(2.0)
+        elm.Dot()
+        d.push()
+
+        elm.Line().right(2.0)
+        junction3 = d.here
+
+        # Connect junction3 to Vin
+        elm.Line().at(junction3).to(ic.Vin)
+
+        # Input decoupling cap (closer to IC - high-freq decoupling)
+        d.pop()
+        elm.Capacitor().down(2.0).label(part_label(spec['c_in']), loc='bot')
+        elm.Ground()
+
+        # Bulk input cap (farther from IC - bulk filtering, electrolytic)
+        d.pop()
+        elm.Capacitor(polar=True).down(2.0).label(part_label(spec['c_in_bulk']), loc='bot')
+        elm.Ground()
+
+        # Output stage from Output pin
+        elm.Line().at(ic.Output).right(0.5)
+        elm.Dot()
+        d.push()
+
+        elm.Inductor().right(2.5).label(part_label(spec['inductor']), loc='top', ofst=0.2)
+        elm.Dot()
+        d.push()
+
+        elm.Line().right(1.0)  # Half distance to center
+        elm.Dot()  # Junction for feedback network
+        d.push()
+
+        elm.Line().right(1.0)  # Remaining half to the output
+        elm.Dot(open=True).label(spec['vout'], loc='right')
+
+        # Return from feedback junction to add voltage divider
+        d.pop()
+
+        # Feedback voltage divider network (r_top || c_ff in parallel, then r_bottom)
+        elm.Line().up(4)
+        elm.Dot()
+        d.push()  # Save position before r_top for the parallel c_ff capacitor
+
+        elm.Resistor(scale=0.7).left().label(part_label(spec['r_top']), loc='bot', ofst=0.5)
+        r_top_end = d.here
+        d.push()  # Save position after r_top (this is the Tap)
+
+        elm.Dot()  # Tap junction for FB connection
+        d.push()  # Save tap position for FB connection
+
+        elm.Resistor(scale=0.7).left().label(part_label(spec['r_bottom']), loc='bot', ofst=0.5)
+        elm.Line().left(0.2)
+        elm.Line().down(0.2)
+        elm.Ground()
+
+        # Connect tap junction to the Feedback pin
+        d.pop()
+        elm.Wire('|-').to(ic.Feedback)
+
+        # c_ff capacitor in parallel with r_top (feedback compensation)
+        d.pop()  # Return to r_top_end
+        d.pop()  # Return to r_top start (the dot junction)
+        elm.Line().up(2)
+        elm.Capacitor().left().label(part_label(spec['c_ff']), loc='top', ofst=0.3)
+        elm.Line().to(r_top_end)
+
+        # Output capacitor (from output junction - right side, electrolytic)
+        d.pop()
+        elm.Capacitor(polar=True).down(2.0).label(part_label(spec['c_out']), loc='bot', ofst=0.5)
+        elm.Ground()
+
+        # Flyback diode (from switching node - left side, facing up)
+        d.pop()
+        elm.Diode().down(2.0).reverse().label(part_label(spec['diode']), loc='top')
+        elm.Ground()
+
+    return d
+
+
+def draw_ldo(spec):
+    """78xx/79xx linear regulator with input/output caps, PTC, TVS and LED.
+
+    Spec keys: ref, part, pins (GND/IN/OUT pin numbers), vin, vout,
+    c_in_bulk, c_in, c_out, c_out_bulk, ptc, tvs, led_resistor, led and
+    negative. A negative rail flips the electrolytics, TVS and LED.
+    """
+    negative = spec.get('negative', False)
+    pins = spec['pins']
+
+    with new_drawing() as d:
+        # Regulator IC (3-pin)
+        ic = elm.Ic(
+            pins=[
+                elm.IcPin(name='GND', pin=pins['GND'], side='left', slot='1/2'),
+                elm.IcPin(name='IN', pin=pins['IN'], side='left', slot='2/2'),
+                elm.IcPin(name='OUT', pin=pins['OUT'], side='right', slot='1/1'),
+            ],
+            edgepadW=2.0,
+            edgepadH=0.8,
+            pinspacing=1.0,
+            leadlen=1.0
+        ).label(f"{spec['ref']}\n{spec['part']}", loc='center', fontsize=14)
+
+        # GND connection
+        elm.Line().at(ic.GND).down(1.0)
+        elm.Ground()
+
+        # Input rail with capacitors (bulk farther, ceramic closer to IC)
+        junction_y = ic.IN[1]
+        elm.Dot(open=True).at((ic.IN[0] - 5, junction_y)).label(spec['vin'], loc='left')
+
+        elm.Line().right(1)
+        elm.Dot()
+        d.push()
+
+        elm.Line().right(2.0)
+        elm.Dot()
+        d.push()
+
+        elm.Line().right(2.0)
+        junction3 = d.here
+
+        # Connect junction3 to IN
+        elm.Line().at(junction3).to(ic.IN)
+
+        # Ceramic input cap (closer to IC - high-freq filtering)
+        d.pop()
+        elm.Capacitor().down(2.0).label(part_label(spec['c_in']), loc='bot')
+        elm.Ground()
+
+        # Bulk input cap (farther from IC - electrolytic, reversed on a negative rail)
+        d.pop()
+        cap = elm.Capacitor(polar=True).down(2.0)
+        if negative:
+            cap.reverse()
+        cap.label(part_label(spec['c_in_bulk']), loc='bot')
+        elm.Ground()
+
+        # Output rail with capacitors (ceramic closer, bulk farther from IC)
+        elm.Line().at(ic.OUT).right(0.2)
+        elm.Dot()
+        d.push()
+
+        elm.Line().right(2.0)
+        elm.Dot()
+        output_junction2 = d.here
+
+        # Bulk output cap (farther from IC - electrolytic, reversed on a negative rail)
+        cap = elm.Capacitor(polar=True).down(2.0)
+        if negative:
+            cap.reverse()
+        cap.label(part_label(spec['c_out_bulk']), loc='bot')
+        elm.Ground()
+
+        # Ceramic output cap (closer to IC - high-freq filtering)
+        d.pop()
+        elm.Capacitor().down(2.0).label(part_label(spec['c_out']), loc='bot')
+        elm.Ground()
+
+        # Protection circuit: PTC fuse + TVS diode
+        elm.Line().at(output_junction2).right(1.0)
+        elm.Dot()
+        to_led_junction = d.here
+
+        elm.Line().right(1)
+        elm.Fuse().right(1.5).label(spec['ptc'], loc='top')
+
+        elm.Line().right(1)
+        elm.Dot()
+        d.push()
+
+        # TVS diode: cathode towards the rail on a positive output,
+        # anode towards the rail on a negative one
+        tvs = elm.Zener().down(2.0)
+        if not negative:
+            tvs.reverse()
+        tvs.label(spec['tvs'], loc='right', ofst=(1, -1))
+        elm.Ground()
+
+        # Output label
+        d.pop()
+        elm.Line().right(1.0)
+        elm.Dot(open=True).label(f"{spec['vout']}\nOUT", loc='top', ofst=(0, 0.3))
+
+        # Status LED indicator (reversed on a negative rail)
+        elm.Line().at(to_led_junction).up(4.0)
+        elm.Line().left(1)
+        elm.Resistor(scale=0.7).left(1.0).label(part_label(spec['led_resistor']), loc='top', ofst=0.3)
+        elm.Line().left(1)
+        led = elm.LED().left(1.0)
+        if negative:
+            led.reverse()
+        led.label(part_label(spec['led']), loc='top', ofst=0.3)
+        elm.Line().left(1)
+        elm.Line().down(0.5)
+        elm.Ground()
+
+    return d
+
+
+TEMPLATES = {
+    'buck': draw_buck,
+    'ldo': draw_ldo,
+}
+
+
+def draw(spec):
+    """Draw a spec with the template named by its 'template' key."""
+    return TEMPLATES[spec['template']](spec)
@@ -7,6 +7,8 @@ Complete circuit with transparent background, black foreground, Arial font
 import schemdraw
 from schemdraw import elements as elm
 
+from symbol_pins import ic_pins
+
 with schemdraw.Drawing(
     font='Arial',         # Sans-serif font
     fontsize=11,
@@ -15,150 +17,117 @@ with schemdraw.Drawing(
 ) as d:
     d.config(unit=3)
 
-    # J1 USB-C Connector (6-pin power-only) - Flipped order with spacing (top to bottom)
-    # Height matched to U1: 12 units, using /14 slots for maximum spacing between CC2 and GND
-    j1 = elm.Ic(
-        pins=[
-            elm.IcPin(name='GND2', pin='6', side='right', slot='1/15'),
-            elm.IcPin(name='GND1', pin='5', side='right', slot='2/15'),
-            elm.IcPin(name='CC2', pin='4', side='right', slot='8/15'),  # Increased gap: 2->7 (5 slots)
-            elm.IcPin(name='CC1', pin='3', side='right', slot='9/15'),
-            elm.IcPin(name='VBUS2', pin='2', side='right', slot='14/15'),
-            elm.IcPin(name='VBUS1', pin='1', side='right', slot='15/15'),
-        ],
-        size=(3, 12),  # Explicit size: width=2, height=12
+    # U1 CH224D IC (QFN-20) - USB PD Sink Controller, laid out as its symbol:
+    # CC, config and VBUS pins on the left, VDD and GND on the right
+    u1 = elm.Ic(
+        pins=ic_pins('CH224D_C3975094', omit=['NC'], lblsize=12),
+        pinspacing=0.6,
+        edgepadW=2.5,
         leadlen=1.0
-    ).label('J1\nUSB-C', loc='center', fontsize=14, ofst=(-0.5, 1))
+    ).label('U1\nCH224D', loc='center', fontsize=14, ofst=(0.5, 0))
 
-    # U1 CH224D IC (QFN-20) - USB PD Sink Controller
-    # Left side pins aligned with J1 matching pins
-    u1 = elm.Ic(
+    # VBUS leaves U1 downwards (three pin pitches) to a rail below the
+    # local CFG/NMOS wiring
+    elm.Line().at(u1.VBUS).down(1.8)
+    vbus_rail = elm.Dot()
+
+    # J1 USB-C Connector (6-pin power-only), pins aligned with U1 CC1/CC2 and
+    # the VBUS rail (same 0.6 pin spacing as U1)
+    j1 = elm.Ic(
         pins=[
-            # Left side pins - aligned by function with J1 (using /14 slots to match J1)
-            elm.IcPin(name='GND', pin='0', side='left', slot='2/15'),    # Aligned with J1 GND1
-            elm.IcPin(name='CC2', pin='10', side='left', slot='8/15'),   # Aligned with J1 CC2
-            elm.IcPin(name='CC1', pin='11', side='left', slot='9/15'),   # Aligned with J1 CC1
-            elm.IcPin(name='VBUS', pin='2', side='left', slot='15/15'),  # Aligned with J1 VBUS1
-            # Right side pins (top to bottom)
-            elm.IcPin(name='GATE', pin='5', side='right', slot='12/12'),
-            elm.IcPin(name='NMOS#', pin='6', side='right', slot='11/12'),
-            elm.IcPin(name='ISP', pin='14', side='right', slot='10/12'),
-            elm.IcPin(name='ISN', pin='15', side='right', slot='9/12'),
-            elm.IcPin(name='DRV', pin='1', side='right', slot='8/12'),
-            elm.IcPin(name='CFG1', pin='19', side='right', slot='7/12'),
-            elm.IcPin(name='CFG2', pin='13', side='right', slot='6/12'),
-            elm.IcPin(name='CFG3', pin='12', side='right', slot='5/12'),
-            elm.IcPin(name='DP', pin='8', side='right', slot='4/12'),
-            elm.IcPin(name='DM', pin='9', side='right', slot='3/12'),
-            elm.IcPin(name='VDD', pin='7', side='right', slot='1/12'),  # Internal regulator output
+            elm.IcPin(name='CC1', pin='3', side='right', slot='28/28'),
+            elm.IcPin(name='CC2', pin='4', side='right', slot='27/28'),
+            elm.IcPin(name='VBUS1', pin='1', side='right', slot='5/28'),
+            elm.IcPin(name='VBUS2', pin='2', side='right', slot='4/28'),
+            elm.IcPin(name='GND1', pin='5', side='right', slot='2/28'),
+            elm.IcPin(name='GND2', pin='6', side='right', slot='1/28'),
         ],
-        size=(4, 12),  # Explicit size to match J1 height
+        pinspacing=0.6,
+        edgepadW=1.0,
         leadlen=1.0
-    ).anchor('center').at((j1.VBUS1[0] + 10.0, j1.center[1])).label('U1\nCH224D', loc='center', fontsize=14, ofst=(-0.5, 1))
+    ).theta(0).anchor('CC1').at((u1.CC1[0] - 11.0, u1.CC1[1])).label('J1\nUSB-C', loc='center', fontsize=14)
 
-    # VBUS connection: J1 VBUS1 - dot - dot - dot - dot - U1 VBUS
-    elm.Dot().at(j1.VBUS1)  # First dot at J1 VBUS1
+    # VBUS rail: J1 VBUS1 - C1 - C2 - U1 VBUS - output
+    elm.Line().at(j1.VBUS2).to(j1.VBUS1)
+    elm.Dot().at(j1.VBUS1)
     elm.Line().right(2.0)
-    elm.Dot()  # Second dot
+    elm.Dot()  # to C1
     d.push()
-    elm.Line().down(0.1)
-    elm.Capacitor().label('C1\n10µF\n50V', loc='bot', ofst=-1.7)
+    elm.Capacitor().down(2.0).label('C1\n10µF\n50V', loc='bot', ofst=0.2)
     elm.Ground()
     d.pop()
 
     elm.Line().right(2.0)
-    elm.Dot()  # Third dot
+    elm.Dot()  # to C2
     d.push()
-    elm.Line().down(0.1)
-    elm.Capacitor().label('C2\n100nF\n50V', loc='bot', ofst=0.2)
+    elm.Capacitor().down(2.0).label('C2\n100nF\n50V', loc='bot', ofst=0.2)
     elm.Ground()
-
-    d.pop()
-    elm.Line().right(2.0)
-    elm.Dot()  # Fourth dot
-    d.push()
-    elm.Line().up(2.5)
-    elm.Dot(open=True).label('OUT\n+5V first\n+15V\nafter init', loc='right', ofst=(0.2, -1.0))
-
     d.pop()
-    elm.Line().to(u1.VBUS)  # Connect to U1 VBUS
 
-    # Connect J1 VBUS2 to the first dot
-    elm.Line().at(j1.VBUS2).to(j1.VBUS1)
-
-    # GND connection: J1 GND1 - dot - - - dot - U1 GND
-    elm.Dot().at(j1.GND1)  # First dot at J1 GND1
-    elm.Line().right(6.0)
-    elm.Dot()  # Final dot
-    d.push()  # Save position for GND symbol
-    elm.Line().to(u1.GND)  # Connect to U1 GND
+    elm.Line().tox(vbus_rail.start)
+    elm.Line().at(vbus_rail.start).right(3.0)
+    elm.Dot(open=True).label('OUT\n+5V first\n+15V\nafter init', loc='right', ofst=(0.2, 0))
 
-    # GND symbol from final dot
-    d.pop()
-    elm.Line().down(1.0)
-    elm.Ground()
-
-    # Connect J1 GND2 to the first dot
+    # J1 GND pins to ground
     elm.Line().at(j1.GND2).to(j1.GND1)
+    elm.Line().at(j1.GND2).right(1.0)
+    elm.Line().down(0.5)
+    elm.Ground()
 
-    ## CC1 to CC1
+    # CC lines with 5.1kΩ pull-downs (identify the device as a PD sink)
     elm.Line().at(j1.CC1).right(4.0)
-    elm.Dot() # to R12
-    d.push()  # Save position for U1 CC1 connection
-    elm.Line().down(0.4)
+    elm.Dot()  # to R12
+    d.push()
     elm.Resistor(scale=0.7).down().label('R12\n5.1kΩ', loc='bot', ofst=0.5)
-    elm.Line().down(0.1)
     elm.Ground()
-
-    # Connect dot to U1 CC1
     d.pop()
     elm.Line().to(u1.CC1)
 
-    ## CC2 to CC2
     elm.Line().at(j1.CC2).right(2.0)
-    elm.Dot()
-    d.push()  # Save position for U1 CC2 connection
-    elm.Line().down(0.1)
-    elm.Resistor(scale=0.7).down().label('R13\n5.1kΩ', loc='bot', ofst=-2.2)
-    elm.Line().down(0.1)
-    elm.Ground()  # Removed flip()
-
-    # Connect dot to U1 CC2
+    elm.Dot()  # to R13
+    d.push()
+    elm.Resistor(scale=0.7).down().label('R13\n5.1kΩ', loc='bot', ofst=0.5)
+    elm.Ground()
     d.pop()
     elm.Line().to(u1.CC2)
 
-    # Connect U1 DM to DP
-    elm.Dot().at(u1.DP)
-    elm.Line().to(u1.DM)
-
-    # NMOS# pin (pin 6) to GND
-    elm.Line().at(getattr(u1, 'NMOS#')).right(1)
-    elm.Line().down(0.5)
+    # ISP and ISN shorted to GND (no current sensing)
+    elm.Line().at(u1.ISN).to(u1.ISP)
+    elm.Dot()
+    elm.Line().left(1.0)
+    elm.Line().down(0.3)
     elm.Ground()
 
-    elm.Dot().at(u1.ISN)
+    # DRV to CFG1, then through R11 (Rset) to GND for 15V
+    elm.Line().at(u1.CFG1).left(1.0)
+    elm.Line().toy(u1.DRV)
+    elm.Dot()
     d.push()
-    elm.Line().to(u1.ISP)
-
+    elm.Line().to(u1.DRV)
     d.pop()
-    elm.Line().right(2)
-    elm.Line().down(0.5)
+    elm.Line().left(1.5)
+    elm.Resistor(scale=0.7).down().label('R11\n56kΩ', loc='bot', ofst=0.5)
     elm.Ground()
 
-    elm.Dot().at(u1.CFG1)
-    d.push()
-    elm.Line().to(u1.DRV)
+    # DP shorted to DM (PD-only mode)
+    elm.Dot().at(u1.DP)
+    elm.Line().to(u1.DM)
 
-    d.pop()
-    elm.Line().right(3.5)
-    elm.Resistor(scale=0.7).down().label('R11\n56kΩ', loc='bot', ofst=-2.1)
+    # NMOS# pin to GND (internal switch mode)
+    elm.Line().at(u1.NMOS).left(1.0)
+    elm.Line().down(0.3)
     elm.Ground()
 
-    # VDD pin (pin 7) with 1µF decoupling capacitor
+    # VDD pin with 1µF decoupling capacitor
     elm.Line().at(u1.VDD).right(1.0)
     elm.Capacitor().down(2.0).label('C30\n1µF', loc='bot', ofst=0.5)
     elm.Ground()
 
+    # GND pin (exposed pad)
+    elm.Line().at(u1.GND).right(1.0)
+    elm.Line().down(0.5)
+    elm.Ground()
+
     # Save to doc/static/circuits/
     import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
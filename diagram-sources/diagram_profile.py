@@ -0,0 +1,210 @@
+"""
+Opt-in render profiling for the schemdraw diagram scripts.
+
+While a RenderProfiler is active, schemdraw is instrumented so that every
+diagram records where its time goes:
+
+    construct:<Element>   building an element (elm.Ic(...), elm.Resistor(...))
+    place:<Element>       placing it in the drawing (layout, anchors)
+    label:<text>          placing one label on an element
+    text-size             measuring label text (nested in place/label/save)
+    save                  Drawing.save / get_imagedata
+    bbox                  sizing the whole drawing (in save)
+    draw:<Element>        drawing one element onto the SVG figure (in save)
+    serialize             turning the figure into SVG bytes (in save)
+
+Times are recorded as self time per call stack, so the totals can be written
+in the collapsed-stack format read by flamegraph.pl, speedscope and inferno
+(`frame;frame;frame <microseconds>`). Nothing is patched outside the `with`
+block, so the normal build is unaffected.
+"""
+
+import contextlib
+import time
+from collections import Counter
+
+from schemdraw import Drawing
+from schemdraw.backends import svg as svg_backend
+from schemdraw.elements import Element
+
+
+MAX_LABEL_LENGTH = 40
+
+
+def all_subclasses(cls):
+    """Return `cls` and every (transitive) subclass currently defined."""
+    found = [cls]
+    for sub in cls.__subclasses__():
+        found.extend(all_subclasses(sub))
+    return found
+
+
+def label_key(text):
+    """Make a label usable as one flame-graph frame name."""
+    if isinstance(text, (list, tuple)):
+        text = ' '.join(str(part) for part in text)
+    key = ' '.join(str(text).split()).replace(';', ',')
+    if len(key) > MAX_LABEL_LENGTH:
+        key = key[:MAX_LABEL_LENGTH - 1] + '…'
+    return f'label:{key}'
+
+
+class RenderProfiler:
+    """Context manager that times schemdraw work per element type and label.
+
+    Use `run(name)` around each diagram script so its frames are grouped
+    under the script name:
+
+        with RenderProfiler() as profiler:
+            with profiler.run('diagram1-usb-pd.py'):
+                render_script(...)
+        profiler.write_collapsed('profile.folded')
+    """
+
+    def __init__(self):
+        self.collapsed = Counter()   # stack tuple -> self time (seconds)
+        self.inclusive = Counter()   # frame name -> inclusive time (seconds)
+        self.calls = Counter()       # frame name -> call count
+        self._stack = []             # [name, start, child s, detached, excluded s]
+        self._constructing = set()   # ids of elements inside __init__
+        self._patches = []
+
+    # -- timing -------------------------------------------------------------
+
+    def _enter(self, name, detach=False):
+        self._stack.append([name, time.perf_counter(), 0.0, detach, 0.0])
+
+    def _exit(self):
+        name, start, child, detach, excluded = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        if self._stack:
+            parent = self._stack[-1]
+            parent[2] += elapsed
+            # Detached work is not part of the enclosing frames' totals
+            parent[4] += elapsed if detach else excluded
+        self.inclusive[name] += elapsed - excluded
+        self.calls[name] += 1
+        self.collapsed[self._path(name, detach)] += elapsed - child
+
+    def _path(self, name, detach):
+        """Stack of frame names for the frame being closed.
+
+        Detached frames (element placement) hang off the root frame: schemdraw
+        places an element lazily, when the *next* one is constructed, and that
+        work does not belong to the next element's constructor.
+        """
+        start = len(self._stack) if detach else next(
+            (i for i in range(len(self._stack) - 1, -1, -1) if self._stack[i][3]), 0)
+        names = [frame[0] for frame in self._stack[start:]]
+        if start > 0:
+            names.insert(0, self._stack[0][0])
+        return tuple(names) + (name,)
+
+    @contextlib.contextmanager
+    def run(self, name):
+        """Group everything recorded inside the block under `name`."""
+        self._enter(name)
+        try:
+            yield self
+        finally:
+            self._exit()
+
+    # -- instrumentation ----------------------------------------------------
+
+    def hook(self, owner, attr, frame):
+        """Also time `owner.attr` (a function or method) as `frame`.
+
+        For callers that render through their own code paths; must be called
+        inside the with-block, and is undone on exit like the built-in hooks.
+        """
+        self._wrap(owner, attr, lambda *a, **k: frame)
+
+    def _wrap(self, owner, attr, frame_name, detach=False):
+        original = owner.__dict__[attr]
+        profiler = self
+
+        def wrapper(*args, **kwargs):
+            profiler._enter(frame_name(*args, **kwargs), detach)
+            try:
+                return original(*args, **kwargs)
+            finally:
+                profiler._exit()
+
+        wrapper.__wrapped__ = original
+        self._patches.append((owner, attr, original))
+        setattr(owner, attr, wrapper)
+
+    def _wrap_init(self, cls):
+        original = cls.__dict__['__init__']
+        profiler = self
+
+        def __init__(element, *args, **kwargs):
+            # Only the outermost __init__ of a super() chain is timed
+            key = id(element)
+            if key in profiler._constructing:
+                return original(element, *args, **kwargs)
+            profiler._constructing.add(key)
+            profiler._enter(f'construct:{type(element).__name__}')
+            try:
+                return original(element, *args, **kwargs)
+            finally:
+                profiler._exit()
+                profiler._constructing.discard(key)
+
+        __init__.__wrapped__ = original
+        self._patches.append((cls, '__init__', original))
+        cls.__init__ = __init__
+
+    def __enter__(self):
+        for cls in all_subclasses(Element):
+            if '__init__' in cls.__dict__:
+                self._wrap_init(cls)
+        self._wrap(Drawing, 'add', lambda dwg, element: f'place:{type(element).__name__}',
+                   detach=True)
+        self._wrap(Element, '_place_label', lambda element, label, *a, **k: label_key(label.label))
+        self._wrap(Element, '_draw', lambda element, *a, **k: f'draw:{type(element).__name__}')
+        self._wrap(Drawing, 'save', lambda *a, **k: 'save')
+        self._wrap(Drawing, 'get_imagedata', lambda *a, **k: 'save')
+        self._wrap(Drawing, 'get_bbox', lambda *a, **k: 'bbox')
+        self._wrap(svg_backend.Figure, 'getimage', lambda *a, **k: 'serialize')
+        # segments.py calls svg.text_size through the module attribute
+        original_text_size = svg_backend.text_size
+        self._patches.append((svg_backend, 'text_size', original_text_size))
+
+        def text_size(*args, **kwargs):
+            self._enter('text-size')
+            try:
+                return original_text_size(*args, **kwargs)
+            finally:
+                self._exit()
+
+        svg_backend.text_size = text_size
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for owner, attr, original in reversed(self._patches):
+            setattr(owner, attr, original)
+        self._patches.clear()
+
+    # -- output -------------------------------------------------------------
+
+    def collapsed_lines(self):
+        """Lines in collapsed-stack format, in microseconds, heaviest first."""
+        lines = []
+        for stack, seconds in self.collapsed.most_common():
+            micros = round(seconds * 1e6)
+            if micros > 0:
+                lines.append(f"{';'.join(stack)} {micros}")
+        return lines
+
+    def write_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.collapsed_lines()) + '\n')
+
+    def summary(self, prefixes=('construct:', 'place:', 'label:', 'draw:', 'save', 'bbox',
+                                'serialize', 'symbols', 'text-size')):
+        """Return (frame name, calls, inclusive seconds) rows, slowest first."""
+        rows = [(name, self.calls[name], seconds)
+                for name, seconds in self.inclusive.items()
+                if name.startswith(prefixes)]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
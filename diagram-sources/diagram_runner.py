@@ -0,0 +1,161 @@
+"""
+Shared machinery for running the diagram scripts in a warm process.
+
+Used by build-diagrams.py (process pool) and watch-diagrams.py (single
+long-lived process). A script is executed with runpy while schemdraw's
+`Drawing.save` is redirected to write the SVG atomically, and only when its
+bytes changed.
+"""
+
+import contextlib
+import hashlib
+import io
+import os
+import runpy
+import sys
+from pathlib import Path
+
+import schemdraw
+
+from svg_symbols import SHEET_NAME, render_svg, updated_sheet
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+# Data files read by helper modules (symbol_pins.py); hashed with the
+# helpers, so editing a symbol re-renders the diagrams
+LIBRARY_FILES = [SCRIPT_DIR.parent / 'symbols' / 'zudo-pd.kicad_sym']
+# Hyphen-named scripts in this directory that are tools, not diagrams
+TOOL_SCRIPTS = {'build-diagrams.py', 'diff-diagrams.py', 'profile-diagrams.py', 'watch-diagrams.py'}
+
+# Paths passed to Drawing.save by the script currently running, and the
+# shared symbols its SVGs reference
+_saved_outputs = []
+_used_symbols = {}
+
+
+def find_diagram_scripts(directory=SCRIPT_DIR):
+    """Return the diagram scripts: hyphen-named .py files that are not tools.
+
+    Importable helper modules use underscores and are never picked up.
+    """
+    return sorted(
+        path for path in directory.glob('*.py')
+        if '-' in path.stem and path.name not in TOOL_SCRIPTS
+    )
+
+
+def find_helper_modules(directory=SCRIPT_DIR):
+    """Return the importable helper modules shared by the diagram scripts."""
+    return sorted(path for path in directory.glob('*.py') if '-' not in path.stem)
+
+
+def source_hash(path, helpers=()):
+    """Hash a script together with the helper modules it may import."""
+    digest = hashlib.sha256(path.read_bytes())
+    for helper in helpers:
+        digest.update(helper.name.encode('utf-8'))
+        digest.update(helper.read_bytes())
+    return digest.hexdigest()
+
+
+def write_if_changed(path, data):
+    """Atomically write `data` to `path` unless it already holds those bytes.
+
+    Returns True when the file was written.
+    """
+    path = Path(path)
+    mode = None
+    try:
+        if path.read_bytes() == data:
+            return False
+        mode = path.stat().st_mode
+    except FileNotFoundError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_bytes(data)
+    if mode is not None:
+        os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+    return True
+
+
+_original_save = schemdraw.Drawing.save
+
+
+def _save_if_changed(self, fname, transparent=True, dpi=72):
+    """Replacement for schemdraw.Drawing.save used while building."""
+    path = Path(fname).resolve()
+    ext = path.suffix.lower().lstrip('.')
+    if ext != 'svg':
+        _original_save(self, fname, transparent=transparent, dpi=dpi)
+        _saved_outputs.append((str(path), True))
+        return
+    data, symbols = render_svg(self)
+    written = write_if_changed(path, data)
+    _saved_outputs.append((str(path), written))
+    _used_symbols.update(symbols)
+
+
+def forget_helper_modules(directory=SCRIPT_DIR):
+    """Drop imported helper modules from `directory` so they are re-imported.
+
+    Keeps a long-lived process (build worker or watcher) from rendering with
+    a stale template after the file changed.
+    """
+    directory = Path(directory).resolve()
+    helpers = {path.stem for path in find_helper_modules(directory)}
+    helpers.discard(__name__)
+    for name in helpers & set(sys.modules):
+        path = getattr(sys.modules[name], '__file__', None)
+        if path and Path(path).resolve().parent == directory:
+            del sys.modules[name]
+
+
+def render_script(script_path):
+    """Run one diagram script in this process.
+
+    Returns (script name, outputs, error, symbols); outputs is a list of
+    (output path, written) pairs and symbols maps the ids of the shared
+    symbols the SVGs use to their markup (see update_symbol_sheets). The
+    script's own stdout is discarded and it sees no command-line arguments,
+    as if run as `python3 script.py`.
+    """
+    script_path = Path(script_path).resolve()
+    if str(script_path.parent) not in sys.path:
+        sys.path.insert(0, str(script_path.parent))
+    forget_helper_modules(script_path.parent)
+    _saved_outputs.clear()
+    _used_symbols.clear()
+    saved_argv = sys.argv
+    sys.argv = [str(script_path)]
+    schemdraw.Drawing.save = _save_if_changed
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(str(script_path), run_name='__main__')
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            return (script_path.name, list(_saved_outputs), f'exited with status {e.code}',
+                    dict(_used_symbols))
+    except Exception as e:
+        return (script_path.name, list(_saved_outputs), f'{type(e).__name__}: {e}',
+                dict(_used_symbols))
+    finally:
+        schemdraw.Drawing.save = _original_save
+        sys.argv = saved_argv
+    return script_path.name, list(_saved_outputs), None, dict(_used_symbols)
+
+
+def update_symbol_sheets(outputs, symbols):
+    """Rewrite the symbol sheet next to each output SVG if it changed.
+
+    Called once by the parent process after rendering, so concurrent build
+    workers never race on the sheet. Returns the sheets that were written.
+    """
+    written = []
+    for directory in sorted({Path(path).parent for path in outputs if path.endswith('.svg')}):
+        sheet = directory / SHEET_NAME
+        if write_if_changed(sheet, updated_sheet(directory, symbols)):
+            written.append(sheet)
+    return written
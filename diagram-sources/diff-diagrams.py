@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Structural regression diff for the generated circuit SVGs.
+
+Both versions of every SVG in doc/static/circuits/ are reduced to normalised
+primitives: line segments (from paths and polygons, direction-free), circles
+and text labels with their positions. `<use>` references into the shared
+symbol sheet are expanded first, so switching between inline and symbol
+output is not a change. The primitives are then compared with a tolerance,
+which reports moved, missing and new labels (e.g. 'C31 / 22nF') and counts
+changed shapes per diagram, instead of eyeballing the Docusaurus page.
+
+The old side is read straight from git (one `git cat-file --batch` for all
+files), so the whole set is compared in a few tens of milliseconds; the exit
+status is 1 when anything changed, for use in hooks and CI.
+
+Usage:
+    python3 diff-diagrams.py                       # HEAD vs working tree
+    python3 diff-diagrams.py --rev HEAD~3          # Another revision
+    python3 diff-diagrams.py --old-dir /tmp/before # Compare two directories
+    python3 diff-diagrams.py --tolerance 1.0       # Looser match (SVG pt)
+"""
+
+import argparse
+import math
+import re
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from pathlib import Path
+
+from svg_symbols import SHEET_NAME
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+CIRCUITS_DIR = SCRIPT_DIR.parent / 'doc' / 'static' / 'circuits'
+DEFAULT_TOLERANCE = 0.5   # SVG points
+MAX_DETAILS = 10          # Label changes listed per diagram
+MAX_SHAPE_DETAILS = 3     # Removed/added shapes listed per diagram
+
+NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+PATH_TOKEN_RE = re.compile(r'[MLAZmlaz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+TRANSFORM_RE = re.compile(r'(\w+)\s*\(([^)]*)\)')
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+# -- geometry ---------------------------------------------------------------
+
+def multiply(m, n):
+    """Compose two SVG affine matrices (a, b, c, d, e, f): m after n."""
+    a, b, c, d, e, f = m
+    g, h, i, j, k, l = n
+    return (a * g + c * h, b * g + d * h, a * i + c * j, b * i + d * j,
+            a * k + c * l + e, b * k + d * l + f)
+
+
+def parse_transform(text):
+    """Parse the translate/rotate/scale/matrix subset of an SVG transform."""
+    matrix = IDENTITY
+    for name, args in TRANSFORM_RE.findall(text or ''):
+        v = [float(x) for x in NUMBER_RE.findall(args)]
+        if name == 'translate':
+            step = (1, 0, 0, 1, v[0], v[1] if len(v) > 1 else 0)
+        elif name == 'scale':
+            step = (v[0], 0, 0, v[1] if len(v) > 1 else v[0], 0, 0)
+        elif name == 'rotate':
+            r = math.radians(v[0])
+            step = (math.cos(r), math.sin(r), -math.sin(r), math.cos(r), 0, 0)
+            if len(v) == 3:
+                step = multiply(multiply((1, 0, 0, 1, v[1], v[2]), step), (1, 0, 0, 1, -v[1], -v[2]))
+        elif name == 'matrix':
+            step = tuple(v[:6])
+        else:
+            continue
+        matrix = multiply(matrix, step)
+    return matrix
+
+
+def apply(matrix, x, y):
+    a, b, c, d, e, f = matrix
+    return (a * x + c * y + e, b * x + d * y + f)
+
+
+def path_points(d):
+    """Split path data into subpaths of absolute points.
+
+    Handles the commands schemdraw writes (M, L, A and Z, absolute or
+    relative). An arc contributes its end point, so it is compared by its
+    chord.
+    """
+    subpaths, current = [], []
+    x = y = 0.0
+    start = (0.0, 0.0)
+    tokens = PATH_TOKEN_RE.findall(d)
+    i, command = 0, 'M'
+    while i < len(tokens):
+        token = tokens[i]
+        if token.isalpha():
+            command = token
+            i += 1
+            if command in 'Zz' and current:
+                current.append(start)
+                x, y = start
+            continue
+        arity = 7 if command in 'Aa' else 2
+        values = [float(v) for v in tokens[i:i + arity]]
+        i += arity
+        dx, dy = values[-2], values[-1]
+        if command.islower():
+            dx, dy = x + dx, y + dy
+        x, y = dx, dy
+        if command in 'Mm':
+            if len(current) > 1:
+                subpaths.append(current)
+            current, start = [(x, y)], (x, y)
+            command = 'l' if command == 'm' else 'L'   # Implicit lineto
+        else:
+            current.append((x, y))
+    if len(current) > 1:
+        subpaths.append(current)
+    return subpaths
+
+
+class Primitives:
+    """Normalised drawing content of one SVG."""
+
+    def __init__(self):
+        self.segments = []   # ((x1, y1), (x2, y2))
+        self.circles = []    # (cx, cy, r)
+        self.labels = []     # (text, x, y)
+
+    def add_polyline(self, points, matrix):
+        points = [apply(matrix, x, y) for x, y in points]
+        for p, q in zip(points, points[1:]):
+            # Zero-length segments (rounding noise, dots drawn as paths) carry no shape
+            if distance(p, q) > 1e-6:
+                self.segments.append((p, q))
+
+
+def collect(element, matrix, primitives, symbols):
+    """Walk `element`, adding its primitives in absolute coordinates."""
+    matrix = multiply(matrix, parse_transform(element.get('transform')))
+    tag = local_name(element.tag)
+    if tag == 'path':
+        for points in path_points(element.get('d', '')):
+            primitives.add_polyline(points, matrix)
+    elif tag in ('polygon', 'polyline'):
+        values = [float(v) for v in NUMBER_RE.findall(element.get('points', ''))]
+        points = list(zip(values[::2], values[1::2]))
+        if tag == 'polygon' and points:
+            points.append(points[0])
+        primitives.add_polyline(points, matrix)
+    elif tag == 'line':
+        points = [(float(element.get('x1', 0)), float(element.get('y1', 0))),
+                  (float(element.get('x2', 0)), float(element.get('y2', 0)))]
+        primitives.add_polyline(points, matrix)
+    elif tag == 'circle':
+        x, y = apply(matrix, float(element.get('cx', 0)), float(element.get('cy', 0)))
+        primitives.circles.append((x, y, float(element.get('r', 0))))
+    elif tag == 'text':
+        lines = [''.join(span.itertext()) for span in element if local_name(span.tag) == 'tspan']
+        text = '\n'.join(lines) if lines else ''.join(element.itertext())
+        x, y = apply(matrix, float(element.get('x', 0)), float(element.get('y', 0)))
+        primitives.labels.append((text, x, y))
+        return
+    elif tag == 'use':
+        href = element.get('href') or element.get('{http://www.w3.org/1999/xlink}href', '')
+        target = symbols.get(href.rsplit('#', 1)[-1])
+        if target is not None:
+            use_matrix = multiply(matrix, (1, 0, 0, 1, float(element.get('x', 0)),
+                                           float(element.get('y', 0))))
+            for child in target:
+                collect(child, use_matrix, primitives, symbols)
+        return
+    elif tag in ('defs', 'symbol', 'clipPath', 'style'):
+        return
+    for child in element:
+        collect(child, matrix, primitives, symbols)
+
+
+def parse_symbols(data):
+    """Return {id: symbol element} from a symbol sheet, or {}."""
+    if not data:
+        return {}
+    root = ET.fromstring(data)
+    return {el.get('id'): el for el in root.iter() if local_name(el.tag) == 'symbol'}
+
+
+def primitives_of(data, symbols):
+    primitives = Primitives()
+    collect(ET.fromstring(data), IDENTITY, primitives, symbols)
+    return primitives
+
+
+# -- comparison -------------------------------------------------------------
+
+def distance(p, q):
+    return math.hypot(p[0] - q[0], p[1] - q[1])
+
+
+def unmatched(old, new, key, close):
+    """Items of `old` and `new` left after matching within tolerance.
+
+    Exact matches on the quantised `key` are removed with multiset counts
+    first; only the (usually few) leftovers are compared pairwise with `close`.
+    """
+    old_keys, new_keys = Counter(map(key, old)), Counter(map(key, new))
+    common = old_keys & new_keys
+
+    def leftovers(items):
+        budget = Counter(common)
+        rest = []
+        for item in items:
+            k = key(item)
+            if budget[k]:
+                budget[k] -= 1
+            else:
+                rest.append(item)
+        return rest
+
+    old_rest, new_rest = leftovers(old), leftovers(new)
+    still_old = []
+    for item in old_rest:
+        match = next((i for i, other in enumerate(new_rest) if close(item, other)), None)
+        if match is None:
+            still_old.append(item)
+        else:
+            new_rest.pop(match)
+    return still_old, new_rest
+
+
+def diff_shapes(old, new, tolerance):
+    """Return (removed, added) shape lists between two Primitives."""
+    def quantise(value):
+        return round(value / tolerance)
+
+    def same_segment(s, t):
+        return ((distance(s[0], t[0]) <= tolerance and distance(s[1], t[1]) <= tolerance)
+                or (distance(s[0], t[1]) <= tolerance and distance(s[1], t[0]) <= tolerance))
+
+    segments = unmatched(
+        old.segments, new.segments,
+        key=lambda s: tuple(sorted((quantise(x), quantise(y)) for x, y in s)),
+        close=same_segment)
+    circles = unmatched(
+        old.circles, new.circles,
+        key=lambda c: tuple(quantise(v) for v in c),
+        close=lambda c, d: distance(c, d) <= tolerance and abs(c[2] - d[2]) <= tolerance)
+    return segments[0] + circles[0], segments[1] + circles[1]
+
+
+def diff_labels(old, new, tolerance):
+    """Compare labels by text. Returns a list of (kind, text, old xy, new xy).
+
+    Labels with the same text (pin numbers, 'GND') are paired nearest first.
+    """
+    changes = []
+    old_by_text, new_by_text = {}, {}
+    for text, x, y in old:
+        old_by_text.setdefault(text, []).append((x, y))
+    for text, x, y in new:
+        new_by_text.setdefault(text, []).append((x, y))
+
+    for text in sorted(old_by_text.keys() | new_by_text.keys()):
+        before, after = old_by_text.get(text, []), list(new_by_text.get(text, []))
+        pairs = sorted(((distance(p, q), i, j) for i, p in enumerate(before)
+                        for j, q in enumerate(after)))
+        used_old, used_new = set(), set()
+        for dist, i, j in pairs:
+            if i in used_old or j in used_new:
+                continue
+            used_old.add(i)
+            used_new.add(j)
+            if dist > tolerance:
+                changes.append(('moved', text, before[i], after[j]))
+        changes.extend(('missing', text, p, None) for i, p in enumerate(before) if i not in used_old)
+        changes.extend(('new', text, None, q) for j, q in enumerate(after) if j not in used_new)
+    return changes
+
+
+# -- sources ----------------------------------------------------------------
+
+def read_directory(directory):
+    """Return {file name: bytes} for the SVGs (and sheet) in `directory`."""
+    return {path.name: path.read_bytes() for path in sorted(Path(directory).glob('*.svg'))}
+
+
+def read_revision(rev, directory=CIRCUITS_DIR):
+    """Return {file name: bytes} for the SVGs in `directory` at git `rev`."""
+    top = Path(subprocess.run(['git', 'rev-parse', '--show-toplevel'], cwd=directory,
+                              capture_output=True, text=True, check=True).stdout.strip())
+    prefix = directory.resolve().relative_to(top).as_posix()
+    listing = subprocess.run(['git', 'ls-tree', '-z', '--name-only', rev, f'{prefix}/'],
+                             cwd=top, capture_output=True, check=True).stdout
+    paths = [p.decode() for p in listing.split(b'\0') if p.endswith(b'.svg')]
+    if not paths:
+        return {}
+
+    request = ''.join(f'{rev}:{path}\n' for path in paths).encode()
+    out = subprocess.run(['git', 'cat-file', '--batch'], cwd=top, input=request,
+                         capture_output=True, check=True).stdout
+    files, pos = {}, 0
+    for path in paths:
+        header_end = out.index(b'\n', pos)
+        size = int(out[pos:header_end].split()[2])
+        files[path.rsplit('/', 1)[-1]] = out[header_end + 1:header_end + 1 + size]
+        pos = header_end + 1 + size + 1
+    return files
+
+
+# -- report -----------------------------------------------------------------
+
+def show(text):
+    return text.replace('\n', ' / ')
+
+
+def fmt_xy(point):
+    return f'({point[0]:.1f}, {point[1]:.1f})'
+
+
+def fmt_shape(shape):
+    if len(shape) == 3:
+        return f'circle r={shape[2]:g} at {fmt_xy(shape)}'
+    return f'segment {fmt_xy(shape[0])}-{fmt_xy(shape[1])}'
+
+
+def compare(old_files, new_files, tolerance):
+    """Print a report per diagram. Returns (changed, compared) diagram counts."""
+    old_symbols = parse_symbols(old_files.get(SHEET_NAME))
+    new_symbols = parse_symbols(new_files.get(SHEET_NAME))
+    names = sorted((old_files.keys() | new_files.keys()) - {SHEET_NAME})
+    changed = 0
+    for name in names:
+        if name not in new_files:
+            changed += 1
+            print(f"✗ {name}: removed")
+            continue
+        if name not in old_files:
+            changed += 1
+            print(f"✗ {name}: new diagram")
+            continue
+
+        old = primitives_of(old_files[name], old_symbols)
+        new = primitives_of(new_files[name], new_symbols)
+        removed, added = diff_shapes(old, new, tolerance)
+        labels = diff_labels(old.labels, new.labels, tolerance)
+        if not (removed or added or labels):
+            print(f"✓ {name}: unchanged")
+            continue
+
+        changed += 1
+        kinds = Counter(kind for kind, *_ in labels)
+        parts = [f"{kinds[kind]} label(s) {kind}" for kind in ('moved', 'missing', 'new') if kinds[kind]]
+        if removed or added:
+            parts.append(f"shapes -{len(removed)}/+{len(added)}")
+        print(f"✗ {name}: {', '.join(parts)}")
+        for kind, text, before, after in labels[:MAX_DETAILS]:
+            if kind == 'moved':
+                dx, dy = after[0] - before[0], after[1] - before[1]
+                print(f"    moved   '{show(text)}' {fmt_xy(before)} -> {fmt_xy(after)} (d={dx:+.1f},{dy:+.1f})")
+            elif kind == 'missing':
+                print(f"    missing '{show(text)}' was at {fmt_xy(before)}")
+            else:
+                print(f"    new     '{show(text)}' at {fmt_xy(after)}")
+        if len(labels) > MAX_DETAILS:
+            print(f"    ... {len(labels) - MAX_DETAILS} more label change(s)")
+        for sign, shapes in (('-', removed), ('+', added)):
+            for shape in shapes[:MAX_SHAPE_DETAILS]:
+                print(f"    {sign} {fmt_shape(shape)}")
+            if len(shapes) > MAX_SHAPE_DETAILS:
+                print(f"    {sign} ... {len(shapes) - MAX_SHAPE_DETAILS} more")
+    return changed, len(names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Structurally diff generated circuit SVGs.')
+    parser.add_argument('--rev', default='HEAD', help='git revision for the old side (default HEAD)')
+    parser.add_argument('--old-dir', type=Path, help='read the old side from a directory instead of git')
+    parser.add_argument('--new-dir', type=Path, default=CIRCUITS_DIR,
+                        help='directory for the new side (default doc/static/circuits)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, metavar='PT',
+                        help=f'position tolerance in SVG points (default {DEFAULT_TOLERANCE})')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        old_files = read_directory(args.old_dir) if args.old_dir else read_revision(args.rev)
+    except subprocess.CalledProcessError as e:
+        print(f"Error: cannot read {args.rev} from git: {e.stderr.decode().strip()}")
+        sys.exit(2)
+    new_files = read_directory(args.new_dir)
+
+    changed, total = compare(old_files, new_files, args.tolerance)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"\nCompared {total} diagram(s) in {elapsed_ms:.0f} ms: {changed} changed")
+    if changed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,8 @@ Complete circuit with transparent background, black foreground, Arial font
 import schemdraw
 from schemdraw import elements as elm
 
+from symbol_pins import ic_pins
+
 with schemdraw.Drawing(
     font='Arial',         # Sans-serif font
     fontsize=11,
@@ -15,23 +17,18 @@ with schemdraw.Drawing(
 ) as d:
     d.config(unit=3)
 
-    # Just the IC
+    # IC as in the symbol, with Output on the right and Feedback on top
     ic = elm.Ic(
-        pins=[
-            elm.IcPin(name='GND', pin='3', side='left', slot='1/3'),
-            elm.IcPin(name='ON', pin='5', side='left', slot='2/3'),
-            elm.IcPin(name='VIN', pin='1', side='left', slot='3/3'),
-            elm.IcPin(name='OUT', pin='2', side='right', slot='1/3'),
-            elm.IcPin(name='FB', pin='4', side='right', slot='3/3'),
-        ],
+        pins=ic_pins('LM2596S-ADJ', omit=['TAB'],
+                     sides={'Output': 'right', 'Feedback': 'top'}),
         edgepadW=2.5,
         edgepadH=0.8,
         pinspacing=1.0,
         leadlen=1.0
     ).label('U4\nLM2596S', loc='center', fontsize=10)
 
-    # Input rail from VIN pin
-    elm.Line().at(ic.VIN).left(2)
+    # Input rail from Vin pin
+    elm.Line().at(ic.Vin).left(2)
     elm.Dot() # to C10
     d.push()
 
@@ -54,16 +51,16 @@ with schemdraw.Drawing(
     elm.Line().toy(bottom_rail.start)
     elm.Dot()
 
-    # GND pin to bottom rail
-    elm.Line().at(ic.GND).toy(bottom_rail.start)
+    # Gnd pin to bottom rail
+    elm.Line().at(ic.Gnd).toy(bottom_rail.start)
     elm.Dot()
 
-    # ON pin to GND pin (connects to bottom rail / IC GND)
-    elm.Line().at(ic.ON).toy(bottom_rail.start)
+    # ON/OFF pin to Gnd pin (connects to bottom rail / IC GND)
+    elm.Line().at(ic.ONOFF).toy(bottom_rail.start)
     elm.Dot()
 
-    # Output from OUT pin
-    elm.Line().at(ic.OUT).right(0.5)
+    # Output from Output pin
+    elm.Line().at(ic.Output).right(0.5)
     elm.Dot() # to D3
     d.push()
 
@@ -105,7 +102,7 @@ with schemdraw.Drawing(
     elm.Ground()
 
     d.pop()
-    elm.Line().toy(ic.FB)
+    elm.Line().toy(ic.Feedback)
     elm.Dot()
     d.push()
     elm.Resistor(scale=0.7).right().label('R5\n10kΩ', ofst=0.5)
@@ -113,7 +110,7 @@ with schemdraw.Drawing(
     elm.Line().toy(fb_right_edge.start)
 
     d.pop()
-    elm.Line().tox(ic.FB)
+    elm.Line().tox(ic.Feedback)
 
 
     # Save to doc/static/circuits/ (one level up from diagram-sources)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Profile the diagram scripts per element type, per label and for the save.
+
+Each script runs in this process with schemdraw instrumented by
+diagram_profile.py. A summary of the slowest element types, labels and
+save stages is printed, and the full breakdown is written in collapsed-stack
+format for flame-graph tools:
+
+    flamegraph.pl .diagram-profile.folded > profile.svg
+    # or drop the file on https://www.speedscope.app
+
+By default every script is run once unprofiled first, so one-off import and
+cache warm-up costs do not hide the per-diagram work; pass --cold to keep
+them. Outputs are saved through the same write-if-changed path as
+build-diagrams.py.
+
+Usage:
+    python3 profile-diagrams.py                       # Profile every diagram
+    python3 profile-diagrams.py diagram1-usb-pd.py    # Only the given scripts
+    python3 profile-diagrams.py --repeat 5 --top 25   # Average 5 runs
+    python3 profile-diagrams.py -o usb-pd.folded      # Collapsed-stack output path
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import diagram_runner
+import svg_symbols
+from diagram_profile import RenderProfiler
+from diagram_runner import SCRIPT_DIR, find_diagram_scripts, render_script, update_symbol_sheets
+
+
+DEFAULT_OUTPUT = SCRIPT_DIR / '.diagram-profile.folded'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile schemdraw diagram scripts.')
+    parser.add_argument('scripts', nargs='*', help='scripts to profile (default: all)')
+    parser.add_argument('--repeat', type=int, default=1, metavar='N',
+                        help='profiled runs per script; times are averaged (default 1)')
+    parser.add_argument('--cold', action='store_true',
+                        help='skip the unprofiled warm-up run')
+    parser.add_argument('--top', type=int, default=15, metavar='N',
+                        help='rows in the printed summary (default 15)')
+    parser.add_argument('-o', '--output', type=Path, default=DEFAULT_OUTPUT,
+                        help=f'collapsed-stack output (default {DEFAULT_OUTPUT.name})')
+    args = parser.parse_args()
+
+    if args.scripts:
+        scripts = [Path(name).resolve() for name in args.scripts]
+        missing = [str(path) for path in scripts if not path.is_file()]
+        if missing:
+            print(f"Error: not found: {', '.join(missing)}")
+            sys.exit(1)
+    else:
+        scripts = find_diagram_scripts()
+    repeat = max(args.repeat, 1)
+
+    if not args.cold:
+        for script in scripts:
+            _, outputs, _, symbols = render_script(script)
+            update_symbol_sheets([output for output, _ in outputs], symbols)
+
+    failures = 0
+    with RenderProfiler() as profiler:
+        # The runner saves through its own write-if-changed path and symbol sheet
+        profiler.hook(diagram_runner, '_save_if_changed', 'save')
+        profiler.hook(svg_symbols, 'symbol_markup', 'symbols')
+        for script in scripts:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                with profiler.run(script.name):
+                    name, outputs, error, symbols = render_script(script)
+                update_symbol_sheets([output for output, _ in outputs], symbols)
+                if error is not None:
+                    break
+            elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+            if error is not None:
+                failures += 1
+                print(f"✗ {name}: Error - {error}")
+            else:
+                print(f"✓ {name}: {elapsed_ms:.1f} ms per run")
+
+    rows = profiler.summary()[:args.top]
+    if rows:
+        print(f"\n{'frame':<48} {'calls':>7} {'ms/run':>9}")
+        for frame, calls, seconds in rows:
+            print(f"{frame:<48} {calls / repeat:>7g} {seconds * 1000 / repeat:>9.2f}")
+
+    profiler.write_collapsed(args.output)
+    print(f"\nWrote {args.output} (collapsed stacks, microseconds over {repeat} run(s))")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
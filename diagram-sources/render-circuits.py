@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Render the templated regulator circuits (buck converters and LDOs).
+
+Every instance in circuit_specs.py is drawn with its topology template from
+circuit_templates.py, all in this one process, so regenerating the whole set
+costs a single interpreter start and schemdraw import.
+
+Usage:
+    python3 render-circuits.py                  # Render every spec
+    python3 render-circuits.py ldo-u6-diagram   # Only the named specs
+"""
+
+import os
+import sys
+
+from circuit_specs import SPECS
+from circuit_templates import draw
+
+
+def output_path(spec):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, '../doc/static/circuits', f"{spec['name']}.svg")
+
+
+def main():
+    names = sys.argv[1:]
+    specs = [spec for spec in SPECS if not names or spec['name'] in names]
+    unknown = set(names) - {spec['name'] for spec in specs}
+    if unknown:
+        print(f"Error: unknown spec(s): {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    for spec in specs:
+        d = draw(spec)
+        d.save(output_path(spec))
+        print(f"✓ {spec['name']}: {spec['title']}")
+
+
+if __name__ == '__main__':
+    main()
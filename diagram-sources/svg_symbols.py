@@ -0,0 +1,174 @@
+"""
+Shared <symbol> sheet for the generated circuit SVGs.
+
+schemdraw writes the full geometry of every capacitor, resistor, ground,
+Zener and LED into each SVG, so a page that embeds all the circuit diagrams
+downloads the same shapes many times. `render_svg` draws a Drawing with the
+shape of each element replaced by a `<use>` of a symbol in one shared sheet
+(circuit-symbols.svg next to the diagrams); labels stay inline text.
+
+A symbol is an element's non-text geometry in its own coordinates, so two
+elements share a symbol exactly when they would draw the same shapes before
+being rotated and moved into place. Symbol ids are derived from that
+geometry, so they are stable across builds and diagrams. Wires of a common
+length (right(1.0), down(2.0)) and identical IC outlines are shared too.
+"""
+
+import hashlib
+import os
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from schemdraw import drawing_stack
+from schemdraw.backends.svg import Figure, fmt
+from schemdraw.segments import SegmentText
+from schemdraw.transform import Transform
+from schemdraw.types import BBox
+
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+SHEET_NAME = 'circuit-symbols.svg'
+DOCUSAURUS_CONFIG = Path(__file__).resolve().parent.parent / 'doc' / 'docusaurus.config.js'
+# Overrides the site's baseUrl, e.g. for a preview served under another path
+BASE_URL_ENV = 'CIRCUIT_BASE_URL'
+
+SYMBOL_RE = re.compile(r'<symbol id="([^"]+)"[^>]*>(.*?)</symbol>', re.DOTALL)
+USE_HREF_RE = re.compile(rf'href="[^"#]*{re.escape(SHEET_NAME)}#([^"]+)"')
+BASE_URL_RE = re.compile(r'''^\s*baseUrl:\s*['"]([^'"]*)['"]''', re.MULTILINE)
+
+
+def site_base_url():
+    """$CIRCUIT_BASE_URL, else the baseUrl in doc/docusaurus.config.js, else '/'."""
+    base = os.environ.get(BASE_URL_ENV)
+    if base is None:
+        try:
+            match = BASE_URL_RE.search(DOCUSAURUS_CONFIG.read_text(encoding='utf-8'))
+        except OSError:
+            match = None
+        base = match.group(1) if match else '/'
+    return base.rstrip('/') + '/'
+
+
+# The diagrams are inlined into the Docusaurus pages (SVGR), so the sheet is
+# referenced by its site URL (baseUrl + static path), not relative to the SVG
+SHEET_URL = f'{site_base_url()}circuits/{SHEET_NAME}'
+
+
+def symbol_markup(element, params):
+    """Draw the element's non-text segments in local coordinates.
+
+    Returns (z-order, SVG markup of the shapes), or None when the element
+    must be drawn inline (no shapes, mixed z-orders, clip paths or gradients).
+    """
+    shapes = [seg for seg in element.segments if not isinstance(seg, SegmentText)]
+    if not shapes or 'gradient' in element.params:
+        return None
+
+    # Keep zoom and local shift; rotation and position move to the <use>
+    local = Transform(0, (0, 0), localshift=element.transform.localshift,
+                      zoom=element.transform.zoom)
+    scratch = Figure(bbox=BBox(0, 0, 1, 1), **params)
+    for segment in shapes:
+        segment.draw(scratch, local, **element.params)
+    zorders = {zorder for zorder, _ in scratch.svgelements}
+    if len(zorders) != 1 or any(et.get('clip-path') for _, et in scratch.svgelements):
+        return None
+    markup = ''.join(ET.tostring(et, encoding='unicode') for _, et in scratch.svgelements)
+    return zorders.pop(), markup
+
+
+def symbol_id(element, markup):
+    digest = hashlib.sha256(markup.encode('utf-8')).hexdigest()[:10]
+    return f'{type(element).__name__.lower()}-{digest}'
+
+
+def use_transform(element, scale):
+    """SVG transform placing local symbol coordinates like element.transform.
+
+    schemdraw maps (x, y) to (x*scale, -y*scale), so a counter-clockwise
+    rotation in drawing units is a negative rotation in SVG coordinates.
+    """
+    x, y = element.transform.shift
+    transform = f'translate({fmt(x * scale)},{fmt(-y * scale)})'
+    angle = -element.transform.theta % 360
+    if angle > 180:
+        angle -= 360
+    if angle:
+        transform += f' rotate({fmt(angle)})'
+    return transform
+
+
+def render_svg(drawing):
+    """Render `drawing` like Drawing.get_imagedata('svg'), using symbols.
+
+    Returns (svg bytes, {symbol id: markup}) for the symbols it references.
+    """
+    drawing_stack.push_element(None)   # Place a pending element, as draw() does
+    dwgparams = drawing.dwgparams
+    params = {'inches_per_unit': dwgparams.get('inches_per_unit'),
+              'margin': dwgparams.get('margin')}
+    fig = Figure(bbox=drawing.get_bbox(), showbbox=dwgparams.get('dwgbbox', False), **params)
+    if 'bgcolor' in dwgparams:
+        fig.bgcolor(dwgparams['bgcolor'])
+    fig.svgdefs.extend(drawing.svgdefs)
+
+    symbols = {}
+    for element in drawing.elements:
+        if not element.segments:
+            element._place((0, 0), 0)
+        symbol = symbol_markup(element, params)
+        if symbol is None:
+            element._draw(fig)
+            continue
+
+        zorder, markup = symbol
+        sid = symbol_id(element, markup)
+        symbols[sid] = markup
+        use = ET.Element('use')
+        use.set('href', f'{SHEET_URL}#{sid}')
+        use.set('transform', use_transform(element, fig.scale))
+        fig.svgelements.append((zorder, use))
+        for segment in element.segments:
+            if isinstance(segment, SegmentText):
+                segment.draw(fig, element.transform, **element.params)
+
+    return fig.getimage(), symbols
+
+
+def read_sheet(path):
+    """Return {symbol id: markup} from an existing sheet, or {}."""
+    try:
+        text = Path(path).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return {}
+    return dict(SYMBOL_RE.findall(text))
+
+
+def referenced_ids(directory):
+    """Ids of the symbols used by any SVG in `directory`."""
+    used = set()
+    for svg in Path(directory).glob('*.svg'):
+        if svg.name != SHEET_NAME:
+            used.update(USE_HREF_RE.findall(svg.read_text(encoding='utf-8')))
+    return used
+
+
+def sheet_bytes(symbols):
+    """Serialise a sheet holding `symbols` in id order."""
+    body = ''.join(f'<symbol id="{sid}" overflow="visible">{symbols[sid]}</symbol>'
+                   for sid in sorted(symbols))
+    return (f'<svg xmlns="{SVG_NS}">'
+            f'<defs>{body}</defs></svg>\n').encode('utf-8')
+
+
+def updated_sheet(directory, new_symbols):
+    """Return the sheet for `directory` with `new_symbols` merged in.
+
+    Symbols no longer referenced by any SVG in the directory are dropped, so
+    the sheet never grows with stale glyphs.
+    """
+    symbols = read_sheet(Path(directory) / SHEET_NAME)
+    symbols.update(new_symbols)
+    used = referenced_ids(directory)
+    return sheet_bytes({sid: markup for sid, markup in symbols.items() if sid in used})
@@ -0,0 +1,116 @@
+"""
+elm.IcPin lists built from the KiCad symbol library.
+
+Pin numbers and names come from symbols/zudo-pd.kicad_sym through the
+cached symbol index (scripts/kicad_symbols.py) instead of being typed into
+each diagram. The index is only rebuilt for symbols whose text changed,
+so a render costs a pickle load and a hash of the library:
+
+    ic = elm.Ic(pins=ic_pins('LM2596S-ADJ', omit=['TAB'], sides={'Output': 'right'}))
+
+Every visible pin keeps its name and its side from the symbol, and slots
+follow the symbol's pin grid, so left and right pins line up as in KiCad
+and gaps stay gaps. Callers only pass the exceptions: `omit` drops pins
+(all pins of a repeated name such as 'NC'), `sides` and `slots` move
+single pins, keyed by symbol pin name or number, and the grid is laid out
+after the moves. `compact=True` numbers each side's pins 1..n instead.
+KiCad overbars (`~{ON}/OFF`) become mathtext, with the plain text
+('ONOFF') as the anchor name.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+from schemdraw import elements as elm
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT / 'scripts') not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / 'scripts'))
+
+from kicad_symbols import load_symbols  # noqa: E402
+
+
+SYMBOL_LIBRARY = REPO_ROOT / 'symbols' / 'zudo-pd.kicad_sym'
+# Body edge -> coordinate that runs along it (schemdraw slot 1 is bottom/left)
+SIDE_AXES = {'left': 'y', 'right': 'y', 'top': 'x', 'bottom': 'x'}
+OVERBAR_RE = re.compile(r'~\{([^}]*)\}')
+
+_library = None
+
+
+def library():
+    """The symbol index, refreshed once per process."""
+    global _library
+    if _library is None:
+        _library = load_symbols(SYMBOL_LIBRARY)
+    return _library
+
+
+def pin_label(name):
+    """Display name for a KiCad pin name: overbars as mathtext."""
+    return OVERBAR_RE.sub(r'$\\overline{\1}$', name)
+
+
+def _find(symbol, key):
+    for pin in symbol.pins:
+        if key in (pin.name, pin.number):
+            return pin
+    raise KeyError(f"{symbol.name} has no pin {key!r}")
+
+
+def _grid_slots(entries, compact):
+    """{index: 'i/n'} for (index, side, coordinate) entries."""
+    slots = {}
+    groups = {}
+    for index, side, coordinate in entries:
+        key = side if compact else SIDE_AXES[side]
+        groups.setdefault(key, []).append((index, coordinate))
+    for members in groups.values():
+        positions = sorted({round(coordinate, 3) for _, coordinate in members})
+        if compact:
+            for rank, (index, _) in enumerate(sorted(members, key=lambda m: m[1]), 1):
+                slots[index] = f'{rank}/{len(members)}'
+            continue
+        gaps = [b - a for a, b in zip(positions, positions[1:])]
+        pitch = min(gaps) if gaps else 1.0
+        count = round((positions[-1] - positions[0]) / pitch) + 1
+        for index, coordinate in members:
+            slots[index] = f'{round((coordinate - positions[0]) / pitch) + 1}/{count}'
+    return slots
+
+
+def ic_pins(symbol, pins=None, omit=(), sides=None, slots=None, compact=False, **pin_args):
+    """IcPins for a library symbol.
+
+    `pins` picks pins by name or number, in order. Default: every visible
+    pin not in `omit`. Other keyword arguments go to every IcPin
+    (lblsize, color, ...).
+    """
+    part = library()[symbol]
+    if pins is None:
+        chosen = [pin for pin in part.pins
+                  if not pin.hidden and pin.name not in omit and pin.number not in omit]
+    else:
+        chosen = [_find(part, key) for key in pins]
+    sides, slots = sides or {}, slots or {}
+
+    def override(mapping, pin, default):
+        for key in (pin.name, pin.number):
+            if key in mapping:
+                return mapping[key]
+        return default
+
+    placed = [(pin, override(sides, pin, pin.side)) for pin in chosen]
+    grid = _grid_slots([(i, side, pin.y if SIDE_AXES[side] == 'y' else pin.x)
+                        for i, (pin, side) in enumerate(placed)
+                        if override(slots, pin, None) is None], compact)
+    result = []
+    for i, (pin, side) in enumerate(placed):
+        label = pin_label(pin.name)
+        # Mathtext names make awkward anchors; use the plain pin name
+        anchor = re.sub(r'\W', '', OVERBAR_RE.sub(r'\1', pin.name)) if '$' in label else None
+        result.append(elm.IcPin(name=label, pin=pin.number, side=side,
+                                slot=override(slots, pin, grid.get(i)),
+                                anchorname=anchor, **pin_args))
+    return result
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Watch diagram-sources/ and re-render diagrams the moment a script is saved.
+
+The watcher is one long-lived process with schemdraw already imported, so a
+layout tweak (e.g. a label `ofst`) only pays for running the edited script,
+not for a cold interpreter and schemdraw start-up. Saving a diagram script
+re-runs just that script; saving a helper module such as circuit_templates.py
+re-runs the scripts that import it. Outputs go through the same atomic,
+write-if-changed save as build-diagrams.py.
+
+Usage:
+    python3 watch-diagrams.py              # Watch, render on change
+    python3 watch-diagrams.py --initial    # Render everything once first
+    python3 watch-diagrams.py --interval 0.1
+"""
+
+import argparse
+import re
+import time
+
+from diagram_runner import (
+    LIBRARY_FILES, SCRIPT_DIR, find_diagram_scripts, render_script, update_symbol_sheets,
+)
+
+
+def snapshot(directory=SCRIPT_DIR):
+    """Return {path: mtime_ns} for every Python file in `directory` and the
+    symbol library."""
+    mtimes = {}
+    for path in [*directory.glob('*.py'), *LIBRARY_FILES]:
+        try:
+            mtimes[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            # Editors that save by rename can briefly remove the file
+            pass
+    return mtimes
+
+
+def scripts_importing(module_name, scripts):
+    """Return the scripts whose source imports `module_name`."""
+    pattern = re.compile(rf'^\s*(from|import)\s+{re.escape(module_name)}\b', re.MULTILINE)
+    return [script for script in scripts if pattern.search(script.read_text(encoding='utf-8'))]
+
+
+def affected_scripts(changed):
+    """Map changed files to the diagram scripts that need re-running."""
+    scripts = find_diagram_scripts()
+    targets = []
+    for path in changed:
+        if path in scripts:
+            targets.append(path)
+        elif path in LIBRARY_FILES:
+            targets.extend(scripts_importing('symbol_pins', scripts))
+            targets.extend(scripts_importing('circuit_templates', scripts))
+        elif path.name in ('diagram_runner.py', 'svg_symbols.py'):
+            print(f"  {path.name} changed; restart the watcher to pick it up")
+        elif '-' not in path.stem:
+            targets.extend(scripts_importing(path.stem, scripts))
+    return sorted(set(targets))
+
+
+def render(scripts):
+    for script in scripts:
+        started = time.perf_counter()
+        name, outputs, error, symbols = render_script(script)
+        update_symbol_sheets([output for output, _ in outputs], symbols)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if error is not None:
+            print(f"✗ {name}: Error - {error}")
+            continue
+        written = [output.rsplit('/', 1)[-1] for output, was_written in outputs if was_written]
+        summary = f"wrote {', '.join(written)}" if written else 'output unchanged'
+        print(f"✓ {name}: {summary} ({elapsed_ms:.0f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-render diagrams when their scripts change.')
+    parser.add_argument('--interval', type=float, default=0.2, metavar='SECONDS',
+                        help='polling interval (default 0.2)')
+    parser.add_argument('--initial', action='store_true',
+                        help='render every diagram once before watching')
+    args = parser.parse_args()
+
+    if args.initial:
+        render(find_diagram_scripts())
+
+    print(f"Watching {SCRIPT_DIR} (Ctrl+C to stop)...")
+    previous = snapshot()
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = snapshot()
+            changed = [path for path, mtime in current.items() if previous.get(path) != mtime]
+            previous = current
+            if changed:
+                render(affected_scripts(changed))
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,117 +3,782 @@
 Remove REF** placeholder text from KiCad footprint SVG exports.
 This includes both <text> elements and <g class="stroked-text"> path-based text.
 
+Cleaning is a single traversal driven by a list of removal rules. Each rule
+decides on one element; a matched element is dropped together with its
+subtree, so the cost stays linear in the number of elements.
+
 Usage:
     python clean-svg-refs.py <svg_file>
     python clean-svg-refs.py <directory>  # Process all SVG files in directory
+    python clean-svg-refs.py <directory> --jobs 4  # Spread files over 4 processes
+    python clean-svg-refs.py <directory> --force   # Ignore the manifest
+    python clean-svg-refs.py <path> --pattern 'DNP'  # Also remove matching text
+    python clean-svg-refs.py - < in.svg > out.svg  # Stream stdin to stdout
+    python clean-svg-refs.py <path> --optimize --precision 3  # Also minify
+    python clean-svg-refs.py <path> --report out.json  # Write timings as JSON
+
+In directory mode a manifest (.clean-svg-refs.json) records the content hash
+of every file after cleaning. Files whose bytes still match are skipped
+without being parsed, so only SVGs rewritten by kicad-cli are cleaned again.
+
+Before parsing, the raw bytes are memory-mapped and scanned for anything the
+default rules could remove. Files without such markers are never parsed.
+
+With `-` as the path the script works as a streaming filter: SAX events are
+copied from stdin to stdout as they arrive and placeholder subtrees are
+dropped on the way, so memory stays bounded whatever the document size.
+The summary line goes to stderr.
+
+--optimize adds a minification pass after cleaning (also useful on the
+schemdraw output in doc/static/circuits/): numbers in geometry attributes are
+rounded to --precision decimals, stroked-text segments are merged into one
+path per group, default-valued styles, identity transforms, empty groups and
+insignificant whitespace are dropped, and the bytes saved are reported.
 """
 
+import argparse
+import hashlib
+import json
+import mmap
+import os
 import sys
 import re
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 import xml.etree.ElementTree as ET
+import xml.sax
+from xml.sax.handler import ContentHandler
+from xml.sax.saxutils import XMLGenerator
 
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
 
-def clean_svg_references(svg_path):
-    """Remove REF** and VAL** reference text elements and stroked-text groups."""
+from kicad_cache import read_manifest, write_manifest  # noqa: E402
 
-    # Parse SVG
-    ET.register_namespace('', 'http://www.w3.org/2000/svg')
-    tree = ET.parse(svg_path)
-    root = tree.getroot()
-
-    removed_count = 0
-
-    # Remove text elements with REF** or VAL**
-    for elem in list(root.iter()):
-        # Check text content
-        if elem.text and re.search(r'(REF|VAL)\*\*', elem.text):
-            parent = find_parent(root, elem)
-            if parent is not None:
-                parent.remove(elem)
-                removed_count += 1
-                continue
-
-    # Remove stroked-text groups
-    # Strategy: Remove stroked-text groups that:
-    # 1. Have a <desc> child with REF** or VAL**
-    # 2. OR have no <desc> child (these are usually REF** rendered as paths)
-    for elem in list(root.iter()):
-        if 'class' in elem.attrib and elem.attrib['class'] == 'stroked-text':
-            # Check if it has a desc child
-            desc_elem = elem.find('.//{http://www.w3.org/2000/svg}desc')
-
-            should_remove = False
-
-            if desc_elem is not None and desc_elem.text:
-                # Has desc - check if it's REF** or VAL**
-                if re.search(r'(REF|VAL)\*\*', desc_elem.text):
-                    should_remove = True
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+DESC_TAG = f'{{{SVG_NS}}}desc'
+
+# Placeholder text KiCad leaves on footprints exported without a board
+PLACEHOLDER_RE = re.compile(r'(REF|VAL)\*\*')
+
+# Byte-level markers for the pre-scan. Every KiCad export has a stroked-text
+# group for the footprint name, so such groups only count as a marker when
+# they are not immediately described by a non-empty <desc>.
+PLACEHOLDER_BYTES_RE = re.compile(rb'(REF|VAL)\*\*')
+STROKED_TEXT_BYTES_RE = re.compile(rb'stroked-text')
+DESCRIBED_STROKED_TEXT_RE = re.compile(rb'class="stroked-text"\s*>\s*<desc>[^<]')
+# The pre-scan only vouches for documents that open with an <svg> root and
+# close it; anything else goes to the parser so errors are reported
+SVG_START_BYTES_RE = re.compile(rb'\s*(?:<\?xml[^>]*\?>\s*)?(?:<!--.*?-->\s*|<!DOCTYPE[^>]*>\s*)*<svg[\s>]',
+                                re.DOTALL)
+SVG_HEAD_BYTES = 4096
+
+MANIFEST_NAME = '.clean-svg-refs.json'
+# Bump when the cleaning output changes so stale manifests are ignored
+MANIFEST_VERSION = 2
+
+# Optimisation pass
+DEFAULT_PRECISION = 3
+G_TAG = f'{{{SVG_NS}}}g'
+PATH_TAG = f'{{{SVG_NS}}}path'
+TEXT_CONTENT_TAGS = {f'{{{SVG_NS}}}{name}' for name in ('text', 'tspan', 'textPath', 'desc', 'title')}
+NUMERIC_ATTRS = {
+    'd', 'points', 'x', 'y', 'dx', 'dy', 'x1', 'y1', 'x2', 'y2', 'cx', 'cy', 'r', 'rx', 'ry',
+    'width', 'height', 'viewBox', 'transform', 'stroke-width', 'font-size', 'textLength',
+}
+NUMBER_RE = re.compile(r'-?\d*\.\d+(?:[eE][-+]?\d+)?')
+# Inherited properties whose initial value is 1; dropped when they restate it
+UNIT_OPACITIES = ('fill-opacity', 'stroke-opacity')
+IDENTITY_TRANSFORM_RE = re.compile(
+    r'^(\s*(translate\(\s*0(\.0*)?([\s,]+0(\.0*)?)?\s*\)|scale\(\s*1(\.0*)?([\s,]+1(\.0*)?)?\s*\)))*\s*$'
+)
+# A single stroked-text stroke as KiCad writes it: "M x y L x y"
+SEGMENT_RE = re.compile(r'^\s*M\s*(\S+?)[\s,]+(\S+)\s+L\s*(\S+?)[\s,]+(\S+)\s*$')
+
+# A removal rule: `name` labels it in summaries, `match(elem)` returns True
+# when the element (and everything below it) should be dropped. Matchers are
+# module-level callables so rules can be sent to worker processes.
+Rule = namedtuple('Rule', ['name', 'match'])
+
+
+class TextMatch:
+    """Matcher for elements whose own text matches a regular expression."""
+
+    def __init__(self, pattern):
+        self.regex = re.compile(pattern)
+
+    def __call__(self, elem):
+        return bool(elem.text and self.regex.search(elem.text))
+
+
+def text_rule(name, pattern):
+    """Build a rule removing any element whose own text matches `pattern`."""
+    return Rule(name, TextMatch(pattern))
+
+
+def is_placeholder_stroked_text(elem):
+    """Match stroked-text groups that render REF**/VAL** as paths.
+
+    A group is a placeholder when it has no <desc> child, an empty one, or
+    one mentioning REF**/VAL**. Groups described by anything else (such as
+    the footprint name) are kept.
+    """
+    if elem.get('class') != 'stroked-text':
+        return False
+
+    desc_elem = elem.find(f'.//{DESC_TAG}')
+    if desc_elem is None or not desc_elem.text:
+        return True
+    return bool(PLACEHOLDER_RE.search(desc_elem.text))
+
+
+# Rules applied when nothing else is requested. Order matters: the first
+# matching rule claims the element.
+DEFAULT_RULES = [
+    Rule('stroked-text', is_placeholder_stroked_text),
+    text_rule('placeholder-text', PLACEHOLDER_RE.pattern),
+]
+
+
+def find_removals(root, rules):
+    """Walk the tree once and return (parent, elem, rule_name) for each match.
+
+    The root element itself is never removed. Children of a matched element
+    are not visited, since they go away with it.
+    """
+    removals = []
+    stack = [root]
+    while stack:
+        parent = stack.pop()
+        for child in parent:
+            for rule in rules:
+                if rule.match(child):
+                    removals.append((parent, child, rule.name))
+                    break
             else:
-                # No desc - likely a REF** rendered as paths
-                # Check if it's not the footprint name by looking for specific patterns
-                # Footprint names usually have long descriptive text in desc
-                # REF** groups typically have no desc or just "REF**"
-                should_remove = True
-
-            # Additional check: if the stroked-text has a desc with a long name (footprint name),
-            # don't remove it
-            if desc_elem is not None and desc_elem.text:
-                # If desc contains more than just REF**/VAL** (like actual footprint names),
-                # keep it
-                if not re.search(r'^(REF|VAL)\*\*$', desc_elem.text.strip()):
-                    should_remove = False
-
-            if should_remove:
-                parent = find_parent(root, elem)
-                if parent is not None:
-                    parent.remove(elem)
-                    removed_count += 1
+                stack.append(child)
+    return removals
 
-    if removed_count > 0:
-        # Write back to file
-        tree.write(svg_path, encoding='utf-8', xml_declaration=True)
-        print(f"✓ {svg_path.name}: Removed {removed_count} reference element(s)")
+
+def apply_removals(removals):
+    """Detach matched elements, rebuilding each affected parent only once."""
+    doomed = {}
+    for parent, elem, _ in removals:
+        doomed.setdefault(parent, set()).add(id(elem))
+
+    for parent, ids in doomed.items():
+        parent[:] = [child for child in parent if id(child) not in ids]
+
+
+def may_need_cleaning(buf, rules=DEFAULT_RULES):
+    """Cheap byte scan telling whether parsing `buf` could remove anything.
+
+    Only answers False when the default rules are in use, the raw bytes
+    look like a complete SVG document (an <svg> root that is closed at the
+    end) and hold no REF**/VAL** marker and no undescribed stroked-text
+    group. Any doubt (including user-supplied patterns and malformed files)
+    sends the file to the parser.
+    `buf` may be bytes or a memory map.
+    """
+    if any(rule not in DEFAULT_RULES for rule in rules):
         return True
-    else:
-        print(f"  {svg_path.name}: No reference elements found")
+    if not SVG_START_BYTES_RE.match(buf[:SVG_HEAD_BYTES]) or not buf[-64:].rstrip().endswith(b'</svg>'):
+        # Empty, truncated or non-SVG files go to the parser so they are reported as errors
+        return True
+    if PLACEHOLDER_BYTES_RE.search(buf):
+        return True
+
+    stroked = sum(1 for _ in STROKED_TEXT_BYTES_RE.finditer(buf))
+    if stroked == 0:
+        return False
+    described = sum(1 for _ in DESCRIBED_STROKED_TEXT_RE.finditer(buf))
+    return described != stroked
+
+
+def read_mapped(file_path):
+    """Return a read-only memory map of `file_path` (bytes for empty files)."""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def close_mapped(buf):
+    """Release a buffer returned by read_mapped (closing twice is harmless)."""
+    if isinstance(buf, mmap.mmap):
+        buf.close()
+
+
+def format_number(match, precision):
+    """Round one matched number, dropping trailing zeros and the leading 0."""
+    text = f'{round(float(match.group()), precision):.{precision}f}'
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    if text in ('-0', ''):
+        return '0'
+    if text.startswith('0.'):
+        return text[1:]
+    if text.startswith('-0.'):
+        return '-' + text[2:]
+    return text
+
+
+def round_numbers(value, precision):
+    return NUMBER_RE.sub(lambda m: format_number(m, precision), value)
+
+
+def parse_style(style):
+    """Split a style attribute into an ordered {property: value} dict."""
+    declarations = {}
+    for part in style.split(';'):
+        key, sep, value = part.partition(':')
+        if sep:
+            declarations[key.strip()] = value.strip()
+    return declarations
+
+
+def is_unit_value(value):
+    try:
+        return float(value) == 1.0
+    except ValueError:
         return False
 
 
-def find_parent(root, elem):
-    """Find parent element of a given element."""
-    for parent in root.iter():
-        if elem in list(parent):
-            return parent
-    return None
+def merge_stroked_segments(group):
+    """Fold consecutive single-segment paths of a stroked-text group into one.
+
+    Segments that continue from the previous end point become a plain line
+    command; others start a new subpath. Only bare <path d="M.. L.."> children
+    are merged, so styled paths are left alone.
+    """
+    merged = []
+    target, parts, last_end = None, [], None
+
+    for child in list(group):
+        m = None
+        if child.tag == PATH_TAG and set(child.attrib) == {'d'}:
+            m = SEGMENT_RE.match(child.get('d'))
+        if m is None:
+            if target is not None:
+                target.set('d', ' '.join(parts))
+            target, parts, last_end = None, [], None
+            continue
+
+        start, end = (m[1], m[2]), (m[3], m[4])
+        if target is None:
+            target = child
+            parts = [f'M{start[0]} {start[1]}']
+        elif start != last_end:
+            parts.append(f'M{start[0]} {start[1]}')
+        if target is not child:
+            merged.append(child)
+        parts.append(f'L{end[0]} {end[1]}')
+        last_end = end
+
+    if target is not None:
+        target.set('d', ' '.join(parts))
+
+    if merged:
+        doomed = set(map(id, merged))
+        group[:] = [child for child in group if id(child) not in doomed]
+    return len(merged)
+
+
+def optimize_element(elem, inherited, precision):
+    """Minify `elem` and its subtree in place.
+
+    `inherited` holds the effective fill and unit-opacity values from the
+    ancestors, so a default is only dropped where it does not override
+    anything. Returns False when `elem` is an empty group that can go.
+    """
+    inherited = dict(inherited)
+    style = parse_style(elem.get('style', ''))
+    for key in UNIT_OPACITIES:
+        for source in (style, elem.attrib):
+            value = source.get(key)
+            if value is not None and is_unit_value(value) and is_unit_value(inherited[key]):
+                del source[key]
+            elif value is not None:
+                inherited[key] = value
+    for source in (style, elem.attrib):
+        if is_unit_value(source.get('opacity', '')):
+            del source['opacity']
+        if 'fill' in source:
+            inherited['fill'] = source['fill']
+    # schemdraw writes "stroke-dasharray:-", which browsers ignore anyway
+    if style.get('stroke-dasharray') == '-':
+        del style['stroke-dasharray']
+
+    if 'style' in elem.attrib:
+        if style:
+            elem.set('style', ';'.join(f'{k}:{round_numbers(v, precision)}' for k, v in style.items()))
+        else:
+            del elem.attrib['style']
+    if IDENTITY_TRANSFORM_RE.match(elem.get('transform', 'x')):
+        del elem.attrib['transform']
+    for name in NUMERIC_ATTRS.intersection(elem.attrib):
+        elem.set(name, round_numbers(elem.get(name), precision))
+
+    # Merging is only safe where the joined polyline cannot be filled
+    if elem.get('class') == 'stroked-text' and inherited['fill'] == 'none':
+        merge_stroked_segments(elem)
+
+    keep = [child for child in elem if optimize_element(child, inherited, precision)]
+    if len(keep) != len(elem):
+        elem[:] = keep
+
+    # Whitespace only matters inside text content
+    if elem.tag not in TEXT_CONTENT_TAGS:
+        if elem.text and not elem.text.strip():
+            elem.text = None
+        for child in elem:
+            if child.tail and not child.tail.strip():
+                child.tail = None
+
+    return not (elem.tag == G_TAG and len(elem) == 0 and not elem.text
+                and 'id' not in elem.attrib)
+
+
+def optimize_svg(root, precision=DEFAULT_PRECISION):
+    """Run the minification pass over a parsed SVG tree."""
+    optimize_element(root, {'fill': 'black', 'fill-opacity': '1', 'stroke-opacity': '1'},
+                     precision)
+
+
+def clean_svg_bytes(data, rules=DEFAULT_RULES, precision=None, stats=None):
+    """Clean an SVG document held in memory.
+
+    With a `precision` the optimisation pass runs too. When a `stats` dict is
+    given, phase timings (parse_s, traverse_s, write_s) and the removals per
+    rule (removed_by_rule) are stored in it. Returns (removed_count,
+    cleaned_bytes); cleaned_bytes is None when the document is unchanged.
+    """
+    stats = {} if stats is None else stats
+    started = time.perf_counter()
+
+    # Parse SVG
+    ET.register_namespace('', SVG_NS)
+    root = ET.fromstring(data)
+    parsed = time.perf_counter()
+    stats['parse_s'] = parsed - started
+
+    removals = find_removals(root, rules)
+    stats['removed_by_rule'] = dict(Counter(rule_name for _, _, rule_name in removals))
+    if not removals and precision is None:
+        stats['traverse_s'] = time.perf_counter() - parsed
+        return 0, None
+
+    apply_removals(removals)
+    if precision is not None:
+        optimize_svg(root, precision)
+    traversed = time.perf_counter()
+    stats['traverse_s'] = traversed - parsed
+
+    cleaned = ET.tostring(root, encoding='utf-8', xml_declaration=True)
+    stats['write_s'] = time.perf_counter() - traversed
+    if cleaned == data:
+        return len(removals), None
+    return len(removals), cleaned
+
+
+def content_hash(data):
+    """Return the hex digest used to recognise unchanged files."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def rules_key(rules):
+    """Describe a rule set so manifests written with other rules are ignored."""
+    parts = []
+    for rule in rules:
+        regex = getattr(rule.match, 'regex', None)
+        parts.append(f'{rule.name}={regex.pattern}' if regex else rule.name)
+    return '|'.join(parts)
 
 
-def process_file(file_path):
-    """Process a single SVG file."""
+def load_manifest(directory, rules, precision=None):
+    """Return {file name: entry} from the directory manifest, if still valid."""
+    return read_manifest(directory / MANIFEST_NAME, version=MANIFEST_VERSION,
+                         rules=rules_key(rules), precision=precision)
+
+
+def save_manifest(directory, rules, entries, precision=None):
+    """Atomically replace the directory manifest with `entries`."""
+    write_manifest(directory / MANIFEST_NAME, entries, version=MANIFEST_VERSION,
+                   rules=rules_key(rules), precision=precision)
+
+
+def process_file(file_path, rules=DEFAULT_RULES, known=None, precision=None):
+    """Process a single SVG file.
+
+    `known` is the file's manifest entry from a previous run, if any; a
+    `precision` enables the optimisation pass. Returns (summary line,
+    manifest entry, stats); the entry is None when the file failed. `stats`
+    is the file's record for --report: status (skipped, prescanned, clean,
+    cleaned or error), phase timings in seconds, sizes and removals per rule.
+    """
+    stats = {
+        'file': file_path.name, 'status': 'error', 'bytes_before': 0, 'bytes_after': 0,
+        'parse_s': 0.0, 'traverse_s': 0.0, 'write_s': 0.0, 'removed_by_rule': {},
+    }
+    buf = None
     try:
-        clean_svg_references(file_path)
+        buf = read_mapped(file_path)
+        bytes_before = stats['bytes_before'] = stats['bytes_after'] = len(buf)
+        digest = content_hash(buf)
+        if known and known.get('sha256') == digest:
+            stats['status'] = 'skipped'
+            return f"  {file_path.name}: Unchanged since last run (skipped)", known, stats
+
+        if precision is not None or may_need_cleaning(buf, rules):
+            removed_count, cleaned = clean_svg_bytes(buf[:], rules, precision, stats)
+            stats['status'] = 'clean'
+        else:
+            removed_count, cleaned = 0, None
+            stats['status'] = 'prescanned'
+
+        if cleaned is not None:
+            close_mapped(buf)
+            # Write back to file
+            started = time.perf_counter()
+            file_path.write_bytes(cleaned)
+            stats['write_s'] += time.perf_counter() - started
+            stats['bytes_after'] = len(cleaned)
+            stats['status'] = 'cleaned'
+            digest = content_hash(cleaned)
     except Exception as e:
-        print(f"✗ {file_path.name}: Error - {e}")
+        stats['status'] = 'error'
+        stats['error'] = str(e)
+        return f"✗ {file_path.name}: Error - {e}", None, stats
+    finally:
+        close_mapped(buf)
+
+    entry = {'sha256': digest, 'removed': removed_count}
+    if removed_count > 0:
+        line = f"✓ {file_path.name}: Removed {removed_count} reference element(s)"
+    else:
+        line = f"  {file_path.name}: No reference elements found"
+
+    if precision is not None:
+        bytes_after = len(cleaned) if cleaned is not None else bytes_before
+        saved = bytes_before - bytes_after
+        entry['saved'] = saved
+        line += f", optimised {bytes_before} → {bytes_after} bytes (-{saved})"
+    return line, entry, stats
+
+
+def process_files(svg_files, rules=DEFAULT_RULES, jobs=1, manifest=None, precision=None):
+    """Yield (file, summary line, manifest entry, stats) for each file, in order.
+
+    With more than one job the files are spread over a process pool; results
+    are still yielded in the order of `svg_files`.
+    """
+    manifest = manifest or {}
+    known = [manifest.get(svg_file.name) for svg_file in svg_files]
+
+    if jobs <= 1 or len(svg_files) <= 1:
+        results = map(process_file, svg_files, repeat(rules), known, repeat(precision))
+        for svg_file, result in zip(svg_files, results):
+            yield (svg_file, *result)
+        return
+
+    workers = min(jobs, len(svg_files))
+    chunksize = max(1, len(svg_files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(process_file, svg_files, repeat(rules), known,
+                           repeat(precision), chunksize=chunksize)
+        for svg_file, result in zip(svg_files, results):
+            yield (svg_file, *result)
+
+
+class StreamingCleaner(ContentHandler):
+    """SAX handler that copies events to `out`, dropping placeholder subtrees.
+
+    At most one element is held back at a time: the one whose fate is still
+    open. A plain element waits until its own text is complete (first child
+    or end tag); a stroked-text group waits until its first <desc> closes.
+    Everything else is written as soon as it arrives.
+
+    Supports the stroked-text rule and text rules; those are the only rule
+    kinds that can be decided from a bounded look-ahead.
+    """
+
+    def __init__(self, out, rules=DEFAULT_RULES):
+        super().__init__()
+        self.out = out
+        self.check_stroked = any(rule.match is is_placeholder_stroked_text for rule in rules)
+        self.text_regexes = [rule.match.regex for rule in rules
+                             if isinstance(rule.match, TextMatch)]
+        self.removed_count = 0
+        self.depth = 0          # open elements already written to `out`
+        self.skip_depth = 0     # open elements inside a dropped subtree
+        self.drop_tail = False  # ElementTree drops a removed element's tail too
+        self.pending = None     # buffered events of the undecided element
+
+    # SAX callbacks
+
+    def startDocument(self):
+        self.out.startDocument()
+
+    def endDocument(self):
+        self.out.endDocument()
+
+    def startElement(self, name, attrs):
+        self.feed(('start', name, dict(attrs.items())))
+
+    def endElement(self, name):
+        self.feed(('end', name, None))
+
+    def characters(self, content):
+        self.feed(('text', content, None))
+
+    ignorableWhitespace = characters
+
+    def processingInstruction(self, target, data):
+        self.feed(('pi', target, data))
+
+    # Filtering
+
+    def feed(self, event):
+        """Route one event: skip it, buffer it, or write it through."""
+        kind, name, value = event
+
+        if self.skip_depth:
+            if kind == 'start':
+                self.skip_depth += 1
+            elif kind == 'end':
+                self.skip_depth -= 1
+                self.drop_tail = self.skip_depth == 0
+            return
+
+        if self.pending is not None:
+            self.buffer(event)
+            return
+
+        if kind == 'text':
+            if not self.drop_tail:
+                self.out.characters(name)
+            return
+
+        self.drop_tail = False
+        if kind == 'start':
+            if self.depth == 0:
+                # The root element is never removed
+                self.emit_start(name, value)
+            else:
+                self.start_pending(event, value.get('class') == 'stroked-text')
+        elif kind == 'end':
+            self.out.endElement(name)
+            self.depth -= 1
+        else:
+            self.out.processingInstruction(name, value)
+
+    def emit_start(self, name, attrs):
+        self.out.startElement(name, attrs)
+        self.depth += 1
+
+    def start_pending(self, event, stroked):
+        self.pending = [event]
+        self.pending_depth = 1
+        self.own_text = []
+        self.own_text_done = False
+        self.stroked = stroked and self.check_stroked
+        self.desc_depth = None  # depth of the first <desc> while reading it
+        self.desc_text = None   # its text once the <desc> has closed
+
+    def buffer(self, event):
+        """Add an event to the pending element and resolve it once decidable."""
+        kind, name, _ = event
+        self.pending.append(event)
+
+        if kind == 'start':
+            if self.pending_depth == 1:
+                self.own_text_done = True
+            self.pending_depth += 1
+            if self.stroked and self.desc_text is None:
+                if self.desc_depth is None and name.rsplit(':', 1)[-1] == 'desc':
+                    self.desc_depth = self.pending_depth
+                    self.desc_chunks = []
+                elif self.desc_depth is not None:
+                    # <desc> text ends at its first child
+                    self.desc_text = ''.join(self.desc_chunks)
+        elif kind == 'text':
+            if self.pending_depth == 1 and not self.own_text_done:
+                self.own_text.append(name)
+            if self.desc_depth == self.pending_depth and self.desc_text is None:
+                self.desc_chunks.append(name)
+        elif kind == 'end':
+            if self.desc_depth == self.pending_depth and self.desc_text is None:
+                self.desc_text = ''.join(self.desc_chunks)
+            self.pending_depth -= 1
+            if self.pending_depth == 0:
+                self.own_text_done = True
+
+        decision = self.decide()
+        if decision is not None:
+            self.resolve(decision)
+
+    def decide(self):
+        """Return True to drop, False to keep, or None while undecided."""
+        if self.stroked:
+            if self.desc_text is not None:
+                if not self.desc_text or PLACEHOLDER_RE.search(self.desc_text):
+                    return True
+            elif self.pending_depth == 0:
+                # Group closed without any <desc>
+                return True
+            else:
+                return None
+
+        if not self.own_text_done:
+            return None
+        text = ''.join(self.own_text)
+        return bool(text) and any(regex.search(text) for regex in self.text_regexes)
+
+    def resolve(self, drop):
+        events, open_depth = self.pending, self.pending_depth
+        self.pending = None
+
+        if drop:
+            self.removed_count += 1
+            if open_depth:
+                self.skip_depth = open_depth
+            else:
+                self.drop_tail = True
+            return
+
+        _, name, attrs = events[0]
+        self.emit_start(name, attrs)
+        # Replay the look-ahead; nested elements get their own decision
+        for event in events[1:]:
+            self.feed(event)
+
+
+def clean_svg_stream(instream, outstream, rules=DEFAULT_RULES):
+    """Filter an SVG from `instream` to `outstream` without building a tree.
+
+    Both streams are binary. Returns the number of elements removed.
+    """
+    out = XMLGenerator(outstream, encoding='utf-8', short_empty_elements=True)
+    cleaner = StreamingCleaner(out, rules)
+    xml.sax.parse(instream, cleaner)
+    return cleaner.removed_count
+
+
+def build_report(file_stats, wall_s, jobs):
+    """Assemble the --report document from per-file stats, with totals."""
+    totals = {
+        'files': len(file_stats),
+        'jobs': jobs,
+        'wall_s': wall_s,
+        'files_per_s': len(file_stats) / wall_s if wall_s > 0 else None,
+        'status': dict(Counter(stats['status'] for stats in file_stats)),
+        'removed': 0,
+        'removed_by_rule': Counter(),
+    }
+    for key in ('parse_s', 'traverse_s', 'write_s', 'bytes_before', 'bytes_after'):
+        totals[key] = sum(stats[key] for stats in file_stats)
+    for stats in file_stats:
+        totals['removed_by_rule'].update(stats['removed_by_rule'])
+    totals['removed'] = sum(totals['removed_by_rule'].values())
+    totals['removed_by_rule'] = dict(totals['removed_by_rule'])
+    return {'files': file_stats, 'totals': totals}
+
+
+def write_report(report_path, report):
+    Path(report_path).write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+
+
+def build_rules(patterns):
+    """Return the default rules extended with user-supplied text patterns."""
+    rules = list(DEFAULT_RULES)
+    for i, pattern in enumerate(patterns, start=1):
+        rules.append(text_rule(f'pattern-{i}', pattern))
+    return rules
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python clean-svg-refs.py <svg_file_or_directory>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description='Remove REF**/VAL** placeholders from KiCad footprint SVGs.'
+    )
+    parser.add_argument('path', help='SVG file, directory of SVG files, or - for stdin')
+    parser.add_argument(
+        '--pattern', action='append', default=[], metavar='REGEX',
+        help='also remove elements whose text matches REGEX (repeatable)'
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1, metavar='N',
+        help='number of worker processes for directories (0 = one per CPU)'
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help=f'reprocess every file even if {MANIFEST_NAME} says it is clean'
+    )
+    parser.add_argument(
+        '--optimize', action='store_true',
+        help='also minify: round numbers, merge stroked-text, drop defaults'
+    )
+    parser.add_argument(
+        '--precision', type=int, default=DEFAULT_PRECISION, metavar='N',
+        help=f'decimals kept by --optimize (default {DEFAULT_PRECISION})'
+    )
+    parser.add_argument(
+        '--report', metavar='FILE',
+        help='write per-file timings, sizes and removals per rule as JSON'
+    )
+    args = parser.parse_args()
 
-    path = Path(sys.argv[1])
+    path = Path(args.path)
+    rules = build_rules(args.pattern)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    precision = args.precision if args.optimize else None
 
-    if path.is_file() and path.suffix == '.svg':
-        process_file(path)
+    started = time.perf_counter()
+
+    if args.path == '-':
+        if args.optimize:
+            parser.error('--optimize needs whole documents and cannot be used with -')
+        if args.report:
+            parser.error('--report needs file paths and cannot be used with -')
+        try:
+            removed_count = clean_svg_stream(sys.stdin.buffer, sys.stdout.buffer, rules)
+        except Exception as e:
+            print(f"✗ <stdin>: Error - {e}", file=sys.stderr)
+            sys.exit(1)
+        if removed_count > 0:
+            print(f"✓ <stdin>: Removed {removed_count} reference element(s)", file=sys.stderr)
+        else:
+            print("  <stdin>: No reference elements found", file=sys.stderr)
+    elif path.is_file() and path.suffix == '.svg':
+        line, _, stats = process_file(path, rules, precision=precision)
+        print(line)
+        if args.report:
+            write_report(args.report, build_report([stats], time.perf_counter() - started, 1))
     elif path.is_dir():
         svg_files = list(path.glob('*.svg'))
         if not svg_files:
             print(f"No SVG files found in {path}")
             sys.exit(1)
 
+        manifest = {} if args.force else load_manifest(path, rules, precision)
+        entries = {}
+        file_stats = []
+
         print(f"Processing {len(svg_files)} SVG files...\n")
-        for svg_file in sorted(svg_files):
-            process_file(svg_file)
+        results = process_files(sorted(svg_files), rules, jobs, manifest, precision)
+        for svg_file, line, entry, stats in results:
+            print(line)
+            file_stats.append(stats)
+            if entry is not None:
+                entries[svg_file.name] = entry
+
+        save_manifest(path, rules, entries, precision)
+        if args.report:
+            report = build_report(file_stats, time.perf_counter() - started, jobs)
+            write_report(args.report, report)
     else:
         print(f"Error: {path} is not a valid SVG file or directory")
         sys.exit(1)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Build and query the cached footprint library index.
+
+Indexes footprints/kicad/zudo-power.pretty (the library in fp-lib-table,
+looked up first) and footprints/kicad/*.kicad_mod with
+scripts/kicad_footprints.py. The index lives in .kicad-cache/ at the repo
+root and only footprints whose file content changed are re-parsed.
+
+Usage:
+    python3 footprints/scripts/footprint-index.py               # Refresh and list
+    python3 footprints/scripts/footprint-index.py SOT-23-3_L2.9-W1.6-P1.90-LS2.8-BR
+    python3 footprints/scripts/footprint-index.py --check-board # Board pads vs library
+    python3 footprints/scripts/footprint-index.py --clear       # Rebuild from scratch
+"""
+
+import argparse
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
+
+from kicad_board import load_board, rotate  # noqa: E402
+from kicad_cache import CACHE_DIR_NAME  # noqa: E402
+from kicad_footprints import CACHE_FILE_NAME, load_index, repo_libraries  # noqa: E402
+
+
+CACHE_FILE = REPO_ROOT / CACHE_DIR_NAME / CACHE_FILE_NAME
+DEFAULT_BOARD = REPO_ROOT / 'zudo-pd.kicad_pcb'
+TOLERANCE = 0.01   # mm
+
+
+def size(box):
+    return f"{box[2] - box[0]:.2f} x {box[3] - box[1]:.2f} mm" if box else '-'
+
+
+def show(entry):
+    print(f"{entry.name} ({entry.library or 'footprints/kicad'}) {' '.join(entry.attributes)}")
+    print(f"  body {size(entry.body)}, courtyard {size(entry.courtyard)}, overall {size(entry.bbox)}")
+    print(f"  layers: {', '.join(f'{layer} {n}' for layer, n in sorted(entry.layers.items()))}")
+    for pad in entry.pads:
+        drill = f" drill {pad.drill:g}" if pad.drill else ''
+        print(f"  pad {pad.number:>3} {pad.kind:<9} {pad.shape:<8} at ({pad.x:g}, {pad.y:g}) "
+              f"{pad.width:g} x {pad.height:g}{drill}")
+
+
+def check_board(index, board_file):
+    """Print board footprints whose pads differ from the library; return the count."""
+    board = load_board(board_file)
+    problems = 0
+    for footprint in sorted(board.footprints.values(), key=lambda f: f.ref):
+        entry = index.get(footprint.name)
+        if entry is None:
+            continue
+        # Pad numbers repeat (shield tabs), so compare sorted positions per number
+        library, placed = defaultdict(list), defaultdict(list)
+        for pad in entry.pads:
+            library[pad.number].append((pad.x, pad.y))
+        for pad in footprint.pads:
+            dx, dy = rotate(pad.x - footprint.x, pad.y - footprint.y, -footprint.angle)
+            placed[pad.number].append((dx, -dy if footprint.layer == 'B.Cu' else dy))
+        moved = [number for number in library.keys() & placed.keys()
+                 if len(library[number]) != len(placed[number])
+                 or any(max(abs(a[0] - b[0]), abs(a[1] - b[1])) > TOLERANCE
+                        for a, b in zip(sorted(library[number]), sorted(placed[number])))]
+        differs = library.keys() ^ placed.keys()
+        if moved or differs:
+            problems += 1
+            detail = []
+            if differs:
+                detail.append(f"pads {' '.join(sorted(differs))} only on one side")
+            if moved:
+                detail.append(f"pads {' '.join(sorted(moved))} moved")
+            print(f"✗ {footprint.ref} {footprint.name}: {'; '.join(detail)}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and query the footprint library index.')
+    parser.add_argument('name', nargs='?', help="show one footprint ('name' or 'zudo-pd:name')")
+    parser.add_argument('--check-board', action='store_true',
+                        help=f'compare placed footprints in {DEFAULT_BOARD.name} with the library')
+    parser.add_argument('--clear', action='store_true', help='delete the index and rebuild it')
+    args = parser.parse_args()
+
+    if args.clear:
+        CACHE_FILE.unlink(missing_ok=True)
+    index = load_index(repo_libraries(REPO_ROOT), CACHE_FILE)
+    stats = index.stats
+    print(f"✓ {stats['files']} footprints indexed: {stats['parsed']} parsed, "
+          f"{stats['reused']} reused ({stats['ms']:.0f} ms)")
+
+    if args.name:
+        entry = index.get(args.name)
+        if entry is None:
+            print(f"✗ No footprint {args.name}")
+            sys.exit(1)
+        show(entry)
+    elif args.check_board:
+        problems = check_board(index, DEFAULT_BOARD)
+        if problems:
+            print(f"\n{problems} footprint(s) differ from the library")
+            sys.exit(1)
+        print("✓ Placed footprints match the library")
+    else:
+        for name in index.names():
+            entry = index[name]
+            print(f"  {name:<48} {len(entry.pads):>3} pads  {size(entry.body)}")
+
+
+if __name__ == '__main__':
+    main()
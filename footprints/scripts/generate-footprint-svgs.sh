@@ -2,7 +2,8 @@
 #
 # Generate SVG files from KiCad footprints
 #
-# Usage: ./generate-footprint-svgs.sh
+# Usage: ./generate-footprint-svgs.sh              # Native renderer (no KiCad needed)
+#        ./generate-footprint-svgs.sh --kicad-cli  # Export with kicad-cli, then clean
 #
 
 set -e  # Exit on error
@@ -18,6 +19,26 @@ PRETTY_DIR="../kicad/zudo-power.pretty"
 IMAGES_DIR="../images"
 DOCS_DIR="../../doc/docs/_fragments/footprints"
 
+# Create .pretty directory if needed
+echo "Creating .pretty directory..."
+mkdir -p "$PRETTY_DIR"
+
+# Copy .kicad_mod files to .pretty directory (the library fp-lib-table
+# points the board at), whichever renderer is used
+echo "Copying .kicad_mod files to .pretty directory..."
+cp -v "$KICAD_DIR"/*.kicad_mod "$PRETTY_DIR/"
+echo ""
+
+# Native renderer: draws straight from the .kicad_mod files, skips unchanged
+# footprints and never emits REF**/VAL**, so no cleaning pass is needed
+if [ "$1" != "--kicad-cli" ]; then
+    echo "Rendering SVG files..."
+    python3 ./render-footprint-svgs.py -o "$IMAGES_DIR" -o "$DOCS_DIR"
+    echo ""
+    echo "✅ All done!"
+    exit 0
+fi
+
 # Check if kicad-cli is available
 if ! command -v kicad-cli &> /dev/null; then
     echo "❌ Error: kicad-cli is not installed or not in PATH"
@@ -30,15 +51,6 @@ fi
 echo "✅ Found kicad-cli"
 echo ""
 
-# Create .pretty directory if needed
-echo "Creating .pretty directory..."
-mkdir -p "$PRETTY_DIR"
-
-# Copy .kicad_mod files to .pretty directory
-echo "Copying .kicad_mod files to .pretty directory..."
-cp -v "$KICAD_DIR"/*.kicad_mod "$PRETTY_DIR/"
-echo ""
-
 # Export SVGs using KiCad CLI
 echo "Exporting SVG files..."
 mkdir -p "$IMAGES_DIR"
@@ -58,7 +70,7 @@ CLEAN_SCRIPT="./clean-svg-refs.py"
 
 if [ -f "$CLEAN_SCRIPT" ]; then
     echo "Cleaning SVG files (removing REF** labels)..."
-    python3 "$CLEAN_SCRIPT" "$IMAGES_DIR/"
+    python3 "$CLEAN_SCRIPT" "$IMAGES_DIR/" --jobs 0
 
     if [ $? -eq 0 ]; then
         echo "✅ SVG cleaning successful"
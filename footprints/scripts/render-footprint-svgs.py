@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Render KiCad footprints to SVG without kicad-cli.
+
+Draws pads (with their drill holes), silkscreen, fab and courtyard graphics
+and visible footprint text straight from the .kicad_mod S-expressions, in
+black and white like `kicad-cli fp export svg --black-and-white`. Reference
+and value placeholders (REF**, VAL**, %R, ${REFERENCE}) are never drawn, so
+the output needs no clean-svg-refs.py pass.
+
+Footprints come from the cached footprint index (scripts/kicad_footprints.py):
+every footprints/kicad/*.kicad_mod, plus the zudo-power.pretty footprints that
+have no loose copy. Each output directory keeps a manifest
+(.footprint-svgs.json) of the source hash behind every SVG, so unchanged
+footprints are skipped without being parsed and the rest are rendered in
+parallel. A full run also deletes the SVGs in the manifest whose footprint
+has left the library.
+
+Usage:
+    python3 footprints/scripts/render-footprint-svgs.py                  # Images and doc fragments
+    python3 footprints/scripts/render-footprint-svgs.py C0603 R0603       # Only these
+    python3 footprints/scripts/render-footprint-svgs.py -o out/ --force   # Elsewhere, render everything
+    python3 footprints/scripts/render-footprint-svgs.py --jobs 1          # In this process
+"""
+
+import argparse
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
+
+from kicad_board import rotate  # noqa: E402
+from kicad_cache import CACHE_DIR_NAME, read_manifest, write_manifest  # noqa: E402
+from kicad_footprints import CACHE_FILE_NAME, arc_geometry, load_index, repo_libraries  # noqa: E402
+from kicad_sexpr import parse_text  # noqa: E402
+
+
+INDEX_FILE = REPO_ROOT / CACHE_DIR_NAME / CACHE_FILE_NAME
+DEFAULT_OUTPUTS = [REPO_ROOT / 'footprints' / 'images',
+                   REPO_ROOT / 'doc' / 'docs' / '_fragments' / 'footprints']
+
+MANIFEST_NAME = '.footprint-svgs.json'
+# Bump when the drawing changes so existing SVGs are rendered again
+RENDER_VERSION = 1
+
+# Text KiCad substitutes on a board; in a library it is only a placeholder
+PLACEHOLDER_RE = re.compile(r'(REF|VAL)\*\*|%[RV]|\$\{(REFERENCE|VALUE)\}')
+
+LAYER_CLASSES = {'.CrtYd': 'courtyard', '.Courtyard': 'courtyard', '.Fab': 'fab',
+                 '.SilkS': 'silkscreen', '.Silkscreen': 'silkscreen'}
+STROKED = 'fill="none" stroke="#000" stroke-linecap="round" stroke-linejoin="round"'
+# Bottom to top
+GROUPS = {
+    'courtyard': STROKED,
+    'fab': STROKED,
+    'pads': 'fill="#000" stroke="none"',
+    'holes': 'fill="#fff" stroke="#000" stroke-width="0.05"',
+    'silkscreen': STROKED,
+    'text': 'fill="#000" stroke="none" font-family="sans-serif"',
+}
+MARGIN = 0.5            # mm around the drawing
+DEFAULT_WIDTH = 0.1     # mm, for graphics without a width
+TEXT_ASPECT = 0.6       # rough advance of one character per font height
+
+
+def num(value):
+    return f'{round(value, 4) + 0:g}'
+
+
+def layer_class(layer):
+    for suffix, name in LAYER_CLASSES.items():
+        if layer and layer.endswith(suffix):
+            return name
+    return None
+
+
+class Drawing:
+    """SVG elements per group plus the extent they cover (footprint mm)."""
+
+    def __init__(self):
+        self.groups = {name: [] for name in GROUPS}
+        self.box = [math.inf, math.inf, -math.inf, -math.inf]
+
+    def add(self, group, element, points, grow=0.0):
+        self.groups[group].append(element)
+        for x, y in points:
+            self.box = [min(self.box[0], x - grow), min(self.box[1], y - grow),
+                        max(self.box[2], x + grow), max(self.box[3], y + grow)]
+
+    def svg(self, title):
+        x1, y1, x2, y2 = self.box if self.box[0] <= self.box[2] else (0, 0, 0, 0)
+        x1, y1, width, height = x1 - MARGIN, y1 - MARGIN, x2 - x1 + 2 * MARGIN, y2 - y1 + 2 * MARGIN
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="{num(width)}mm" '
+                 f'height="{num(height)}mm" viewBox="{num(x1)} {num(y1)} {num(width)} {num(height)}">',
+                 f'<title>{escape(title)}</title>']
+        for name, style in GROUPS.items():
+            if self.groups[name]:
+                lines.append(f'<g class="{name}" {style}>')
+                lines.extend(self.groups[name])
+                lines.append('</g>')
+        lines.append('</svg>')
+        return '\n'.join(lines) + '\n'
+
+
+def stroke_width(node):
+    stroke = node.find('stroke')
+    width = node.floats('width') or (stroke.floats('width') if stroke is not None else [])
+    return width[0] if width else DEFAULT_WIDTH
+
+
+def filled(node):
+    fill = node.find('fill')
+    if fill is None:
+        return node.name.endswith('_poly')      # KiCad 5 polygons are always filled
+    return fill.value() in ('solid', 'yes')
+
+
+def arc_path(cx, cy, radius, start, sweep):
+    # An SVG arc whose ends coincide draws nothing, so go half a turn at a time
+    steps = max(1, math.ceil(abs(sweep) / math.pi - 1e-9))
+    points = [(cx + radius * math.cos(start + sweep * k / steps),
+               cy + radius * math.sin(start + sweep * k / steps)) for k in range(steps + 1)]
+    d = [f'M {num(points[0][0])} {num(points[0][1])}']
+    for x, y in points[1:]:
+        d.append(f'A {num(radius)} {num(radius)} 0 0 {1 if sweep > 0 else 0} {num(x)} {num(y)}')
+    return ' '.join(d), points
+
+
+def graphic(node):
+    """(SVG element, extent points) of an fp_*/gr_* item, or None."""
+    kind = node.name.split('_', 1)[-1]
+    width = stroke_width(node)
+    fill = ' fill="#000"' if filled(node) else ''
+    attrs = f' stroke-width="{num(width)}"{fill}'
+    if kind == 'line':
+        (x1, y1), (x2, y2) = node.floats('start'), node.floats('end')
+        return f'<path d="M {num(x1)} {num(y1)} L {num(x2)} {num(y2)}"{attrs}/>', [(x1, y1), (x2, y2)]
+    if kind == 'rect':
+        (x1, y1), (x2, y2) = node.floats('start'), node.floats('end')
+        x1, x2, y1, y2 = min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2)
+        return (f'<rect x="{num(x1)}" y="{num(y1)}" width="{num(x2 - x1)}" height="{num(y2 - y1)}"{attrs}/>',
+                [(x1, y1), (x2, y2)])
+    if kind == 'circle':
+        (cx, cy), (ex, ey) = node.floats('center'), node.floats('end')
+        r = math.hypot(ex - cx, ey - cy)
+        return (f'<circle cx="{num(cx)}" cy="{num(cy)}" r="{num(r)}"{attrs}/>',
+                [(cx - r, cy - r), (cx + r, cy + r)])
+    if kind == 'arc':
+        geometry = arc_geometry(node)
+        if geometry is None:
+            (x1, y1), (x2, y2) = node.floats('start'), node.floats('end')
+            return f'<path d="M {num(x1)} {num(y1)} L {num(x2)} {num(y2)}"{attrs}/>', [(x1, y1), (x2, y2)]
+        d, points = arc_path(*geometry)
+        return f'<path d="{d}"{attrs}/>', points
+    if kind == 'poly':
+        points = [tuple(xy.floats()) for xy in node.find('pts').find_all('xy')]
+        if not points:
+            return None
+        d = 'M ' + ' L '.join(f'{num(x)} {num(y)}' for x, y in points) + ' Z'
+        return f'<path d="{d}"{attrs}/>', points
+    return None
+
+
+def _pad_shape(shape, width, height, node):
+    """SVG element for a pad's basic shape, centred on the origin."""
+    if shape == 'circle':
+        return f'<circle r="{num(width / 2)}"/>'
+    rx = 0.0
+    if shape == 'oval':
+        rx = min(width, height) / 2
+    elif shape == 'roundrect':
+        ratio = node.floats('roundrect_rratio')
+        rx = (ratio[0] if ratio else 0.25) * min(width, height)
+    corner = f' rx="{num(rx)}"' if rx else ''
+    return (f'<rect x="{num(-width / 2)}" y="{num(-height / 2)}" '
+            f'width="{num(width)}" height="{num(height)}"{corner}/>')
+
+
+def _transformed(element, transform):
+    tag, rest = element.split(' ', 1)
+    return f'{tag} transform="{transform}" {rest}'
+
+
+def draw_pad(drawing, node):
+    kind, shape = (node.atoms() + ['', '', ''])[1:3]
+    x, y, *angle = node.floats('at') + [0.0]
+    angle = angle[0]
+    width, height = (node.floats('size') + [0.0, 0.0])[:2]
+    layers = node.find('layers').atoms() if node.find('layers') is not None else []
+    transform = f'translate({num(x)} {num(y)})' + (f' rotate({num(-angle)})' if angle else '')
+
+    def placed(points):
+        return [(x + dx, y + dy) for dx, dy in (rotate(px, py, angle) for px, py in points)]
+
+    if any(layer.endswith('.Cu') for layer in layers):
+        elements, extent = [], [(-width / 2, -height / 2), (width / 2, height / 2)]
+        if shape == 'custom':
+            options = node.find('options')
+            anchor = options.value('anchor', 'circle') if options is not None else 'circle'
+            elements.append(_pad_shape(anchor, width, height, node))
+            primitives = node.find('primitives')
+            for primitive in primitives if primitives is not None else ():
+                item = graphic(primitive)
+                if item is not None:
+                    element, points = item
+                    # Pad primitives are copper: filled polygons, stroked outlines
+                    element = element.replace('/>', ' stroke="#000"/>')
+                    if not filled(primitive):
+                        element = element.replace('/>', ' fill="none"/>')
+                    elements.append(element)
+                    extent += points
+        else:
+            elements.append(_pad_shape(shape, width, height, node))
+        corners = [(px, py) for px in (min(p[0] for p in extent), max(p[0] for p in extent))
+                   for py in (min(p[1] for p in extent), max(p[1] for p in extent))]
+        body = (_transformed(elements[0], transform) if len(elements) == 1
+                else f'<g transform="{transform}">{"".join(elements)}</g>')
+        drawing.add('pads', body, placed(corners))
+
+    drill = node.find('drill')
+    if drill is not None:
+        sizes = drill.floats()
+        oval = 'oval' in drill.atoms()
+        offset = drill.floats('offset') or [0.0, 0.0]
+        dw = sizes[0] if sizes else 0.0
+        dh = sizes[1] if oval and len(sizes) > 1 else dw
+        if dw > 0:
+            hole = _pad_shape('oval' if oval else 'circle', dw, dh, drill)
+            hole_transform = transform + (f' translate({num(offset[0])} {num(offset[1])})' if any(offset) else '')
+            drawing.add('holes', _transformed(hole, hole_transform),
+                        placed([(offset[0] - dw / 2, offset[1] - dh / 2), (offset[0] + dw / 2, offset[1] + dh / 2)]))
+
+
+def draw_text(drawing, node):
+    atoms = node.atoms()
+    kind, text = (atoms + ['', ''])[:2]
+    hide = node.find('hide')
+    if (kind.lower() == 'reference' or not text or PLACEHOLDER_RE.search(text)
+            or 'hide' in atoms or (hide is not None and hide.value() != 'no')):
+        return
+    group = layer_class(node.value('layer'))
+    if group is None:
+        return
+    x, y, *angle = node.floats('at') + [0.0]
+    angle = angle[0]
+    effects = node.find('effects')
+    font = effects.find('font') if effects is not None else None
+    size = font.floats('size')[0] if font is not None and font.floats('size') else 1.0
+    justify = effects.find('justify') if effects is not None else None
+    justify = justify.atoms() if justify is not None else []
+    anchor = 'start' if 'left' in justify else 'end' if 'right' in justify else 'middle'
+    transform = f' transform="rotate({num(-angle)} {num(x)} {num(y)})"' if angle else ''
+    element = (f'<text x="{num(x)}" y="{num(y)}" font-size="{num(size)}" text-anchor="{anchor}" '
+               f'dominant-baseline="central" class={quoteattr(group)}{transform}>{escape(text)}</text>')
+    length = TEXT_ASPECT * size * len(text)
+    left = {'start': 0.0, 'middle': -length / 2, 'end': -length}[anchor]
+    corners = [(left, -size / 2), (left + length, -size / 2), (left, size / 2), (left + length, size / 2)]
+    drawing.add('text', element, [(x + dx, y + dy) for dx, dy in (rotate(px, py, angle) for px, py in corners)])
+
+
+def render(text, title):
+    """SVG document for the text of one .kicad_mod."""
+    root, = parse_text(text)
+    drawing = Drawing()
+    for node in root:
+        if node.name == 'pad':
+            draw_pad(drawing, node)
+        elif node.name in ('fp_text', 'property'):
+            draw_text(drawing, node)
+        elif node.name.startswith('fp_'):
+            group = layer_class(node.value('layer'))
+            item = graphic(node) if group else None
+            if item is not None:
+                element, points = item
+                drawing.add(group, element, points, stroke_width(node) / 2)
+    return drawing.svg(title)
+
+
+def render_file(path, name):
+    """(name, SVG text or None, error or None); runs in a worker process."""
+    try:
+        return name, render(Path(path).read_text(encoding='utf-8'), name), None
+    except Exception as e:
+        return name, None, str(e)
+
+
+def select_footprints(index):
+    """{name: LibraryFootprint}, the loose footprints/kicad copy winning."""
+    chosen = {}
+    for entry in index.entries.values():
+        if entry.name not in chosen or entry.library is None:
+            chosen[entry.name] = entry
+    return dict(sorted(chosen.items()))
+
+
+def render_all(footprints, jobs):
+    """Yield render_file results, in a process pool when there is more than one."""
+    paths, names = [entry.path for entry in footprints], [entry.name for entry in footprints]
+    if jobs <= 1 or len(footprints) <= 1:
+        yield from map(render_file, paths, names)
+        return
+    workers = min(jobs, len(footprints))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(render_file, paths, names, chunksize=max(1, len(footprints) // (workers * 4)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render KiCad footprints to SVG without kicad-cli.')
+    parser.add_argument('names', nargs='*', help='footprints to render (default: all)')
+    parser.add_argument('-o', '--output', type=Path, action='append', metavar='DIR',
+                        help='output directory, repeatable (default: footprints/images and '
+                             'doc/docs/_fragments/footprints)')
+    parser.add_argument('-j', '--jobs', type=int, default=0, metavar='N',
+                        help='number of worker processes (0 = one per CPU, the default)')
+    parser.add_argument('--force', action='store_true',
+                        help=f'render every footprint even if {MANIFEST_NAME} says it is current')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    footprints = select_footprints(load_index(repo_libraries(REPO_ROOT), INDEX_FILE))
+    if args.names:
+        missing = [name for name in args.names if name not in footprints]
+        for name in missing:
+            print(f"✗ No footprint {name}")
+        if missing:
+            sys.exit(1)
+        footprints = {name: footprints[name] for name in args.names}
+    outputs = args.output or DEFAULT_OUTPUTS
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    manifests = {}
+    for directory in outputs:
+        directory.mkdir(parents=True, exist_ok=True)
+        manifests[directory] = read_manifest(directory / MANIFEST_NAME, version=RENDER_VERSION)
+
+    def current(directory, entry):
+        known = manifests[directory].get(f'{entry.name}.svg')
+        return not args.force and known is not None and known['source'] == entry.digest.hex() \
+            and (directory / f'{entry.name}.svg').exists()
+
+    stale = [entry for entry in footprints.values()
+             if not all(current(directory, entry) for directory in outputs)]
+    failed = 0
+    for name, svg, error in render_all(stale, jobs):
+        if svg is None:
+            print(f"✗ {name}: Error - {error}")
+            failed += 1
+            continue
+        entry = footprints[name]
+        for directory in outputs:
+            if not current(directory, entry):
+                (directory / f'{name}.svg').write_text(svg, encoding='utf-8')
+                manifests[directory][f'{name}.svg'] = {'source': entry.digest.hex()}
+        print(f"✓ {name}.svg")
+
+    removed = 0
+    if not args.names:
+        # Only files this script wrote (listed in the manifest) are removed
+        wanted = {f'{name}.svg' for name in footprints}
+        for directory in outputs:
+            for file_name in sorted(manifests[directory].keys() - wanted):
+                (directory / file_name).unlink(missing_ok=True)
+                del manifests[directory][file_name]
+                print(f"  {file_name}: Removed, no longer in the library")
+                removed += 1
+    for directory in outputs:
+        write_manifest(directory / MANIFEST_NAME, manifests[directory], version=RENDER_VERSION)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"\n{len(stale) - failed} rendered, {len(footprints) - len(stale)} unchanged, "
+          f"{removed} removed, {failed} failed "
+          f"({elapsed_ms:.0f} ms, {min(jobs, max(len(stale), 1))} job(s))")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
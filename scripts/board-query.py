@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Query the board's copper by reference, net or position.
+
+Loads zudo-pd.kicad_pcb into the spatial index of kicad_board.py and
+answers one question per run. Coordinates are board millimetres as shown
+in KiCad's status bar (y grows downwards).
+
+Usage:
+    python3 scripts/board-query.py --ref U2                  # Footprint and its pads
+    python3 scripts/board-query.py --near U2 --radius 2      # Other nets' copper near U2
+    python3 scripts/board-query.py --at 41.5 12.8            # Footprint and copper at a point
+    python3 scripts/board-query.py --rect 40 10 50 20 --layer F.Cu
+    python3 scripts/board-query.py --net GND                 # Pads, track length and vias
+"""
+
+import argparse
+import math
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from kicad_board import Pad, Track, Via, ZoneFill, describe, load_board
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BOARD = REPO_ROOT / 'zudo-pd.kicad_pcb'
+KIND_LABELS = {Pad: 'pads', Track: 'tracks', Via: 'vias', ZoneFill: 'zone fills'}
+
+
+def print_items(items):
+    for item in items:
+        print(f"  {describe(item)}")
+    if not items:
+        print("  (nothing)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query board copper by reference, net or position.')
+    parser.add_argument('--board', type=Path, default=DEFAULT_BOARD,
+                        help=f'board file (default {DEFAULT_BOARD.name})')
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument('--ref', metavar='REF', help='show a footprint and its pads')
+    query.add_argument('--near', metavar='REF',
+                       help="other nets' copper within --radius of a footprint's pads")
+    query.add_argument('--at', nargs=2, type=float, metavar=('X', 'Y'),
+                       help='footprint and copper at a point')
+    query.add_argument('--rect', nargs=4, type=float, metavar=('X1', 'Y1', 'X2', 'Y2'),
+                       help='copper touching a rectangle')
+    query.add_argument('--net', metavar='NAME', help='items on a net')
+    parser.add_argument('--radius', type=float, metavar='MM',
+                        help='distance for --near (default 1.0) and --at (default 0)')
+    parser.add_argument('--layer', help='only copper on this layer (e.g. F.Cu)')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    board = load_board(args.board)
+    loaded_ms = (time.perf_counter() - started) * 1000
+    print(f"Loaded {args.board.name}: {len(board.pads)} pads, {len(board.tracks)} tracks, "
+          f"{len(board.vias)} vias, {len(board.zones)} zone fills ({loaded_ms:.0f} ms)")
+
+    if args.ref or args.near:
+        ref = args.ref or args.near
+        if ref not in board.footprints:
+            print(f"✗ No footprint {ref}")
+            sys.exit(1)
+        footprint = board.footprint(ref)
+        print(f"\n{ref} {footprint.value} ({footprint.name}) at ({footprint.x:g}, {footprint.y:g}) "
+              f"{footprint.angle:g}° on {footprint.layer}")
+        if args.ref:
+            print_items(list(footprint.pads))
+        else:
+            radius = 1.0 if args.radius is None else args.radius
+            items = board.near(ref, radius, args.layer)
+            print(f"Copper within {radius:g} mm of its pads:")
+            print_items(items)
+    elif args.at:
+        x, y = args.at
+        footprint = board.footprint_at(x, y)
+        print(f"\nFootprint at ({x:g}, {y:g}): "
+              f"{f'{footprint.ref} {footprint.value}' if footprint else 'none'}")
+        print_items(board.query_radius([(x, y)], args.radius or 0.0, args.layer)[0])
+    elif args.rect:
+        print(f"\nCopper touching {tuple(args.rect)}:")
+        print_items(board.query_rects([args.rect], args.layer)[0])
+    else:
+        items = board.net_items(args.net)
+        if not items:
+            print(f"✗ No items on net {args.net}")
+            sys.exit(1)
+        kinds = Counter(KIND_LABELS[type(item)] for item in items)
+        length = sum(math.hypot(t.x2 - t.x1, t.y2 - t.y1) for t in items if type(t) is Track)
+        refs = sorted({f"{p.ref}.{p.number}" for p in items if type(p) is Pad})
+        print(f"\n{args.net}: {', '.join(f'{n} {kind}' for kind, n in sorted(kinds.items()))}")
+        print(f"  track length {length:.2f} mm, "
+              f"{sum(type(v) is Via for v in items)} vias")
+        print(f"  pads: {', '.join(refs)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Check copper-to-copper clearance of the board without KiCad (needs numpy).
+
+Loads zudo-pd.kicad_pcb, takes the netclass clearances and the minimum
+clearance rule from zudo-pd.kicad_pro, and reports every pair of copper
+items on different nets that come closer than allowed (see
+kicad_clearance.py). Exits with status 1 when there are violations.
+
+Usage:
+    python3 scripts/clearance-check.py                      # Check with the project rules
+    python3 scripts/clearance-check.py --min-clearance 0.3  # Stricter floor, e.g. for a new fab
+    python3 scripts/clearance-check.py --top 5              # Only the five worst
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from kicad_board import describe, load_board
+from kicad_clearance import DEFAULT_CELL, NetClasses, check_clearance
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BOARD = REPO_ROOT / 'zudo-pd.kicad_pcb'
+DEFAULT_PROJECT = REPO_ROOT / 'zudo-pd.kicad_pro'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check copper clearance between nets.')
+    parser.add_argument('--board', type=Path, default=DEFAULT_BOARD,
+                        help=f'board file (default {DEFAULT_BOARD.name})')
+    parser.add_argument('--project', type=Path, default=DEFAULT_PROJECT,
+                        help=f'project file with netclasses (default {DEFAULT_PROJECT.name})')
+    parser.add_argument('--min-clearance', type=float, metavar='MM',
+                        help="override the project's minimum clearance")
+    parser.add_argument('--cell', type=float, default=DEFAULT_CELL, metavar='MM',
+                        help=f'grid cell size (default {DEFAULT_CELL:g})')
+    parser.add_argument('--top', type=int, metavar='N', help='only print the N worst violations')
+    args = parser.parse_args()
+
+    board = load_board(args.board)
+    netclasses = NetClasses.load(args.project)
+    if args.min_clearance is not None:
+        netclasses.min_clearance = args.min_clearance
+
+    started = time.perf_counter()
+    violations, pairs = check_clearance(board, netclasses, args.cell)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if not violations:
+        print(f"✓ No clearance violations ({pairs} pairs checked, {elapsed_ms:.0f} ms)")
+        return
+    for violation in violations[:args.top]:
+        print(f"✗ {violation.gap:.3f} mm < {violation.required:g} mm on {', '.join(violation.layers)} "
+              f"near ({violation.x:.3f}, {violation.y:.3f})")
+        print(f"    {describe(violation.a)}")
+        print(f"    {describe(violation.b)}")
+    print(f"\n{len(violations)} violation(s) ({pairs} pairs checked, {elapsed_ms:.0f} ms)")
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
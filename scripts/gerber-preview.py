@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Inspect Gerber/Excellon order files without a GUI viewer (needs numpy).
+
+Reads each order zip or gerber directory directly (see gerber.py; zips are
+not extracted), prints per-layer object counts and area coverage (copper
+minus drilled holes, as a share of the board outline) and hole counts per
+drill size, and optionally writes a PNG preview per layer.
+
+Usage:
+    python3 scripts/gerber-preview.py                    # Every archived order
+    python3 scripts/gerber-preview.py jlcpcb-order-snapshots/2025-01-12-v1_1/from-order-detail/zudo-pd-v1_0.zip
+    python3 scripts/gerber-preview.py ORDER --png previews/ --dpi 600
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from gerber import GerberError, fill, load, outline, rasterise, write_png
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SNAPSHOTS = REPO_ROOT / 'jlcpcb-order-snapshots'
+
+
+def default_sources():
+    """Every order zip and gerber directory under jlcpcb-order-snapshots/."""
+    zips = sorted(SNAPSHOTS.glob('*/*/*.zip'))
+    directories = sorted(path.parent for path in SNAPSHOTS.glob('*/*/*/*.gbrjob'))
+    return zips + directories
+
+
+def display(path):
+    path = path.resolve()
+    return path.relative_to(REPO_ROOT) if path.is_relative_to(REPO_ROOT) else path
+
+
+def report(source, dpi, png_dir):
+    started = time.perf_counter()
+    fab = load(source)
+    if fab.bounds is None:
+        print(f"✗ {display(source)}: nothing drawn")
+        return False
+    mm2 = (25.4 / dpi) ** 2
+    profile = [layer for layer in fab.layers.values() if layer.function.startswith('Profile')]
+    board = fill(outline(profile[0]), fab.bounds, dpi) if profile else None
+    holes = np.zeros_like(board) if board is not None else None
+    for drill in fab.drills.values():
+        image = rasterise(drill, fab.bounds, dpi)
+        holes = image if holes is None else holes | image
+    board_area = board.sum() * mm2 if board is not None else None
+
+    x1, y1, x2, y2 = fab.bounds
+    size = f"{x2 - x1:.2f} x {y2 - y1:.2f} mm"
+    print(f"\n{display(source)}: {len(fab.layers)} layers, {len(fab.drills)} drill files, {size}"
+          + (f", board {board_area:.0f} mm²" if board_area else ''))
+    for name, layer in sorted(fab.layers.items(), key=lambda item: item[1].function):
+        image = rasterise(layer, fab.bounds, dpi)
+        if layer.function.startswith('Copper') and holes is not None:
+            image &= ~holes
+        counts = ', '.join(f"{n} {kind}" for kind, n in layer.counts.items() if n)
+        area = image.sum() * mm2
+        share = f" ({area / board_area:.0%})" if board_area else ''
+        print(f"  {layer.function or name:<22} {area:>8.1f} mm²{share:<7} {counts or 'empty'}")
+        if png_dir:
+            write_png(png_dir / f"{Path(name).stem}.png", image)
+    for name, drill in sorted(fab.drills.items()):
+        sizes = Counter(round(hole.diameter, 3) for hole in drill.holes)
+        listed = ', '.join(f"{diameter:g} mm x{n}" for diameter, n in sorted(sizes.items()))
+        slots = f", {len(drill.slots)} slots" if drill.slots else ''
+        kind = 'plated' if drill.plated else 'non-plated'
+        print(f"  {name:<22} {len(drill.holes)} {kind} holes{slots}: {listed}")
+        if png_dir:
+            write_png(png_dir / f"{Path(name).stem}.png", rasterise(drill, fab.bounds, dpi))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"  ({elapsed_ms:.0f} ms at {dpi} dpi)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarise and preview Gerber/Excellon order files.')
+    parser.add_argument('sources', nargs='*', type=Path,
+                        help='order zips, gerber directories or single files '
+                             '(default: everything in jlcpcb-order-snapshots/)')
+    parser.add_argument('--dpi', type=int, default=300, help='raster resolution (default 300)')
+    parser.add_argument('--png', type=Path, metavar='DIR', help='write a PNG preview per layer')
+    args = parser.parse_args()
+
+    sources = args.sources or default_sources()
+    ok = True
+    for source in sources:
+        png_dir = None
+        if args.png:
+            png_dir = args.png / (str(display(source)).replace('/', '_') if len(sources) > 1 else '')
+            png_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            ok &= report(source, args.dpi, png_dir)
+        except (GerberError, OSError) as error:
+            print(f"✗ {display(source)}: {error}")
+            ok = False
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,712 @@
+"""
+Gerber (RS-274X) and Excellon reader with a NumPy rasteriser.
+
+Reads fabrication outputs straight from an order zip (members are streamed
+with zipfile, never extracted), a directory of .gbr/.drl/.gbrjob files or a
+single file:
+
+    fab = load('jlcpcb-order-snapshots/2025-01-12-v1_1/from-order-detail/zudo-pd-v1_0.zip')
+    copper = rasterise(fab.layers['zudo-pd-F_Cu.gbr'], fab.bounds, dpi=300)
+    copper.sum() * (25.4 / 300) ** 2     # copper area in mm²
+
+Gerber files are tokenised in chunks on '*' and '%' and drill files are
+read line by line, so a file is never held whole in memory. Every graphical
+object is reduced to one of two primitives, in mm with y up:
+
+  - a capsule (x1, y1, x2, y2, radius): draws with a round aperture, round
+    and obround flashes, drill holes and routed slots
+  - a polygon: regions (G36/G37), rectangle, polygon and macro flashes,
+    draws with a rectangular aperture
+
+Objects are kept in batches of one polarity (LPD/LPC) in file order, and
+each batch is rasterised with array operations over all of its objects at
+once: capsules by distance over their pixel boxes, polygons by even-odd
+scanline spans. Arcs are flattened to chords of at most ARC_STEP degrees.
+
+Not supported: step and repeat (SR), image transforms (LM/LR/LS), holes in
+standard apertures and the thermal macro primitive. Macro primitives with
+exposure off are skipped.
+"""
+
+import ast
+import io
+import json
+import math
+import operator
+import re
+import struct
+import zlib
+from collections import namedtuple
+from pathlib import Path
+import zipfile
+
+import numpy as np
+
+
+ARC_STEP = 5.0              # degrees per chord when flattening arcs
+CHUNK_SIZE = 1 << 16        # characters per read when tokenising
+PIXEL_BUDGET = 1 << 22      # (object, pixel) pairs rasterised per step
+GERBER_SUFFIXES = {'.gbr', '.gtl', '.gbl', '.gto', '.gbo', '.gts', '.gbs', '.gtp', '.gbp', '.gm1'}
+DRILL_SUFFIXES = {'.drl', '.xln'}
+
+Batch = namedtuple('Batch', 'dark capsules polygons')
+Hole = namedtuple('Hole', 'x y diameter')
+Fabrication = namedtuple('Fabrication', 'name layers drills job bounds')
+
+_COORD_RE = re.compile(r'^(?:G0*(\d+))?(?:X([+-]?\d+))?(?:Y([+-]?\d+))?'
+                       r'(?:I([+-]?\d+))?(?:J([+-]?\d+))?(?:D0*(\d+))?$')
+# The only operators aperture macro arithmetic has ('x' is multiplication)
+_BINARY_OPS = {ast.Add: operator.add, ast.Sub: operator.sub,
+               ast.Mult: operator.mul, ast.Div: operator.truediv}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+class GerberError(ValueError):
+    """Raised for malformed or unsupported Gerber and Excellon input."""
+
+
+class GerberLayer:
+    """Graphical objects of one Gerber file, in batches of one polarity."""
+
+    def __init__(self, name):
+        self.name = name
+        self.function = ''
+        self.batches = []
+        self.counts = {'flashes': 0, 'draws': 0, 'regions': 0}
+
+    def batch(self, dark):
+        if not self.batches or self.batches[-1].dark != dark:
+            self.batches.append(Batch(dark, [], []))
+        return self.batches[-1]
+
+    def bbox(self):
+        """(x1, y1, x2, y2) of everything drawn, or None."""
+        return _bbox(self.batches)
+
+
+def _bbox(batches):
+    boxes = []
+    for batch in batches:
+        if batch.capsules:
+            c = np.array(batch.capsules)
+            lo = np.minimum(c[:, :2], c[:, 2:4]) - c[:, 4:]
+            hi = np.maximum(c[:, :2], c[:, 2:4]) + c[:, 4:]
+            boxes.append((*lo.min(axis=0), *hi.max(axis=0)))
+        boxes.extend((*polygon.min(axis=0), *polygon.max(axis=0)) for polygon in batch.polygons)
+    if not boxes:
+        return None
+    boxes = np.array(boxes)
+    return (*boxes[:, :2].min(axis=0), *boxes[:, 2:].max(axis=0))
+
+
+class DrillFile:
+    """Holes and routed slots of one Excellon file."""
+
+    def __init__(self, name):
+        self.name = name
+        self.function = ''
+        self.plated = True
+        self.holes = []     # Hole
+        self.slots = []     # (x1, y1, x2, y2, diameter)
+
+    @property
+    def batches(self):
+        capsules = [(h.x, h.y, h.x, h.y, h.diameter / 2) for h in self.holes]
+        capsules += [(x1, y1, x2, y2, d / 2) for x1, y1, x2, y2, d in self.slots]
+        return [Batch(True, capsules, [])]
+
+
+# --- Gerber -----------------------------------------------------------------
+
+def _words(stream):
+    """Yield (word, opens block, extended) for each '*'-terminated word."""
+    extended = False
+    pending = ''
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        pieces = (pending + chunk).split('*')
+        pending = pieces.pop()
+        for piece in pieces:
+            piece = piece.replace('\n', '').replace('\r', '')
+            opens = False
+            while piece.startswith('%'):
+                extended = not extended
+                opens = extended
+                piece = piece[1:]
+            if piece:
+                yield piece, opens, extended
+
+
+def _arithmetic(node):
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return float(node.value)
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        return _BINARY_OPS[type(node.op)](_arithmetic(node.left), _arithmetic(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_arithmetic(node.operand))
+    raise ValueError(f"unsupported {type(node).__name__}")
+
+
+def _evaluate(expression, variables):
+    """Value of an aperture macro expression ('x' is multiplication).
+
+    The expression comes from the file, so it is walked as a syntax tree that
+    only admits numbers, unary +/- and binary + - * /; nothing is executed.
+    """
+    text = re.sub(r'\$(\d+)', lambda m: repr(variables.get(int(m.group(1)), 0.0)),
+                  expression.replace('x', '*').replace('X', '*'))
+    try:
+        return _arithmetic(ast.parse(text.strip(), mode='eval').body)
+    except (SyntaxError, ValueError, ZeroDivisionError, OverflowError, RecursionError, MemoryError):
+        raise GerberError(f"Bad macro expression: {expression}") from None
+
+
+def _rotated(points, degrees):
+    a = math.radians(degrees)
+    c, s = math.cos(a), math.sin(a)
+    points = np.asarray(points, dtype=float)
+    return np.column_stack([points[:, 0] * c - points[:, 1] * s,
+                            points[:, 0] * s + points[:, 1] * c])
+
+
+def _regular_polygon(diameter, vertices, rotation, cx=0.0, cy=0.0):
+    angles = np.radians(rotation + np.arange(vertices) * 360.0 / vertices)
+    return np.column_stack([cx + diameter / 2 * np.cos(angles), cy + diameter / 2 * np.sin(angles)])
+
+
+def _rectangle(cx, cy, width, height):
+    w, h = width / 2, height / 2
+    return np.array([(cx - w, cy - h), (cx + w, cy - h), (cx + w, cy + h), (cx - w, cy + h)])
+
+
+def _macro_shapes(body, params, scale):
+    """Capsules and polygons (aperture coordinates, mm) of a macro instance."""
+    variables = {i + 1: value for i, value in enumerate(params)}
+    capsules, polygons = [], []
+    for word in body:
+        if word.startswith('0'):
+            continue
+        if word.startswith('$'):
+            name, expression = word[1:].split('=', 1)
+            variables[int(name)] = _evaluate(expression, variables)
+            continue
+        code, *args = word.split(',')
+        v = [_evaluate(arg, variables) for arg in args]
+        if v and v[0] == 0:
+            continue   # exposure off
+        code = int(code)
+        if code == 1:
+            rotation = v[4] if len(v) > 4 else 0.0
+            (cx, cy), = _rotated([(v[2], v[3])], rotation)
+            capsules.append((cx, cy, cx, cy, v[1] / 2))
+        elif code == 20:
+            (x1, y1), (x2, y2) = v[2:4], v[4:6]
+            length = math.hypot(x2 - x1, y2 - y1) or 1.0
+            nx, ny = -(y2 - y1) / length * v[1] / 2, (x2 - x1) / length * v[1] / 2
+            corners = [(x1 + nx, y1 + ny), (x2 + nx, y2 + ny), (x2 - nx, y2 - ny), (x1 - nx, y1 - ny)]
+            polygons.append(_rotated(corners, v[6]))
+        elif code == 21:
+            polygons.append(_rotated(_rectangle(v[3], v[4], v[1], v[2]), v[5]))
+        elif code == 4:
+            count = int(v[1])
+            points = np.array(v[2:4 + 2 * count]).reshape(-1, 2)
+            polygons.append(_rotated(points, v[4 + 2 * count]))
+        elif code == 5:
+            polygon = _regular_polygon(v[4], int(v[1]), 0.0, v[2], v[3])
+            polygons.append(_rotated(polygon, v[5]))
+        else:
+            raise GerberError(f"Unsupported macro primitive {code}")
+    return ([tuple(value * scale for value in capsule) for capsule in capsules],
+            [polygon * scale for polygon in polygons])
+
+
+def _arc(x1, y1, x2, y2, i, j, clockwise, multi_quadrant):
+    """Points (excluding the start) of an arc flattened to chords."""
+    if multi_quadrant:
+        centres = [(x1 + i, y1 + j)]
+    else:
+        centres = [(x1 + si * abs(i), y1 + sj * abs(j)) for si in (1, -1) for sj in (1, -1)]
+    best = None
+    for cx, cy in centres:
+        a1, a2 = math.atan2(y1 - cy, x1 - cx), math.atan2(y2 - cy, x2 - cx)
+        sweep = (a1 - a2 if clockwise else a2 - a1) % (2 * math.pi)
+        if multi_quadrant and sweep < 1e-9:
+            sweep = 2 * math.pi
+        if not multi_quadrant and sweep > math.pi / 2 + 1e-6:
+            continue
+        error = abs(math.hypot(x1 - cx, y1 - cy) - math.hypot(x2 - cx, y2 - cy))
+        if best is None or error < best[0]:
+            best = (error, cx, cy, a1, sweep)
+    if best is None:
+        return [(x2, y2)]
+    _, cx, cy, a1, sweep = best
+    radius = math.hypot(x1 - cx, y1 - cy)
+    steps = max(1, math.ceil(math.degrees(sweep) / ARC_STEP))
+    direction = -1 if clockwise else 1
+    points = [(cx + radius * math.cos(a1 + direction * sweep * k / steps),
+               cy + radius * math.sin(a1 + direction * sweep * k / steps)) for k in range(1, steps)]
+    return points + [(x2, y2)]
+
+
+def _convex_hull(points):
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+
+    def half(sequence):
+        hull = []
+        for p in sequence:
+            while len(hull) >= 2 and ((hull[-1][0] - hull[-2][0]) * (p[1] - hull[-2][1]) -
+                                      (hull[-1][1] - hull[-2][1]) * (p[0] - hull[-2][0])) <= 0:
+                hull.pop()
+            hull.append(p)
+        return hull[:-1]
+    return half(points) + half(reversed(points))
+
+
+def parse_gerber(stream, name=''):
+    """Parse an RS-274X text stream into a GerberLayer."""
+    layer = GerberLayer(name)
+    scale = 1.0
+    x_digits = y_digits = 6
+    trailing = False
+    apertures, macros = {}, {}
+    macro = None
+    aperture = None
+    dark = True
+    mode, multi_quadrant = 1, True
+    operation = 2
+    x = y = 0.0
+    region, contour = False, []
+
+    def number(text, digits):
+        if text is None:
+            return None
+        if trailing:
+            sign = '-' if text.startswith('-') else ''
+            text = sign + text.lstrip('+-').ljust(digits[0] + digits[1], '0')
+        return int(text) / 10 ** digits[1] * scale
+
+    def close_contour():
+        if len(contour) > 2:
+            layer.batch(dark).polygons.append(np.array(contour))
+            layer.counts['regions'] += 1
+        contour.clear()
+
+    for word, opens, extended in _words(stream):
+        if extended:
+            if not opens and macro is not None:
+                macros[macro].append(word)
+                continue
+            macro = None
+            code = word[:2]
+            if code == 'FS':
+                match = re.match(r'FS([LT])([AI])X(\d)(\d)Y(\d)(\d)', word)
+                if not match:
+                    raise GerberError(f"Bad format statement: {word}")
+                trailing = match.group(1) == 'T'
+                if match.group(2) == 'I':
+                    raise GerberError("Incremental coordinates are not supported")
+                x_digits = (int(match.group(3)), int(match.group(4)))
+                y_digits = (int(match.group(5)), int(match.group(6)))
+            elif code == 'MO':
+                scale = 25.4 if word[2:4] == 'IN' else 1.0
+            elif code == 'AM':
+                macro = word[2:]
+                macros[macro] = []
+            elif code == 'AD':
+                match = re.match(r'ADD(\d+)([^,]+)(?:,(.*))?', word)
+                if not match:
+                    raise GerberError(f"Bad aperture definition: {word}")
+                kind = match.group(2)
+                params = [float(p) for p in match.group(3).split('X')] if match.group(3) else []
+                if kind in ('C', 'R', 'O'):
+                    params = [p * scale for p in params]
+                elif kind == 'P':
+                    params[0] *= scale
+                apertures[int(match.group(1))] = (kind, params)
+            elif code == 'LP':
+                dark = word[2] == 'D'
+            elif code == 'TF' and word.startswith('TF.FileFunction,'):
+                layer.function = word.split(',', 1)[1]
+            elif code in ('SR', 'LM', 'LR', 'LS') and word not in ('SR', 'LMN', 'LR0', 'LS1'):
+                raise GerberError(f"Unsupported command %{word}%")
+            continue
+
+        if word.startswith('G04') or word.startswith('M'):
+            continue
+        match = _COORD_RE.match(word)
+        if not match:
+            raise GerberError(f"Bad command: {word}")
+        g, xs, ys, i_s, js, d = match.groups()
+        if g is not None:
+            g = int(g)
+            if g in (1, 2, 3):
+                mode = g
+            elif g == 36:
+                region = True
+            elif g == 37:
+                close_contour()
+                region = False
+            elif g in (74, 75):
+                multi_quadrant = g == 75
+            elif g == 70:
+                scale = 25.4
+            elif g == 71:
+                scale = 1.0
+        if d is not None and int(d) >= 10:
+            aperture = int(d)
+            continue
+        if d is None and xs is None and ys is None:
+            continue
+        if d is not None:
+            operation = int(d)
+        nx = number(xs, x_digits) if xs is not None else x
+        ny = number(ys, y_digits) if ys is not None else y
+        i = number(i_s, x_digits) or 0.0
+        j = number(js, y_digits) or 0.0
+
+        if operation == 1:
+            if mode == 1:
+                path = [(nx, ny)]
+            else:
+                path = _arc(x, y, nx, ny, i, j, mode == 2, multi_quadrant)
+            if region:
+                if not contour:
+                    contour.append((x, y))
+                contour.extend(path)
+            else:
+                _draw(layer.batch(dark), apertures, aperture, [(x, y)] + path, name)
+                layer.counts['draws'] += 1
+        elif operation == 2:
+            if region:
+                close_contour()
+        elif operation == 3:
+            _flash(layer.batch(dark), apertures, macros, aperture, nx, ny, scale, name)
+            layer.counts['flashes'] += 1
+        x, y = nx, ny
+    return layer
+
+
+def _aperture(apertures, aperture, name):
+    if aperture not in apertures:
+        raise GerberError(f"{name}: aperture D{aperture} used before definition")
+    return apertures[aperture]
+
+
+def _draw(batch, apertures, aperture, path, name):
+    kind, params = _aperture(apertures, aperture, name)
+    if kind == 'C':
+        radius = params[0] / 2
+        batch.capsules.extend((xa, ya, xb, yb, radius) for (xa, ya), (xb, yb) in zip(path, path[1:]))
+    elif kind == 'R':
+        w, h = params[0] / 2, params[1] / 2
+        for (xa, ya), (xb, yb) in zip(path, path[1:]):
+            corners = [(px + dx, py + dy) for px, py in ((xa, ya), (xb, yb))
+                       for dx in (-w, w) for dy in (-h, h)]
+            batch.polygons.append(np.array(_convex_hull(corners)))
+    else:
+        raise GerberError(f"{name}: drawing with a {kind} aperture is not supported")
+
+
+def _flash(batch, apertures, macros, aperture, x, y, scale, name):
+    kind, params = _aperture(apertures, aperture, name)
+    if kind == 'C':
+        batch.capsules.append((x, y, x, y, params[0] / 2))
+    elif kind == 'R':
+        batch.polygons.append(_rectangle(x, y, params[0], params[1]))
+    elif kind == 'O':
+        w, h = params[0], params[1]
+        r = min(w, h) / 2
+        dx, dy = (w / 2 - r, 0.0) if w >= h else (0.0, h / 2 - r)
+        batch.capsules.append((x - dx, y - dy, x + dx, y + dy, r))
+    elif kind == 'P':
+        rotation = params[2] if len(params) > 2 else 0.0
+        batch.polygons.append(_regular_polygon(params[0], int(params[1]), rotation, x, y))
+    elif kind in macros:
+        capsules, polygons = _macro_shapes(macros[kind], params, scale)
+        batch.capsules.extend((x + x1, y + y1, x + x2, y + y2, r) for x1, y1, x2, y2, r in capsules)
+        batch.polygons.extend(polygon + (x, y) for polygon in polygons)
+    else:
+        raise GerberError(f"{name}: unknown aperture type {kind}")
+
+
+# --- Excellon ---------------------------------------------------------------
+
+def parse_excellon(stream, name=''):
+    """Parse an Excellon drill file (holes and G00/M15/G01/M16 or G85 slots)."""
+    drill = DrillFile(name)
+    scale = 1.0
+    integer_digits = (3, 3)
+    leading_zeros = True
+    tools = {}
+    tool = None
+    x = y = 0.0
+    routing = False
+
+    def number(text):
+        if '.' in text:
+            return float(text) * scale
+        sign = -1 if text.startswith('-') else 1
+        digits = text.lstrip('+-')
+        if leading_zeros:
+            digits = digits.ljust(sum(integer_digits), '0')
+        return sign * int(digits) / 10 ** integer_digits[1] * scale
+
+    def coordinates(text):
+        nonlocal x, y
+        match = re.search(r'X([+-]?[\d.]+)', text)
+        x = number(match.group(1)) if match else x
+        match = re.search(r'Y([+-]?[\d.]+)', text)
+        y = number(match.group(1)) if match else y
+        return x, y
+
+    for line in stream:
+        line = line.strip()
+        if line.startswith(';'):
+            if 'TF.FileFunction' in line:
+                drill.function = line.split('TF.FileFunction,', 1)[1]
+                drill.plated = not drill.function.startswith('NonPlated')
+            continue
+        if not line or line in ('M48', '%', 'G90', 'G05', 'M30', 'M16', 'M17') or line.startswith('FMAT'):
+            if line == 'M16':
+                routing = False
+            continue
+        if line.startswith(('METRIC', 'INCH')):
+            scale = 1.0 if line.startswith('METRIC') else 25.4
+            leading_zeros = 'TZ' not in line
+            integer_digits = (3, 3) if line.startswith('METRIC') else (2, 4)
+            match = re.search(r',(0+)\.(0+)', line)
+            if match:
+                integer_digits = (len(match.group(1)), len(match.group(2)))
+            continue
+        match = re.match(r'T(\d+)(?:.*C([\d.]+))?', line)
+        if match and not line.startswith(('TF', 'TA')):
+            if match.group(2):
+                tools[int(match.group(1))] = float(match.group(2)) * scale
+            else:
+                tool = int(match.group(1))
+            continue
+        if line == 'M15':
+            routing = True
+            continue
+        if tool is None or tool not in tools:
+            if re.match(r'[XYG]', line):
+                raise GerberError(f"{name}: coordinates before a tool is selected")
+            continue
+        if line.startswith('G00'):
+            coordinates(line)
+        elif line.startswith('G01') and routing:
+            start = (x, y)
+            end = coordinates(line)
+            drill.slots.append((*start, *end, tools[tool]))
+        elif 'G85' in line:
+            first, second = line.split('G85', 1)
+            start, end = coordinates(first), coordinates(second)
+            drill.slots.append((*start, *end, tools[tool]))
+        elif line[0] in 'XY':
+            drill.holes.append(Hole(*coordinates(line), tools[tool]))
+    return drill
+
+
+# --- Sources ----------------------------------------------------------------
+
+def _kind(filename):
+    suffix = Path(filename).suffix.lower()
+    if suffix in GERBER_SUFFIXES:
+        return 'gerber'
+    if suffix in DRILL_SUFFIXES:
+        return 'drill'
+    if suffix == '.gbrjob':
+        return 'job'
+    return None
+
+
+def _members(path):
+    """(name, opener) per fabrication file under path (zip, directory or file)."""
+    path = Path(path)
+    if path.is_file() and zipfile.is_zipfile(path):
+        archive = zipfile.ZipFile(path)
+        for info in archive.infolist():
+            if not info.is_dir() and _kind(info.filename):
+                yield Path(info.filename).name, lambda info=info: archive.open(info)
+    elif path.is_dir():
+        for child in sorted(path.iterdir()):
+            if child.is_file() and _kind(child.name):
+                yield child.name, lambda child=child: open(child, 'rb')
+    elif path.is_file() and _kind(path.name):
+        yield path.name, lambda: open(path, 'rb')
+    else:
+        raise GerberError(f"No Gerber or drill files at {path}")
+
+
+def load(path):
+    """Parse every Gerber, drill and job file of a zip, directory or file."""
+    layers, drills, job = {}, {}, {}
+    for name, opener in _members(path):
+        with opener() as raw:
+            stream = io.TextIOWrapper(raw, encoding='utf-8', errors='replace')
+            kind = _kind(name)
+            if kind == 'gerber':
+                layers[name] = parse_gerber(stream, name)
+            elif kind == 'drill':
+                drills[name] = parse_excellon(stream, name)
+            else:
+                job = json.load(stream)
+    for attributes in job.get('FilesAttributes', []):
+        layer = layers.get(attributes.get('Path'))
+        if layer is not None and not layer.function:
+            layer.function = attributes.get('FileFunction', '')
+    return Fabrication(Path(path).name, layers, drills, job, board_bounds(layers, drills))
+
+
+def board_bounds(layers, drills=None):
+    """Bounds of the profile (Edge_Cuts) layer, else of everything."""
+    profiles = [layer for layer in layers.values() if layer.function.startswith('Profile')]
+    boxes = [_bbox(layer.batches) for layer in profiles or [*layers.values(), *(drills or {}).values()]]
+    boxes = [box for box in boxes if box is not None]
+    if not boxes:
+        return None
+    boxes = np.array(boxes)
+    return (*boxes[:, :2].min(axis=0), *boxes[:, 2:].max(axis=0))
+
+
+def outline(layer):
+    """Closed loops of a profile layer's draws, as polygons."""
+    segments = [(round(x1, 4), round(y1, 4), round(x2, 4), round(y2, 4))
+                for batch in layer.batches for x1, y1, x2, y2, _ in batch.capsules
+                if (x1, y1) != (x2, y2)]
+    neighbours = {}
+    for index, (x1, y1, x2, y2) in enumerate(segments):
+        neighbours.setdefault((x1, y1), []).append(index)
+        neighbours.setdefault((x2, y2), []).append(index)
+    used, loops = set(), []
+    for start in range(len(segments)):
+        if start in used:
+            continue
+        used.add(start)
+        x1, y1, x2, y2 = segments[start]
+        loop, point = [(x1, y1)], (x2, y2)
+        while point != loop[0]:
+            loop.append(point)
+            following = [index for index in neighbours[point] if index not in used]
+            if not following:
+                break
+            used.add(following[0])
+            a1, b1, a2, b2 = segments[following[0]]
+            point = (a2, b2) if (a1, b1) == point else (a1, b1)
+        if len(loop) > 2 and point == loop[0]:
+            loops.append(np.array(loop))
+    return loops
+
+
+# --- Rasteriser -------------------------------------------------------------
+
+def _grid(bounds, dpi):
+    x1, y1, x2, y2 = bounds
+    per_mm = dpi / 25.4
+    return per_mm, math.ceil((x2 - x1) * per_mm), math.ceil((y2 - y1) * per_mm)
+
+
+def _capsule_mask(capsules, bounds, per_mm, width, height):
+    """Pixels whose centre lies within any capsule (pixel units, y down)."""
+    mask = np.zeros((height, width), dtype=bool)
+    if not len(capsules):
+        return mask
+    c = np.asarray(capsules, dtype=float)
+    u1, u2 = (c[:, 0] - bounds[0]) * per_mm - 0.5, (c[:, 2] - bounds[0]) * per_mm - 0.5
+    v1, v2 = (bounds[3] - c[:, 1]) * per_mm - 0.5, (bounds[3] - c[:, 3]) * per_mm - 0.5
+    r = c[:, 4] * per_mm
+    col0 = np.clip(np.ceil(np.minimum(u1, u2) - r), 0, width).astype(np.int64)
+    col1 = np.clip(np.floor(np.maximum(u1, u2) + r) + 1, 0, width).astype(np.int64)
+    row0 = np.clip(np.ceil(np.minimum(v1, v2) - r), 0, height).astype(np.int64)
+    row1 = np.clip(np.floor(np.maximum(v1, v2) + r) + 1, 0, height).astype(np.int64)
+    spans = np.maximum(col1 - col0, 0)
+    counts = spans * np.maximum(row1 - row0, 0)
+
+    ends = np.cumsum(counts)
+    start = 0
+    while start < len(c):
+        # As many objects as fit the pixel budget (at least one)
+        stop = max(start + 1, int(np.searchsorted(ends, (ends[start - 1] if start else 0) + PIXEL_BUDGET)))
+        index = np.arange(start, stop)
+        n = counts[index]
+        owner = np.repeat(index, n)
+        offset = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        cols = col0[owner] + offset % np.maximum(spans[owner], 1)
+        rows = row0[owner] + offset // np.maximum(spans[owner], 1)
+        du, dv = u2[owner] - u1[owner], v2[owner] - v1[owner]
+        length2 = du * du + dv * dv
+        t = ((cols - u1[owner]) * du + (rows - v1[owner]) * dv) / np.where(length2 > 0, length2, 1.0)
+        t = np.clip(t, 0.0, 1.0)
+        inside = np.hypot(u1[owner] + t * du - cols, v1[owner] + t * dv - rows) <= r[owner]
+        mask[rows[inside], cols[inside]] = True
+        start = stop
+    return mask
+
+
+def _polygon_mask(polygons, bounds, per_mm, width, height):
+    """Pixels whose centre lies inside any polygon (even-odd per polygon)."""
+    mask = np.zeros((height, width), dtype=bool)
+    if not polygons:
+        return mask
+    points = np.concatenate(polygons)
+    owner = np.repeat(np.arange(len(polygons)), [len(p) for p in polygons])
+    following = np.concatenate([np.roll(np.arange(len(p)), -1) + start for p, start in
+                                zip(polygons, np.cumsum([0] + [len(p) for p in polygons[:-1]]))])
+    u1 = (points[:, 0] - bounds[0]) * per_mm - 0.5
+    v1 = (bounds[3] - points[:, 1]) * per_mm - 0.5
+    u2, v2 = u1[following], v1[following]
+    # Rows r crossed by an edge: min(v) <= r < max(v)
+    row0 = np.clip(np.ceil(np.minimum(v1, v2)), 0, height).astype(np.int64)
+    row1 = np.clip(np.ceil(np.maximum(v1, v2)), 0, height).astype(np.int64)
+    n = np.maximum(row1 - row0, 0)
+    edge = np.repeat(np.arange(len(points)), n)
+    rows = row0[edge] + np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+    if not len(rows):
+        return mask
+    crossing = u1[edge] + (rows - v1[edge]) * (u2[edge] - u1[edge]) / (v2[edge] - v1[edge])
+    order = np.lexsort((crossing, rows, owner[edge]))
+    rows, crossing = rows[order], crossing[order]
+    # Crossings pair up into inside spans along each (polygon, row)
+    begin = np.clip(np.ceil(crossing[0::2]), 0, width).astype(np.int64)
+    end = np.clip(np.ceil(crossing[1::2]), 0, width).astype(np.int64)
+    diff = np.zeros((height, width + 1), dtype=np.int32)
+    np.add.at(diff, (rows[0::2], begin), 1)
+    np.add.at(diff, (rows[1::2], end), -1)
+    return np.cumsum(diff, axis=1)[:, :width] > 0
+
+
+def rasterise(layer, bounds, dpi=300):
+    """Boolean image (rows top down) of a GerberLayer or DrillFile."""
+    per_mm, width, height = _grid(bounds, dpi)
+    image = np.zeros((height, width), dtype=bool)
+    for batch in layer.batches:
+        shapes = _capsule_mask(batch.capsules, bounds, per_mm, width, height)
+        shapes |= _polygon_mask(batch.polygons, bounds, per_mm, width, height)
+        if batch.dark:
+            image |= shapes
+        else:
+            image &= ~shapes
+    return image
+
+
+def fill(polygons, bounds, dpi=300):
+    """Boolean image of the inside of polygons (e.g. the board outline)."""
+    per_mm, width, height = _grid(bounds, dpi)
+    return _polygon_mask(polygons, bounds, per_mm, width, height)
+
+
+def write_png(path, image):
+    """Write a boolean image as a 1-bit greyscale PNG (set pixels white)."""
+    height, width = image.shape
+    rows = np.packbits(image, axis=1)
+    raw = b''.join(b'\x00' + row.tobytes() for row in rows)
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    Path(path).write_bytes(b'\x89PNG\r\n\x1a\n' +
+                           chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 1, 0, 0, 0, 0)) +
+                           chunk(b'IDAT', zlib.compress(raw, 6)) + chunk(b'IEND', b''))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Report DC voltage drop and current density along the power rails (needs
+numpy and scipy).
+
+Turns the +12V, -12V and +5V rail copper of zudo-pd.kicad_pcb into
+resistor networks (see kicad_irdrop.py) and solves them for a sweep of
+load currents up to the design maximum, with the load shared by all bus
+connectors and with all of it drawn through one connector. Check a layout
+change here before ordering.
+
+Usage:
+    python3 scripts/ir-drop.py                           # All rails, 4-step sweep
+    python3 scripts/ir-drop.py --temperature 60          # Warm copper
+    python3 scripts/ir-drop.py --rail '+12V rail' PTC1.2 1.5
+    python3 scripts/ir-drop.py --max-drop 50             # Exit 1 above 50 mV
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from kicad_board import describe, load_board
+from kicad_irdrop import COPPER_THICKNESS, RAILS, solve_rails
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BOARD = REPO_ROOT / 'zudo-pd.kicad_pcb'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Solve DC voltage drop along the power rails.')
+    parser.add_argument('--board', type=Path, default=DEFAULT_BOARD,
+                        help=f'board file (default {DEFAULT_BOARD.name})')
+    parser.add_argument('--rail', nargs=3, action='append', metavar=('NET', 'SOURCE', 'AMPS'),
+                        help='rail net, source pad (REF.NUM) and full current; repeatable '
+                             '(default: the +12V, -12V and +5V rails)')
+    parser.add_argument('--steps', type=int, default=4, help='currents in the sweep (default 4)')
+    parser.add_argument('--temperature', type=float, default=20.0, metavar='C',
+                        help='copper temperature (default 20)')
+    parser.add_argument('--thickness', type=float, default=COPPER_THICKNESS, metavar='MM',
+                        help=f'copper thickness (default {COPPER_THICKNESS:g}, 1 oz)')
+    parser.add_argument('--max-drop', type=float, metavar='MV',
+                        help='exit with status 1 if any drop at full current exceeds this')
+    args = parser.parse_args()
+
+    rails = {net: (source, float(amps)) for net, source, amps in args.rail} if args.rail else RAILS
+    board = load_board(args.board)
+    missing = [net for net, (source, _) in rails.items()
+               if not any(f'{pad.ref}.{pad.number}' == source and pad.net == net for pad in board.pads)]
+    if missing:
+        print(f"✗ No source pad on {', '.join(missing)}")
+        sys.exit(1)
+
+    fractions = np.arange(1, args.steps + 1) / args.steps
+    started = time.perf_counter()
+    results = solve_rails(board, rails, fractions, temperature=args.temperature,
+                          thickness=args.thickness)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    worst_drop = 0.0
+    for net, result in results.items():
+        rail = result.rail
+        connectors = list(rail.connectors)
+        print(f"\n{net}: {rail.source} -> {' '.join(connectors)}, up to {rail.current:g} A "
+              f"({len(result.tracks)} track pieces)")
+        print(f"  {'load':>7}  {'shared':>8}" + ''.join(f'  {c:>8}' for c in connectors) + '   (mV)')
+        steps = len(fractions)
+        for k, fraction in enumerate(fractions):
+            cases = [k] + [c * steps + k for c in range(1, len(connectors) + 1)]
+            drops = [np.nanmax(result.drop[case]) * 1000 for case in cases]
+            print(f"  {fraction * rail.current:>5.2f} A  " + '  '.join(f'{d:>8.2f}' for d in drops))
+        full = [c * steps + steps - 1 for c in range(len(connectors) + 1)]
+        worst_drop = max(worst_drop, np.nanmax(result.drop[full]) * 1000)
+
+        area = np.array([track.width * args.thickness for track in result.tracks])
+        density = np.abs(result.track_current[full]) / area
+        case, piece = np.unravel_index(np.nanargmax(density), density.shape)
+        through = 'shared load' if case == 0 else f'all through {connectors[case - 1]}'
+        print(f"  worst density {density[case, piece]:.1f} A/mm² "
+              f"({abs(result.track_current[full[case], piece]):.2f} A, {through}):")
+        print(f"    {describe(result.tracks[piece])}")
+        for pad in result.unreached:
+            print(f"  ! {pad} is not connected to {rail.source} by tracks or vias")
+
+    cases = max(len(result.drop) for result in results.values())
+    print(f"\nSolved {len(results)} rails, {cases} load cases each ({elapsed_ms:.0f} ms)")
+    if args.max_drop is not None:
+        if worst_drop > args.max_drop:
+            print(f"✗ Worst drop {worst_drop:.2f} mV exceeds {args.max_drop:g} mV")
+            sys.exit(1)
+        print(f"✓ Worst drop {worst_drop:.2f} mV within {args.max_drop:g} mV")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Write the JLCPCB BOM and CPL files straight from the KiCad sources.
+
+Reads the footprints of zudo-pd.kicad_pcb and the symbols of the
+zudo-pd.kicad_sch hierarchy (see jlcpcb.py) and writes
+<board>-bom-jlcpcb.csv and <board>-cpl-jlcpcb.csv in the format JLCPCB's
+assembly upload expects, so an order package no longer needs a GUI
+export. Files are only rewritten when their content changes.
+
+Mismatches between board and schematic (a value or LCSC number changed on
+one side only) and parts without an LCSC number are listed as warnings.
+
+Usage:
+    python3 scripts/jlcpcb-export.py                      # Write to jlcpcb/
+    python3 scripts/jlcpcb-export.py -o jlcpcb-order-snapshots/2025-03-01-v1_2/used-for-order
+    python3 scripts/jlcpcb-export.py --strict             # Exit 1 on any warning
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from jlcpcb import BOM_HEADER, CPL_HEADER, bom_rows, collect_parts, cpl_rows, write_csv
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BOARD = REPO_ROOT / 'zudo-pd.kicad_pcb'
+DEFAULT_SCHEMATIC = REPO_ROOT / 'zudo-pd.kicad_sch'
+DEFAULT_OUTPUT = REPO_ROOT / 'jlcpcb'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write JLCPCB BOM/CPL files from the KiCad sources.')
+    parser.add_argument('--board', type=Path, default=DEFAULT_BOARD,
+                        help=f'board file (default {DEFAULT_BOARD.name})')
+    parser.add_argument('--schematic', type=Path, default=DEFAULT_SCHEMATIC,
+                        help=f'root schematic (default {DEFAULT_SCHEMATIC.name})')
+    parser.add_argument('-o', '--output-dir', type=Path, default=DEFAULT_OUTPUT,
+                        help='directory for the CSVs (default jlcpcb/)')
+    parser.add_argument('--strict', action='store_true', help='exit with status 1 on warnings')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    parts, warnings = collect_parts(args.board, args.schematic)
+    bom, cpl = bom_rows(parts), cpl_rows(parts)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    stem = args.board.stem
+    for suffix, header, rows in (('bom', BOM_HEADER, bom), ('cpl', CPL_HEADER, cpl)):
+        path = args.output_dir / f'{stem}-{suffix}-jlcpcb.csv'
+        changed = write_csv(path, header, rows)
+        print(f"✓ {path.relative_to(REPO_ROOT) if path.is_relative_to(REPO_ROOT) else path}: "
+              f"{len(rows)} rows{'' if changed else ' (unchanged)'}")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"{sum(len(row[1].split(',')) for row in bom)} parts in {len(bom)} BOM lines "
+          f"({elapsed_ms:.0f} ms)")
+
+    for warning in warnings:
+        print(f"  ! {warning}")
+    if warnings and args.strict:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
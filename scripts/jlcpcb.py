@@ -0,0 +1,146 @@
+"""
+JLCPCB assembly files (BOM and CPL) built from the board and schematics.
+
+Parts come from the footprints in zudo-pd.kicad_pcb, since the board is
+what gets assembled: value, package, LCSC number, placement and the
+exclude-from-BOM/position attributes. The symbols of the schematic hierarchy
+are joined by reference to fill in missing LCSC numbers, honour DNP and
+"exclude from BOM", and flag parts that differ between the two. The CSVs
+use the exact format of the files uploaded for the v1.1 order
+(jlcpcb-order-snapshots/2025-01-12-v1_1/used-for-order/):
+
+    Comment,Designator,Footprint,JLCPCB Part #
+    5.1k,"R3,R12,R13",R0603,C23186
+
+    Designator,Mid X,Mid Y,Layer,Rotation
+    C1,50.4700mm,12.4325mm,Top,180
+
+BOM lines group parts sharing value, footprint and part number, with the
+designators in natural order (the uploaded file had KiCad's own order);
+CPL lines are one per part with KiCad's coordinates (mm, y down) and
+rotation normalised to 0..360.
+"""
+
+import csv
+import io
+from collections import namedtuple
+
+from kicad_schematic import load_hierarchy, natural_key, sheet_symbols
+from kicad_sexpr import load
+
+
+BOM_HEADER = ['Comment', 'Designator', 'Footprint', 'JLCPCB Part #']
+CPL_HEADER = ['Designator', 'Mid X', 'Mid Y', 'Layer', 'Rotation']
+# Property names the part number has been stored under, in priority order
+PART_PROPERTIES = ('JLCPCB Part #', 'LCSC Part', 'LCSC', 'LCSC Part #', 'JLCPCB Part')
+
+Part = namedtuple('Part', 'ref value footprint lcsc x y rotation layer in_bom in_pos')
+
+
+def part_number(node):
+    for key in PART_PROPERTIES:
+        value = node.property(key)
+        if value:
+            return value.strip()
+    return ''
+
+
+def _flag(node, name):
+    return node.value(name) == 'yes'
+
+
+def schematic_parts(root_file):
+    """{reference: (value, part number, in_bom, dnp)} for the whole hierarchy."""
+    parts = {}
+    for sheet in load_hierarchy(root_file, forms={'symbol'}):
+        for symbol, ref in sheet_symbols(sheet):
+            if not ref or ref.startswith('#'):
+                continue
+            in_bom = symbol.value('in_bom') != 'no'
+            parts[ref] = (symbol.property('Value', ''), part_number(symbol),
+                          in_bom, _flag(symbol, 'dnp'))
+    return parts
+
+
+def collect_parts(board_file, schematic_file=None):
+    """Parts on the board, cross-checked against the schematic.
+
+    Returns (parts, warnings). Warnings note parts whose board and
+    schematic properties disagree and parts with no part number.
+    """
+    schematic = schematic_parts(schematic_file) if schematic_file else {}
+    board = load(board_file, forms={'footprint'})
+    parts, warnings = [], []
+    for footprint in board.find_all('footprint'):
+        ref = footprint.property('Reference', '')
+        if not ref or ref.endswith('**'):
+            continue
+        attr = footprint.find('attr')
+        attrs = set(attr.atoms()) if attr is not None else set()
+        value, lcsc = footprint.property('Value', ''), part_number(footprint)
+        in_bom = 'exclude_from_bom' not in attrs and 'dnp' not in attrs
+        in_pos = 'exclude_from_pos_files' not in attrs and 'dnp' not in attrs
+        if ref in schematic:
+            sch_value, sch_lcsc, sch_in_bom, dnp = schematic.pop(ref)
+            if sch_value != value:
+                warnings.append(f"{ref}: value '{value}' on the board, '{sch_value}' in the schematic")
+            if sch_lcsc and sch_lcsc != lcsc:
+                warnings.append(f"{ref}: part {lcsc or '(none)'} on the board, {sch_lcsc} in the schematic")
+            lcsc = lcsc or sch_lcsc
+            in_bom = in_bom and sch_in_bom and not dnp
+            in_pos = in_pos and not dnp
+        elif schematic_file:
+            warnings.append(f"{ref}: on the board but not in the schematic")
+        if in_bom and not lcsc:
+            warnings.append(f"{ref}: no LCSC part number, left out of the BOM")
+            in_bom = in_pos = False
+
+        x, y, *rotation = footprint.floats('at') + [0.0]
+        parts.append(Part(ref, value, footprint.value().split(':')[-1], lcsc, x, y,
+                          rotation[0] % 360, footprint.value('layer'), in_bom, in_pos))
+    for ref in sorted(schematic, key=natural_key):
+        if schematic[ref][2]:
+            warnings.append(f"{ref}: in the schematic but not on the board")
+    parts.sort(key=lambda part: natural_key(part.ref))
+    warnings.sort(key=lambda warning: natural_key(warning.split(':')[0]))
+    return parts, warnings
+
+
+def bom_rows(parts):
+    """One row per (value, footprint, part number) group, in first-designator order."""
+    groups = {}
+    for part in parts:
+        if part.in_bom:
+            groups.setdefault((part.value, part.footprint, part.lcsc), []).append(part.ref)
+    rows = [[value, ','.join(sorted(refs, key=natural_key)), footprint, lcsc]
+            for (value, footprint, lcsc), refs in groups.items()]
+    return sorted(rows, key=lambda row: natural_key(row[1].split(',')[0]))
+
+
+def cpl_rows(parts):
+    return [[part.ref, f'{part.x:.4f}mm', f'{part.y:.4f}mm',
+             'Bottom' if part.layer == 'B.Cu' else 'Top', f'{part.rotation:g}']
+            for part in parts if part.in_bom and part.in_pos]
+
+
+def write_csv(path, header, rows):
+    """Write a CSV the way the uploaded files are written (LF, minimal quoting).
+
+    Returns True if the file changed.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(header)
+    writer.writerows(rows)
+    data = buffer.getvalue().encode('utf-8')
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+
+def read_csv(path):
+    """Rows of a BOM or CPL file as dicts keyed by the header."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
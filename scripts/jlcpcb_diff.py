@@ -0,0 +1,209 @@
+"""
+Differences between JLCPCB order snapshots (BOM, CPL and Gerbers).
+
+A snapshot is one folder under jlcpcb-order-snapshots/ (for example
+2025-01-12-v1_1/used-for-order) holding the uploaded BOM and CPL CSVs and
+the Gerbers, as an order zip or a gerber directory. BOM and CPL rows are
+indexed by designator, so each comparison is a pair of dict lookups per
+part:
+
+  - BOM: parts added, removed, or with a changed value, footprint or
+    part number
+  - CPL: parts added, removed, moved (position delta), rotated (rotation
+    delta normalised to -180..180) or flipped to the other side
+
+Gerber layers are matched by file function (Copper,L1,Top, ...) and
+rasterised over the union of both boards' bounds; the XOR of the two
+images gives the changed area and where it is. Each snapshot parses and
+rasterises its files once, however many pairs it takes part in.
+
+    a, b = Snapshot(path_a), Snapshot(path_b)
+    for change in diff_cpl(a, b):
+        print(change.ref, change.detail)
+"""
+
+import math
+from collections import Counter, namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from gerber import load as load_gerbers, rasterise
+from jlcpcb import PART_PROPERTIES, read_csv
+from kicad_schematic import natural_key
+
+
+MOVE_TOLERANCE = 0.001      # mm
+DEFAULT_DPI = 300
+
+# Column names seen in JLCPCB uploads and KiCad's own position export
+BOM_COLUMNS = {'ref': ('Designator', 'Ref'), 'value': ('Comment', 'Value'),
+               'footprint': ('Footprint', 'Package'), 'lcsc': PART_PROPERTIES}
+CPL_COLUMNS = {'ref': ('Designator', 'Ref'), 'x': ('Mid X', 'PosX'), 'y': ('Mid Y', 'PosY'),
+               'layer': ('Layer', 'Side'), 'rotation': ('Rotation', 'Rot')}
+
+Change = namedtuple('Change', 'kind ref detail')
+LayerDiff = namedtuple('LayerDiff', 'layer area bbox status')
+
+
+def _column(row, names):
+    for name in names:
+        if name in row:
+            return (row[name] or '').strip()
+    return ''
+
+
+def _millimetres(text):
+    text = text.strip().lower()
+    if text.endswith('mil'):
+        return float(text[:-3]) * 0.0254
+    return float(text.removesuffix('mm') or 0)
+
+
+class Snapshot:
+    """One order folder: BOM and CPL indexed by designator, Gerbers on demand."""
+
+    def __init__(self, path, root=None):
+        self.path = Path(path)
+        self.name = str(self.path.relative_to(root)) if root else self.path.name
+        self.bom = {}   # ref -> (value, footprint, part number)
+        self.cpl = {}   # ref -> (x, y, layer, rotation)
+        for csv_path in sorted(self.path.glob('*bom*.csv')):
+            for row in read_csv(csv_path):
+                entry = tuple(_column(row, BOM_COLUMNS[key]) for key in ('value', 'footprint', 'lcsc'))
+                for ref in _column(row, BOM_COLUMNS['ref']).replace(' ', '').split(','):
+                    if ref:
+                        self.bom[ref] = entry
+        for csv_path in sorted(self.path.glob('*cpl*.csv')) + sorted(self.path.glob('*pos*.csv')):
+            for row in read_csv(csv_path):
+                ref = _column(row, CPL_COLUMNS['ref'])
+                if ref:
+                    self.cpl[ref] = (_millimetres(_column(row, CPL_COLUMNS['x'])),
+                                     _millimetres(_column(row, CPL_COLUMNS['y'])),
+                                     _column(row, CPL_COLUMNS['layer']).lower() in ('bottom', 'bot', 'b'),
+                                     float(_column(row, CPL_COLUMNS['rotation']) or 0) % 360)
+        self.gerber_source = self._gerber_source()
+        self._fabrication = None
+        self._images = {}
+
+    def _gerber_source(self):
+        zips = sorted(self.path.glob('*.zip'))
+        if zips:
+            return zips[0]
+        for directory in [self.path, *sorted(p for p in self.path.iterdir() if p.is_dir())]:
+            if any(directory.glob('*.gbr')) or any(directory.glob('*.gbrjob')):
+                return directory
+        return None
+
+    @property
+    def fabrication(self):
+        if self._fabrication is None and self.gerber_source is not None:
+            self._fabrication = load_gerbers(self.gerber_source)
+        return self._fabrication
+
+    def layers(self):
+        """{layer key: GerberLayer or DrillFile}, keyed by file function."""
+        fab = self.fabrication
+        if fab is None:
+            return {}
+        items = {}
+        for name, item in [*fab.layers.items(), *fab.drills.items()]:
+            items[item.function or name] = item
+        return items
+
+    def image(self, key, bounds, dpi):
+        cache_key = (key, bounds, dpi)
+        if cache_key not in self._images:
+            self._images[cache_key] = rasterise(self.layers()[key], bounds, dpi)
+        return self._images[cache_key]
+
+
+def find_snapshots(root):
+    """Snapshot folders under root, in (date, variant) order."""
+    root = Path(root)
+    folders = {csv_path.parent for csv_path in root.rglob('*.csv')}
+    folders |= {zip_path.parent for zip_path in root.rglob('*.zip')}
+    return [Snapshot(folder, root) for folder in sorted(folders)]
+
+
+def diff_bom(a, b):
+    changes = []
+    for ref in sorted(a.bom.keys() | b.bom.keys(), key=natural_key):
+        old, new = a.bom.get(ref), b.bom.get(ref)
+        if old == new:
+            continue
+        if old is None:
+            changes.append(Change('added', ref, f"{new[0]} {new[1]} {new[2]}".strip()))
+        elif new is None:
+            changes.append(Change('removed', ref, f"{old[0]} {old[1]} {old[2]}".strip()))
+        else:
+            fields = [f"{label} {o or '-'} -> {n or '-'}"
+                      for label, o, n in zip(('value', 'footprint', 'part'), old, new) if o != n]
+            changes.append(Change('changed', ref, ', '.join(fields)))
+    return changes
+
+
+def diff_cpl(a, b, tolerance=MOVE_TOLERANCE):
+    changes = []
+    for ref in sorted(a.cpl.keys() | b.cpl.keys(), key=natural_key):
+        old, new = a.cpl.get(ref), b.cpl.get(ref)
+        if old is None:
+            changes.append(Change('added', ref, f"at ({new[0]:.4f}, {new[1]:.4f}) {new[3]:g}°"))
+            continue
+        if new is None:
+            changes.append(Change('removed', ref, f"from ({old[0]:.4f}, {old[1]:.4f})"))
+            continue
+        dx, dy = new[0] - old[0], new[1] - old[1]
+        if math.hypot(dx, dy) > tolerance:
+            changes.append(Change('moved', ref, f"({old[0]:.4f}, {old[1]:.4f}) -> ({new[0]:.4f}, "
+                                                f"{new[1]:.4f}), delta ({dx:+.4f}, {dy:+.4f}) mm"))
+        turn = (new[3] - old[3] + 180) % 360 - 180
+        if abs(turn) > 1e-6:
+            changes.append(Change('rotated', ref, f"{old[3]:g}° -> {new[3]:g}° ({turn:+g}°)"))
+        if old[2] != new[2]:
+            changes.append(Change('flipped', ref, f"to {'bottom' if new[2] else 'top'}"))
+    return changes
+
+
+def diff_gerbers(a, b, dpi=DEFAULT_DPI):
+    """LayerDiff per layer function present in either snapshot."""
+    layers_a, layers_b = a.layers(), b.layers()
+    if not layers_a or not layers_b:
+        return []
+    boxes = np.array([a.fabrication.bounds, b.fabrication.bounds])
+    bounds = (*boxes[:, :2].min(axis=0), *boxes[:, 2:].max(axis=0))
+    per_mm = dpi / 25.4
+    diffs = []
+    for key in sorted(layers_a.keys() | layers_b.keys()):
+        if key not in layers_b:
+            diffs.append(LayerDiff(key, None, None, 'removed'))
+            continue
+        if key not in layers_a:
+            diffs.append(LayerDiff(key, None, None, 'added'))
+            continue
+        changed = a.image(key, bounds, dpi) ^ b.image(key, bounds, dpi)
+        count = np.count_nonzero(changed)
+        if not count:
+            diffs.append(LayerDiff(key, 0.0, None, 'same'))
+            continue
+        rows, cols = np.nonzero(changed)
+        # Image rows run down from the top edge; KiCad board y = -Gerber y
+        x1, x2 = bounds[0] + cols.min() / per_mm, bounds[0] + (cols.max() + 1) / per_mm
+        y1, y2 = rows.min() / per_mm - bounds[3], (rows.max() + 1) / per_mm - bounds[3]
+        diffs.append(LayerDiff(key, count / per_mm ** 2, (x1, y1, x2, y2), 'changed'))
+    return diffs
+
+
+def hole_changes(a, b):
+    """(added, removed) drill hole counts per drill file function."""
+    result = {}
+    drills_a = {d.function or n: d for n, d in (a.fabrication.drills.items() if a.fabrication else ())}
+    drills_b = {d.function or n: d for n, d in (b.fabrication.drills.items() if b.fabrication else ())}
+    for key in drills_a.keys() | drills_b.keys():
+        old = Counter((round(h.x, 3), round(h.y, 3), round(h.diameter, 3))
+                      for h in getattr(drills_a.get(key), 'holes', ()))
+        new = Counter((round(h.x, 3), round(h.y, 3), round(h.diameter, 3))
+                      for h in getattr(drills_b.get(key), 'holes', ()))
+        if old != new:
+            result[key] = (sum((new - old).values()), sum((old - new).values()))
+    return result
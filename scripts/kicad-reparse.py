@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Re-parse KiCad files through the form cache and report what changed.
+
+Meant for pre-commit hooks and repeated analyses: each file is split into
+its top-level forms and only forms whose bytes changed since the last run
+are parsed (see kicad_cache.py). The cache lives in .kicad-cache/
+(gitignored) next to the files.
+
+Usage:
+    python3 scripts/kicad-reparse.py                          # Every .kicad_pcb/.kicad_sch in the repo root
+    python3 scripts/kicad-reparse.py zudo-pd.kicad_pcb        # Only the given files
+    python3 scripts/kicad-reparse.py --forms segment via ...  # Only materialise these forms
+    python3 scripts/kicad-reparse.py --clear                  # Drop the cache first
+"""
+
+import argparse
+import shutil
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from kicad_cache import CACHE_DIR_NAME, FormCache
+from kicad_sexpr import SExprError
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incrementally re-parse KiCad files.')
+    parser.add_argument('files', nargs='*', type=Path,
+                        help='files to parse (default: boards and schematics in the repo root)')
+    parser.add_argument('--forms', nargs='+', metavar='NAME',
+                        help='only materialise these top-level forms')
+    parser.add_argument('--clear', action='store_true', help='delete the cache before parsing')
+    args = parser.parse_args()
+
+    files = args.files or sorted(REPO_ROOT.glob('*.kicad_pcb')) + sorted(REPO_ROOT.glob('*.kicad_sch'))
+    if args.clear:
+        for directory in {path.resolve().parent / CACHE_DIR_NAME for path in files}:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    failures = 0
+    for path in files:
+        started = time.perf_counter()
+        try:
+            cache = FormCache(path)
+            previous = cache.ranges
+            cache.load(set(args.forms) if args.forms else None)
+            cache.save()
+        except (OSError, SExprError, UnicodeDecodeError) as e:
+            failures += 1
+            print(f"✗ {path.name}: Error - {e}")
+            continue
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = cache.stats
+        changed = Counter(name for name, _, _ in cache.changed(previous)) if previous else None
+        detail = ''
+        if changed:
+            detail = ' (' + ', '.join(f'{name} ×{n}' if n > 1 else name
+                                      for name, n in changed.most_common()) + ')'
+        elif changed is None:
+            detail = ' (no previous cache)'
+        print(f"✓ {path.name}: {stats['parsed']} of {stats['forms']} forms parsed, "
+              f"{stats['reused']} reused{detail} - {elapsed_ms:.0f} ms")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,473 @@
+"""
+Board model for a .kicad_pcb with a spatial index over its copper.
+
+Pads, tracks, vias and filled zones are loaded into flat lists of namedtuples
+(positions in board millimetres, y down as in KiCad) and indexed in a uniform
+grid by bounding box. Queries fetch the candidates from the grid cells they
+touch and then test the exact copper shape, so "what lies within 2 mm of U2"
+or "what is under this point" cost a few cells rather than a pass over the
+whole board:
+
+    board = load_board('zudo-pd.kicad_pcb')
+    board.near('U2', 2.0)                       # Other nets' copper within 2 mm of U2's pads
+    board.query_points([(41.5, 12.8)], layer='F.Cu')
+    board.footprint_at(41.5, 12.8).ref          # 'C30'
+    board.net_items('GND')
+
+Every copper shape is reduced to a core (a point, a segment or a polygon)
+plus a radius: a via is a point with its annular radius, a track a segment
+with half its width, an oval pad a segment between its end centres, a
+rectangular pad or a zone fill a polygon with radius 0. Distances are
+measured between cores and the radii subtracted. Zone fills run to
+thousands of vertices, so each keeps its own edge grid (PolygonIndex).
+
+The grid needs no extra dependency and suits board geometry, which is
+spread fairly evenly; with the default 2 mm cells a 4-layer board of a few
+thousand tracks still touches only a handful of cells per query.
+"""
+
+import math
+from collections import defaultdict, namedtuple
+from pathlib import Path
+
+from kicad_sexpr import load
+
+
+BOARD_FORMS = {'layers', 'net', 'footprint', 'segment', 'arc', 'via', 'zone'}
+DEFAULT_CELL = 2.0   # mm
+COURTYARD_LAYERS = {'F.CrtYd', 'B.CrtYd'}
+
+Pad = namedtuple('Pad', 'ref number net layers kind shape x y width height angle drill bbox')
+Track = namedtuple('Track', 'net layer x1 y1 x2 y2 width bbox')
+Via = namedtuple('Via', 'net layers x y size drill bbox')
+ZoneFill = namedtuple('ZoneFill', 'net layer points bbox')
+Footprint = namedtuple('Footprint', 'ref value name layer x y angle pads bbox')
+
+
+def rotate(x, y, angle):
+    """Rotate a footprint-local offset by a KiCad angle (degrees, y down)."""
+    if not angle:
+        return x, y
+    a = math.radians(angle)
+    c, s = math.cos(a), math.sin(a)
+    return x * c + y * s, -x * s + y * c
+
+
+def _bbox(points, pad=0.0):
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+
+
+def _segment_distance(px, py, x1, y1, x2, y2):
+    dx, dy = x2 - x1, y2 - y1
+    length2 = dx * dx + dy * dy
+    if length2:
+        t = max(0.0, min(1.0, ((px - x1) * dx + (py - y1) * dy) / length2))
+        x1 += t * dx
+        y1 += t * dy
+    return math.hypot(px - x1, py - y1)
+
+
+def _edges(core):
+    if len(core) == 2:
+        return [core]
+    return list(zip(core, core[1:] + core[:1]))
+
+
+def _contains(polygon, x, y):
+    inside = False
+    x1, y1 = polygon[-1]
+    for x2, y2 in polygon:
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+        x1, y1 = x2, y2
+    return inside
+
+
+def _point_distance(x, y, core):
+    """Distance from (x, y) to a core; 0 inside a polygon."""
+    if len(core) == 1:
+        return math.hypot(x - core[0][0], y - core[0][1])
+    if len(core) > 2 and _contains(core, x, y):
+        return 0.0
+    return min(_segment_distance(x, y, *a, *b) for a, b in _edges(core))
+
+
+def _cross(ax, ay, bx, by, cx, cy):
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def _segments_intersect(a, b, c, d):
+    d1 = _cross(*c, *d, *a)
+    d2 = _cross(*c, *d, *b)
+    d3 = _cross(*a, *b, *c)
+    d4 = _cross(*a, *b, *d)
+    return ((d1 > 0) != (d2 > 0) or d1 == 0 or d2 == 0) and \
+           ((d3 > 0) != (d4 > 0) or d3 == 0 or d4 == 0) and \
+           min(a[0], b[0]) <= max(c[0], d[0]) and min(c[0], d[0]) <= max(a[0], b[0]) and \
+           min(a[1], b[1]) <= max(c[1], d[1]) and min(c[1], d[1]) <= max(a[1], b[1])
+
+
+def core_distance(a, b):
+    """Distance between two cores (0 when they touch or overlap)."""
+    if len(a) == 1:
+        return _point_distance(*a[0], b)
+    if len(b) == 1:
+        return _point_distance(*b[0], a)
+    if (len(a) > 2 and _contains(a, *b[0])) or (len(b) > 2 and _contains(b, *a[0])):
+        return 0.0
+    edges_a, edges_b = _edges(a), _edges(b)
+    best = math.inf
+    for p, q in edges_a:
+        for r, s in edges_b:
+            if _segments_intersect(p, q, r, s):
+                return 0.0
+        best = min(best, _point_distance(*p, b), _point_distance(*q, b))
+    for r, s in edges_b:
+        best = min(best, _point_distance(*r, a), _point_distance(*s, a))
+    return best
+
+
+def shape(item):
+    """Return (core, radius) for a Pad, Track, Via or ZoneFill."""
+    if type(item) is Track:
+        return ((item.x1, item.y1), (item.x2, item.y2)), item.width / 2
+    if type(item) is Via:
+        return ((item.x, item.y),), item.size / 2
+    if type(item) is ZoneFill:
+        return item.points, 0.0
+    w, h = item.width / 2, item.height / 2
+    if item.shape == 'circle':
+        return ((item.x, item.y),), w
+    if item.shape == 'oval' and w != h:
+        dx, dy = rotate(w - h, 0, item.angle) if w > h else rotate(0, h - w, item.angle)
+        return ((item.x - dx, item.y - dy), (item.x + dx, item.y + dy)), min(w, h)
+    corners = [rotate(cx, cy, item.angle) for cx, cy in ((-w, -h), (w, -h), (w, h), (-w, h))]
+    return tuple((item.x + cx, item.y + cy) for cx, cy in corners), 0.0
+
+
+class GridIndex:
+    """Uniform grid mapping cells to the ids whose bounding box overlaps them."""
+
+    def __init__(self, cell=DEFAULT_CELL):
+        self.cell = cell
+        self.cells = defaultdict(list)
+
+    def _span(self, bbox):
+        c = self.cell
+        return (range(math.floor(bbox[0] / c), math.floor(bbox[2] / c) + 1),
+                range(math.floor(bbox[1] / c), math.floor(bbox[3] / c) + 1))
+
+    def insert(self, item_id, bbox):
+        xs, ys = self._span(bbox)
+        for i in xs:
+            for j in ys:
+                self.cells[i, j].append(item_id)
+
+    def candidates(self, bbox):
+        xs, ys = self._span(bbox)
+        found = set()
+        cells = self.cells
+        for i in xs:
+            for j in ys:
+                if (i, j) in cells:
+                    found.update(cells[i, j])
+        return found
+
+
+class PolygonIndex:
+    """Edges of one large polygon (a zone fill) bucketed by grid cell.
+
+    Zone fills run to thousands of vertices, so the inside test only walks
+    the edges crossing the point's grid row and distance tests only the
+    edges near the query.
+    """
+
+    def __init__(self, points, cell=DEFAULT_CELL):
+        self.edges = _edges(points)
+        self.grid = GridIndex(cell)
+        self.rows = defaultdict(list)
+        for edge_id, (a, b) in enumerate(self.edges):
+            self.grid.insert(edge_id, _bbox((a, b)))
+            for row in range(math.floor(min(a[1], b[1]) / cell), math.floor(max(a[1], b[1]) / cell) + 1):
+                self.rows[row].append(edge_id)
+
+    def contains(self, x, y):
+        inside = False
+        for edge_id in self.rows.get(math.floor(y / self.grid.cell), ()):
+            (x1, y1), (x2, y2) = self.edges[edge_id]
+            if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+        return inside
+
+    def within(self, core, limit):
+        """True if `core` lies inside the polygon or within `limit` of an edge."""
+        if any(self.contains(x, y) for x, y in core):
+            return True
+        if len(core) > 2 and _contains(core, *self.edges[0][0]):
+            return True
+        return any(core_distance(core, self.edges[edge_id]) <= limit
+                   for edge_id in self.grid.candidates(_bbox(core, limit)))
+
+
+class Board:
+    """Copper items of one board with lookups by reference, net and position."""
+
+    def __init__(self, root, cell=DEFAULT_CELL):
+        self.copper_layers = _copper_layers(root)
+        self.nets = {int(net.items[0]): net.items[1] for net in root.find_all('net')
+                     if len(net.items) > 1}
+        self.footprints = {}
+        self.pads, self.tracks, self.vias, self.zones = [], [], [], []
+        for node in root.find_all('footprint'):
+            footprint = self._footprint(node)
+            self.footprints[footprint.ref] = footprint
+        for node in root:
+            if node.name in ('segment', 'arc'):
+                self.tracks.extend(self._tracks(node))
+            elif node.name == 'via':
+                self.vias.append(self._via(node))
+            elif node.name == 'zone':
+                self.zones.extend(self._zone_fills(node))
+
+        self.items = self.pads + self.tracks + self.vias + self.zones
+        self._shapes = [shape(item) for item in self.items]
+        self._polygons = {item_id: PolygonIndex(item.points, cell)
+                          for item_id, item in enumerate(self.items) if type(item) is ZoneFill}
+        self._layers = [self._item_layers(item) for item in self.items]
+        self.by_net = defaultdict(list)
+        self.grid = GridIndex(cell)
+        for item_id, item in enumerate(self.items):
+            self.by_net[item.net].append(item)
+            self.grid.insert(item_id, item.bbox)
+        self.footprint_grid = GridIndex(cell)
+        self._footprint_list = list(self.footprints.values())
+        for fp_id, footprint in enumerate(self._footprint_list):
+            self.footprint_grid.insert(fp_id, footprint.bbox)
+
+    # --- loading ---------------------------------------------------------
+
+    def _expand(self, names):
+        layers = set()
+        for name in names:
+            if name.startswith('*.'):
+                suffix = name[1:]
+                layers.update(l for l in self.copper_layers if l.endswith(suffix))
+                layers.update(f'{side}{suffix}' for side in 'FB' if suffix != '.Cu')
+            elif name.startswith('F&B.'):
+                layers.update(('F.' + name[4:], 'B.' + name[4:]))
+            else:
+                layers.add(name)
+        return tuple(sorted(layers))
+
+    def _footprint(self, node):
+        fx, fy, *rest = node.floats('at') + [0.0]
+        angle = rest[0]
+        ref = node.property('Reference', '')
+        pads = []
+        for pad in node.find_all('pad'):
+            number, kind, pad_shape = (pad.atoms() + ['', '', ''])[:3]
+            px, py, *pad_rest = pad.floats('at') + [0.0]
+            dx, dy = rotate(px, py, angle)
+            width, height = (pad.floats('size') + [0.0, 0.0])[:2]
+            net = pad.find('net')
+            layers = pad.find('layers')
+            drill = pad.floats('drill')
+            pad = Pad(ref, number, net.items[-1] if net is not None else '',
+                      self._expand(layers.atoms() if layers is not None else []),
+                      kind, pad_shape, fx + dx, fy + dy, width, height, pad_rest[0],
+                      drill[0] if drill else 0.0, None)
+            core, radius = shape(pad)
+            pads.append(pad._replace(bbox=_bbox(core, radius)))
+        self.pads.extend(pads)
+
+        # Courtyard when drawn, else every graphic plus the pads
+        courtyard, outline = [], []
+        for graphic in node:
+            if not graphic.name.startswith('fp_') or graphic.name == 'fp_text':
+                continue
+            points = _graphic_points(graphic)
+            outline.extend(points)
+            if graphic.value('layer') in COURTYARD_LAYERS:
+                courtyard.extend(points)
+        points = [(fx + dx, fy + dy) for dx, dy in
+                  (rotate(x, y, angle) for x, y in courtyard or outline)]
+        if not courtyard:
+            points += [corner for p in pads for corner in (p.bbox[:2], p.bbox[2:])]
+        bbox = _bbox(points) if points else (fx, fy, fx, fy)
+        return Footprint(ref, node.property('Value', ''), node.value(), node.value('layer'),
+                         fx, fy, angle, tuple(pads), bbox)
+
+    def _tracks(self, node):
+        net = self.nets.get(int(node.value('net', 0)), '')
+        layer = node.value('layer')
+        width = node.floats('width')[0]
+        x1, y1 = node.floats('start')
+        x2, y2 = node.floats('end')
+        mid = node.floats('mid')
+        ends = [((x1, y1), tuple(mid)), (tuple(mid), (x2, y2))] if mid else [((x1, y1), (x2, y2))]
+        return [Track(net, layer, a[0], a[1], b[0], b[1], width, _bbox((a, b), width / 2))
+                for a, b in ends]
+
+    def _via(self, node):
+        x, y = node.floats('at')[:2]
+        size = node.floats('size')[0]
+        drill = node.floats('drill')
+        layers = node.find('layers').atoms() if node.find('layers') is not None else ['F.Cu', 'B.Cu']
+        return Via(self.nets.get(int(node.value('net', 0)), ''), self._via_layers(layers),
+                   x, y, size, drill[0] if drill else 0.0, (x - size / 2, y - size / 2,
+                                                           x + size / 2, y + size / 2))
+
+    def _via_layers(self, ends):
+        """Copper layers a via spans, from its two end layers."""
+        order = [l for l in self.copper_layers if l in ends]
+        if len(order) < 2:
+            return tuple(ends)
+        first, last = self.copper_layers.index(order[0]), self.copper_layers.index(order[-1])
+        return tuple(self.copper_layers[first:last + 1])
+
+    def _zone_fills(self, node):
+        net = node.value('net_name') or self.nets.get(int(node.value('net', 0)), '')
+        fills = []
+        for polygon in node.find_all('filled_polygon'):
+            points = tuple(tuple(xy.floats()) for xy in polygon.find('pts').find_all('xy'))
+            if len(points) > 2:
+                fills.append(ZoneFill(net, polygon.value('layer'), points, _bbox(points)))
+        return fills
+
+    def _item_layers(self, item):
+        return frozenset((item.layer,) if type(item) in (Track, ZoneFill) else item.layers)
+
+    # --- lookups -----------------------------------------------------------
+
+    def footprint(self, ref):
+        """Footprint by reference designator (KeyError if absent)."""
+        return self.footprints[ref]
+
+    def net_items(self, net):
+        """Pads, tracks, vias and zone fills on the net named `net`."""
+        return list(self.by_net.get(net, ()))
+
+    def _query(self, core, radius, layer=None, exclude=(), layers=None):
+        bbox = _bbox(core, radius)
+        found = []
+        for item_id in sorted(self.grid.candidates(bbox)):
+            if item_id in exclude:
+                continue
+            item = self.items[item_id]
+            ib = item.bbox
+            if ib[0] > bbox[2] or ib[2] < bbox[0] or ib[1] > bbox[3] or ib[3] < bbox[1]:
+                continue
+            if layer is not None and layer not in self._layers[item_id]:
+                continue
+            if layers is not None and layers.isdisjoint(self._layers[item_id]):
+                continue
+            if item_id in self._polygons:
+                if self._polygons[item_id].within(core, radius):
+                    found.append(item_id)
+                continue
+            item_core, item_radius = self._shapes[item_id]
+            if core_distance(core, item_core) <= radius + item_radius:
+                found.append(item_id)
+        return found
+
+    def query_points(self, points, layer=None):
+        """Copper items under each (x, y): one list per point."""
+        return [[self.items[i] for i in self._query(((x, y),), 0.0, layer)] for x, y in points]
+
+    def query_rects(self, rects, layer=None):
+        """Copper items touching each (x1, y1, x2, y2) rectangle."""
+        results = []
+        for x1, y1, x2, y2 in rects:
+            x1, x2 = sorted((x1, x2))
+            y1, y2 = sorted((y1, y2))
+            core = ((x1, y1), (x2, y1), (x2, y2), (x1, y2))
+            results.append([self.items[i] for i in self._query(core, 0.0, layer)])
+        return results
+
+    def query_radius(self, points, radius, layer=None):
+        """Copper items within `radius` mm of each (x, y)."""
+        return [[self.items[i] for i in self._query(((x, y),), radius, layer)] for x, y in points]
+
+    def near(self, ref, radius, layer=None):
+        """Copper of other footprints and nets within `radius` mm of `ref`'s pads.
+
+        Each pad is checked on its own copper layers (only `layer` if given),
+        and items on the pad's net are left out; pads without a net see all.
+        """
+        own = {i for i, item in enumerate(self.items) if type(item) is Pad and item.ref == ref} \
+            if ref in self.footprints else set()
+        if not own:
+            raise KeyError(ref)
+        found = set()
+        for pad_id in own:
+            net = self.items[pad_id].net
+            core, pad_radius = self._shapes[pad_id]
+            layers = None if layer is not None else self._layers[pad_id]
+            found.update(i for i in self._query(core, pad_radius + radius, layer, own, layers)
+                         if not net or self.items[i].net != net)
+        return [self.items[i] for i in sorted(found)]
+
+    def footprint_at(self, x, y):
+        """Footprint owning (x, y): the one whose pad is hit, else the
+        smallest courtyard (or outline) box containing it; None otherwise."""
+        for item in self.query_points([(x, y)])[0]:
+            if type(item) is Pad:
+                return self.footprints[item.ref]
+        best = None
+        for fp_id in self.footprint_grid.candidates((x, y, x, y)):
+            footprint = self._footprint_list[fp_id]
+            x1, y1, x2, y2 = footprint.bbox
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                area = (x2 - x1) * (y2 - y1)
+                if best is None or area < best[0]:
+                    best = (area, footprint)
+        return best[1] if best else None
+
+
+def _copper_layers(root):
+    """Copper layer names in stack order (F.Cu, In1.Cu, ..., B.Cu)."""
+    layers = root.find('layers')
+    names = [node.items[0] for node in layers] if layers is not None else []
+    copper = [name for name in names if name.endswith('.Cu')] or ['F.Cu', 'B.Cu']
+    inner = sorted((n for n in copper if n.startswith('In')), key=lambda n: int(n[2:-3]))
+    return [n for n in ('F.Cu',) if n in copper] + inner + [n for n in ('B.Cu',) if n in copper]
+
+
+def _graphic_points(node):
+    """Footprint-local points bounding an fp_line/fp_rect/fp_arc/fp_circle/fp_poly."""
+    if node.name == 'fp_circle':
+        cx, cy = node.floats('center')
+        ex, ey = node.floats('end')
+        r = math.hypot(ex - cx, ey - cy)
+        return [(cx - r, cy - r), (cx + r, cy - r), (cx + r, cy + r), (cx - r, cy + r)]
+    if node.name == 'fp_rect':
+        x1, y1 = node.floats('start')
+        x2, y2 = node.floats('end')
+        return [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+    pts = node.find('pts')
+    if pts is not None:
+        return [tuple(xy.floats()) for xy in pts.find_all('xy')]
+    return [tuple(node.floats(key)) for key in ('start', 'mid', 'end') if node.find(key) is not None]
+
+
+def load_board(path, cell=DEFAULT_CELL, cache=None):
+    """Load the copper and footprints of a .kicad_pcb into a Board.
+
+    Pass a kicad_cache.FormCache for the file to re-parse only edited forms.
+    """
+    root = cache.load(BOARD_FORMS) if cache is not None else load(Path(path), forms=BOARD_FORMS)
+    return Board(root, cell)
+
+
+def describe(item):
+    """One-line description of a board item for tool output."""
+    if type(item) is Pad:
+        return f"pad {item.ref}.{item.number} [{item.net or 'no net'}] {item.shape} at ({item.x:.3f}, {item.y:.3f})"
+    if type(item) is Track:
+        return (f"track [{item.net}] {item.layer} ({item.x1:.3f}, {item.y1:.3f})-"
+                f"({item.x2:.3f}, {item.y2:.3f}) w={item.width:g}")
+    if type(item) is Via:
+        return f"via [{item.net}] at ({item.x:.3f}, {item.y:.3f}) {item.size:g}/{item.drill:g}"
+    return f"zone [{item.net}] {item.layer} ({len(item.points)} points)"
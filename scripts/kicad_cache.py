@@ -0,0 +1,172 @@
+"""
+Incremental re-parse of KiCad files, keyed by top-level form.
+
+A commit that moves two footprints or re-routes a wire changes a handful of
+the ~900 top-level forms in zudo-pd.kicad_pcb. `FormCache` splits the file
+with kicad_sexpr.top_level_forms (one regex pass), hashes each form's bytes
+and parses only the forms whose hash it has not seen; the rest are spliced
+in from the cache:
+
+    cache = FormCache('zudo-pd.kicad_pcb')
+    board = cache.load(forms={'segment', 'via'})
+    cache.save()
+    cache.stats      # {'forms': 714, 'parsed': 3, 'reused': 711}
+
+Forms are keyed by content hash, not position, so a form that only moved
+in the file (KiCad re-sorts on save) is still a hit. The cache persists to
+`.kicad-cache/` next to the source (gitignored) with one pickle per file.
+Each form is pickled separately, so a load only unpickles the forms it
+asks for. `save` keeps just the forms of the current file, so the cache
+never holds more than one copy of it.
+
+Within one process (a watcher, a hook running several checks) the parsed
+Nodes are kept too, and a reload costs the scan, the hashing and the
+edited forms only.
+
+The file helpers below are shared by the other caches (footprint and symbol
+indexes, SVG manifests): `atomic_write` renames a per-process temp file into
+place, so processes saving the same cache at once never clobber each
+other's half-written copy, and `load_pickle`/`read_manifest` treat anything
+unreadable or stale as a miss.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+from pathlib import Path
+
+from kicad_sexpr import Node, SExprError, parse_text, root_name, top_level_forms
+
+
+CACHE_DIR_NAME = '.kicad-cache'
+CACHE_VERSION = 1
+
+
+# What unpickling a cache written by another version of these modules can
+# raise; any of them is a cache miss, never a failed command
+STALE_CACHE_ERRORS = (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError,
+                      IndexError, KeyError, TypeError, ValueError)
+
+
+def form_digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def atomic_write(path, data):
+    """Replace `path` with `data` (bytes) through a per-process temp file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def load_pickle(path):
+    """Unpickled contents of `path`, or None when missing, damaged or stale."""
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except STALE_CACHE_ERRORS:
+        return None
+
+
+def save_pickle(path, value):
+    atomic_write(path, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def read_manifest(path, **header):
+    """The `files` of a JSON manifest whose header fields equal `header`, else {}."""
+    try:
+        manifest = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or any(manifest.get(key) != value for key, value in header.items()):
+        return {}
+    return manifest.get('files', {})
+
+
+def write_manifest(path, files, **header):
+    """Write a JSON manifest: the `header` fields, then `files` sorted by name."""
+    manifest = {**header, 'files': dict(sorted(files.items()))}
+    atomic_write(path, (json.dumps(manifest, indent=2) + '\n').encode('utf-8'))
+
+
+class FormCache:
+    """Parsed top-level forms of one KiCad file, reused across edits."""
+
+    def __init__(self, path, cache_dir=None):
+        self.path = Path(path).resolve()
+        self.cache_dir = Path(cache_dir) if cache_dir else self.path.parent / CACHE_DIR_NAME
+        self.cache_file = self.cache_dir / f'{self.path.name}.pickle'
+        self.ranges = []       # [(name, start, end, digest)] of the last load
+        self.stats = {}
+        self._pickled = {}     # digest -> pickled Node (as persisted)
+        self._nodes = {}       # digest -> Node (this process)
+        self._read()
+
+    def _read(self):
+        state = load_pickle(self.cache_file)
+        if isinstance(state, dict) and state.get('version') == CACHE_VERSION \
+                and state.get('source') == str(self.path):
+            self._pickled, self.ranges = state.get('forms', {}), state.get('ranges', [])
+
+    def load(self, forms=None):
+        """Return the root Node like kicad_sexpr.load, reusing unchanged forms.
+
+        With `forms` (a set of top-level form names) only those children are
+        returned. `stats` records how many forms were parsed and reused.
+        """
+        with open(self.path, 'rb') as f:
+            if self.path.stat().st_size == 0:
+                raise SExprError(f'{self.path} is empty')
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                self.ranges = [(name, start, end, form_digest(buf[start:end]))
+                               for name, start, end in top_level_forms(buf)]
+                name = root_name(buf)
+                nodes, parsed = [], 0
+                for form, start, end, digest in self.ranges:
+                    if forms is not None and form not in forms:
+                        continue
+                    node = self._nodes.get(digest)
+                    if node is None and digest in self._pickled:
+                        try:
+                            node = pickle.loads(self._pickled[digest])
+                        except STALE_CACHE_ERRORS:
+                            del self._pickled[digest]
+                    if node is None:
+                        node, = parse_text(buf[start:end].decode('utf-8'))
+                        parsed += 1
+                    self._nodes[digest] = node
+                    nodes.append(node)
+        self.stats = {'forms': len(nodes), 'parsed': parsed, 'reused': len(nodes) - parsed}
+        return Node(name, nodes)
+
+    def changed(self, previous):
+        """Names and ranges of forms in the current file absent from `previous`
+        (an earlier `ranges` list)."""
+        seen = {digest for *_, digest in previous}
+        return [r[:3] for r in self.ranges if r[3] not in seen]
+
+    def save(self):
+        """Persist the forms of the current file; drop everything else."""
+        live = {digest for *_, digest in self.ranges}
+        pickled = {}
+        for digest in live:
+            if digest in self._pickled:
+                pickled[digest] = self._pickled[digest]
+            elif digest in self._nodes:
+                pickled[digest] = pickle.dumps(self._nodes[digest], pickle.HIGHEST_PROTOCOL)
+        self._pickled = pickled
+        self._nodes = {d: n for d, n in self._nodes.items() if d in live}
+        save_pickle(self.cache_file, {'version': CACHE_VERSION, 'source': str(self.path),
+                                      'ranges': self.ranges, 'forms': pickled})
+
+
+def load_cached(path, forms=None, cache_dir=None):
+    """One-shot cached load: read the cache, load, save. Returns (root, stats)."""
+    cache = FormCache(path, cache_dir)
+    root = cache.load(forms)
+    cache.save()
+    return root, cache.stats
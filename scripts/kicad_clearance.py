@@ -0,0 +1,233 @@
+"""
+Copper clearance check (DRC-lite) over the parsed board, in NumPy.
+
+Every copper shape of the board model (kicad_board.py) is broken into
+"capsules": a segment plus a radius, so the copper is every point within
+the radius of the segment.
+
+  - a track is its centre line with half its width
+  - a via or a round pad is a zero-length segment with its radius
+  - an oval pad is the segment between its end centres
+  - a rectangular pad is its four edges with radius 0, plus an
+    inside-the-rectangle test
+  - a zone fill is its outline edges, plus an inside-the-polygon test
+
+Capsules are bucketed in a uniform grid; candidate pairs are the
+capsules sharing a cell, generated and de-duplicated with array
+operations. Pairs on the same net, on disjoint layers or belonging to the
+same item are dropped, and the segment-to-segment distances of the rest
+are computed in one batch. A pair violates when
+
+    distance - radius_a - radius_b < max(clearance_a, clearance_b, min_clearance)
+
+with each item's clearance taken from its netclass in the .kicad_pro
+(name patterns and explicit assignments, falling back to Default) and
+min_clearance from the project's board rules. Pad-level clearance
+overrides, hole clearances and edge clearances are not checked.
+"""
+
+import fnmatch
+import json
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+from kicad_board import Pad, Track, ZoneFill, shape
+
+
+DEFAULT_CELL = 1.0   # mm
+EPSILON = 1e-4       # mm; KiCad stores copper in nm
+
+Violation = namedtuple('Violation', 'a b gap required x y layers')
+
+
+class NetClasses:
+    """Clearance per net from a .kicad_pro's net_settings."""
+
+    def __init__(self, project):
+        settings = project.get('net_settings', {})
+        self.clearance = {cls['name']: cls.get('clearance', 0.0)
+                          for cls in settings.get('classes', [])}
+        self.default = self.clearance.get('Default', 0.0)
+        self.assignments = settings.get('netclass_assignments') or {}
+        self.patterns = [(p['pattern'], p['netclass'])
+                         for p in settings.get('netclass_patterns') or []]
+        rules = project.get('board', {}).get('design_settings', {}).get('rules', {})
+        self.min_clearance = rules.get('min_clearance', 0.0)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def netclass(self, net):
+        assigned = self.assignments.get(net)
+        if assigned:
+            return assigned[0] if isinstance(assigned, list) else assigned
+        for pattern, name in self.patterns:
+            if fnmatch.fnmatchcase(net, pattern):
+                return name
+        return 'Default'
+
+    def clearance_of(self, net):
+        return self.clearance.get(self.netclass(net), self.default)
+
+
+def _capsules(board):
+    """Yield (item id, x1, y1, x2, y2, radius) for every copper item."""
+    for item_id, item in enumerate(board.items):
+        if type(item) is Pad and item.kind == 'np_thru_hole':
+            continue
+        core, radius = shape(item)
+        if len(core) == 1:
+            yield item_id, *core[0], *core[0], radius
+        elif len(core) == 2:
+            yield item_id, *core[0], *core[1], radius
+        else:
+            for (x1, y1), (x2, y2) in zip(core, core[1:] + core[:1]):
+                yield item_id, x1, y1, x2, y2, radius
+
+
+def _segment_distances(a, b):
+    """Distance between segments a[i] and b[i] (arrays of x1, y1, x2, y2)."""
+    p1, p2 = a[:, :2], a[:, 2:]
+    q1, q2 = b[:, :2], b[:, 2:]
+
+    def point_segment(p, s1, s2):
+        d = s2 - s1
+        length2 = np.einsum('ij,ij->i', d, d)
+        t = np.einsum('ij,ij->i', p - s1, d) / np.where(length2 > 0, length2, 1.0)
+        t = np.clip(np.where(length2 > 0, t, 0.0), 0.0, 1.0)
+        return np.hypot(*(s1 + t[:, None] * d - p).T)
+
+    def cross(o, u, v):
+        return (u[:, 0] - o[:, 0]) * (v[:, 1] - o[:, 1]) - (u[:, 1] - o[:, 1]) * (v[:, 0] - o[:, 0])
+
+    d1, d2 = cross(q1, q2, p1), cross(q1, q2, p2)
+    d3, d4 = cross(p1, p2, q1), cross(p1, p2, q2)
+    crossing = (d1 * d2 < 0) & (d3 * d4 < 0)
+    distance = np.minimum.reduce([point_segment(p1, q1, q2), point_segment(p2, q1, q2),
+                                  point_segment(q1, p1, p2), point_segment(q2, p1, p2)])
+    return np.where(crossing, 0.0, distance)
+
+
+def _candidate_pairs(boxes, cell, labels):
+    """Index pairs (i < j) of boxes sharing at least one grid cell, skipping
+    pairs with equal labels."""
+    lo = np.floor(boxes[:, :2] / cell).astype(np.int64)
+    hi = np.floor(boxes[:, 2:] / cell).astype(np.int64)
+    spans = hi - lo + 1
+    counts = spans[:, 0] * spans[:, 1]
+    owner = np.repeat(np.arange(len(boxes)), counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cx = lo[owner, 0] + offset % spans[owner, 0]
+    cy = lo[owner, 1] + offset // spans[owner, 0]
+    cells = (cx - cx.min()) * (cy.max() - cy.min() + 1) + (cy - cy.min())
+
+    order = np.lexsort((owner, cells))
+    cells, owner = cells[order], owner[order]
+    starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+    sizes = np.diff(np.r_[starts, len(cells)])
+    group_size = np.repeat(sizes, sizes)
+    group_start = np.repeat(starts, sizes)
+    # Pair every member with every later member of its cell
+    later = group_start + group_size - np.arange(len(cells)) - 1
+    first = np.repeat(np.arange(len(cells)), later)
+    step = np.arange(later.sum()) - np.repeat(np.cumsum(later) - later, later) + 1
+    i, j = owner[first], owner[first + step]
+    i, j = i[labels[i] != labels[j]], j[labels[i] != labels[j]]
+    keys = np.unique(np.minimum(i, j) * len(boxes) + np.maximum(i, j))
+    return keys // len(boxes), keys % len(boxes)
+
+
+def check_clearance(board, netclasses, cell=DEFAULT_CELL):
+    """Return (violations sorted by gap shortfall, number of pairs tested)."""
+    rows = list(_capsules(board))
+    if not rows:
+        return [], 0
+    data = np.array(rows, dtype=float)
+    item_of = data[:, 0].astype(np.int64)
+    segments, radius = data[:, 1:5], data[:, 5]
+
+    layer_bits = {layer: 1 << bit for bit, layer in enumerate(board.copper_layers)}
+    net_codes, masks, clearances = {}, [], []
+    nets = []
+    for item in board.items:
+        # Items without a net never count as connected to anything
+        nets.append(net_codes.setdefault(item.net, len(net_codes)) if item.net else -1 - len(nets))
+        layers = (item.layer,) if type(item) in (Track, ZoneFill) else item.layers
+        masks.append(sum(layer_bits.get(layer, 0) for layer in set(layers)))
+        clearances.append(netclasses.clearance_of(item.net))
+    nets, masks, clearances = np.array(nets), np.array(masks), np.array(clearances)
+    # Inflate each box by half the largest clearance so violating pairs share a cell
+    half = max(clearances.max(initial=0), netclasses.min_clearance) / 2
+    boxes = np.column_stack([np.minimum(segments[:, 0], segments[:, 2]) - radius - half,
+                             np.minimum(segments[:, 1], segments[:, 3]) - radius - half,
+                             np.maximum(segments[:, 0], segments[:, 2]) + radius + half,
+                             np.maximum(segments[:, 1], segments[:, 3]) + radius + half])
+
+    i, j = _candidate_pairs(boxes, cell, nets[item_of])
+    ia, ib = item_of[i], item_of[j]
+    keep = (masks[ia] & masks[ib]) != 0
+    keep &= (boxes[i, 0] <= boxes[j, 2]) & (boxes[j, 0] <= boxes[i, 2]) & \
+            (boxes[i, 1] <= boxes[j, 3]) & (boxes[j, 1] <= boxes[i, 3])
+    i, j, ia, ib = i[keep], j[keep], ia[keep], ib[keep]
+
+    gap = _segment_distances(segments[i], segments[j]) - radius[i] - radius[j]
+    required = np.maximum(np.maximum(clearances[ia], clearances[ib]), netclasses.min_clearance)
+    _inside_polygons(board, segments, item_of, i, j, gap)
+    bad = gap < required - EPSILON
+
+    worst = {}
+    for a, b, g, r, si in zip(ia[bad], ib[bad], gap[bad], required[bad], i[bad]):
+        key = (min(a, b), max(a, b))
+        if key not in worst or g < worst[key][0]:
+            worst[key] = (g, r, si)
+    violations = []
+    for (a, b), (g, r, si) in worst.items():
+        x1, y1, x2, y2 = segments[si]
+        common = masks[a] & masks[b]
+        layers = [layer for layer, bit in layer_bits.items() if common & bit]
+        violations.append(Violation(board.items[a], board.items[b], max(g, 0.0), r,
+                                    (x1 + x2) / 2, (y1 + y2) / 2, layers))
+    violations.sort(key=lambda v: v.gap - v.required)
+    return violations, len(i)
+
+
+def _inside_polygons(board, segments, item_of, i, j, gap):
+    """Set gap to 0 where one shape lies wholly inside a rectangular pad or
+    zone fill (its edges alone would miss that)."""
+    is_polygon = np.array([type(item) is ZoneFill or (type(item) is Pad and len(shape(item)[0]) > 2)
+                           for item in board.items])
+    ids, starts = np.unique(item_of, return_index=True)
+    first = dict(zip(ids.tolist(), starts.tolist()))
+    # One containment test per (polygon, other item), using the other
+    # item's first capsule start as its representative point
+    tests = defaultdict(set)
+    for outer, inner in ((i, j), (j, i)):
+        for k in np.flatnonzero((gap > 0) & is_polygon[item_of[outer]]):
+            tests[int(item_of[outer[k]])].add(int(item_of[inner[k]]))
+    inside = set()
+    for polygon_id, others in tests.items():
+        others = sorted(others)
+        points = segments[[first[other] for other in others], :2]
+        for other, hit in zip(others, _points_in_polygon(points, shape(board.items[polygon_id])[0])):
+            if hit:
+                inside.add((polygon_id, other))
+                inside.add((other, polygon_id))
+    if inside:
+        hits = np.array([pair in inside for pair in zip(item_of[i].tolist(), item_of[j].tolist())],
+                        dtype=bool)
+        gap[hits] = 0.0
+
+
+def _points_in_polygon(points, polygon):
+    """Even-odd ray cast of every point against every polygon edge."""
+    corners = np.asarray(polygon, dtype=float)
+    x1, y1 = corners[:, 0], corners[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    px, py = points[:, :1], points[:, 1:2]
+    straddles = (y1 > py) != (y2 > py)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossing_x = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+    return np.count_nonzero(straddles & (px < crossing_x), axis=1) % 2 == 1
@@ -0,0 +1,263 @@
+"""
+Cached index of the footprint libraries (.kicad_mod files).
+
+Each footprint is parsed once into a compact LibraryFootprint (pad table,
+courtyard and fab outlines, per-layer item counts, bounding boxes) and the
+index is pickled to `.kicad-cache/footprint-index.pickle` keyed by each
+file's content hash. `update` hashes every file and re-parses only those
+whose hash changed, so a refresh after editing one footprint parses one
+file:
+
+    index = load_index([('zudo-pd', 'footprints/kicad/zudo-power.pretty'),
+                        (None, 'footprints/kicad')])
+    index['zudo-pd:SOT-23-3_L2.9-W1.6-P1.90-LS2.8-BR'].pads
+    index['C0603'].body            # courtyard, else fab or silkscreen with the pads
+    index.stats                    # {'files': 110, 'parsed': 1, 'reused': 109}
+
+Lookups are dict hits, by 'nickname:name' as in a board's footprint
+field, or by bare name (the first library listing it wins, so list the
+library the board uses first). Coordinates are footprint-local mm, y
+down. Both the KiCad 5 `(module ...)` and the current `(footprint ...)`
+formats are read; KiCad 5 arcs (centre, start, angle) are converted.
+"""
+
+import math
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+
+from kicad_board import Pad, shape
+from kicad_cache import CACHE_DIR_NAME, form_digest, load_pickle, save_pickle
+from kicad_sexpr import SExprError, load, parse_text
+
+
+INDEX_VERSION = 2
+CACHE_FILE_NAME = 'footprint-index.pickle'
+OUTLINE_SUFFIXES = ('.CrtYd', '.Fab')
+CIRCLE_SEGMENTS = 32
+# Fab items smaller than this both ways are pin-1 dots, not body outline (mm)
+MARKER_SIZE = 1.0
+
+FootprintPad = namedtuple('FootprintPad', 'number kind shape x y width height angle drill layers bbox')
+LibraryFootprint = namedtuple('LibraryFootprint',
+                              'name library path digest attributes pads layers outlines '
+                              'courtyard bbox body')
+
+
+def library_table(path, project_dir=None):
+    """[(nickname, directory)] from an fp-lib-table (${KIPRJMOD} resolved)."""
+    path = Path(path)
+    project_dir = str(project_dir or path.parent)
+    table = load(path)
+    return [(lib.value('name'), Path(lib.value('uri').replace('${KIPRJMOD}', project_dir)))
+            for lib in table.find_all('lib') if lib.value('type', 'KiCad') == 'KiCad']
+
+
+def repo_libraries(repo_root):
+    """The libraries of this repo, in lookup order: fp-lib-table, then
+    the loose .kicad_mod files in footprints/kicad."""
+    repo_root = Path(repo_root)
+    return library_table(repo_root / 'fp-lib-table') + [(None, repo_root / 'footprints' / 'kicad')]
+
+
+def arc_geometry(node):
+    """(cx, cy, radius, start angle, sweep) of an fp_arc, angles in radians
+    (y down), or None for a degenerate three-point arc."""
+    if node.find('mid') is not None:
+        (x1, y1), (xm, ym), (x2, y2) = node.floats('start'), node.floats('mid'), node.floats('end')
+        # Centre of the circle through the three points
+        d = 2 * (x1 * (ym - y2) + xm * (y2 - y1) + x2 * (y1 - ym))
+        if abs(d) < 1e-12:
+            return None
+        cx = ((x1 ** 2 + y1 ** 2) * (ym - y2) + (xm ** 2 + ym ** 2) * (y2 - y1)
+              + (x2 ** 2 + y2 ** 2) * (y1 - ym)) / d
+        cy = ((x1 ** 2 + y1 ** 2) * (x2 - xm) + (xm ** 2 + ym ** 2) * (x1 - x2)
+              + (x2 ** 2 + y2 ** 2) * (xm - x1)) / d
+        a1, am, a2 = (math.atan2(y - cy, x - cx) for x, y in ((x1, y1), (xm, ym), (x2, y2)))
+        sweep = (a2 - a1) % (2 * math.pi)
+        if (am - a1) % (2 * math.pi) > sweep:
+            sweep -= 2 * math.pi
+    else:
+        # KiCad 5: start is the centre, end the first point, angle the sweep
+        (cx, cy), (x1, y1) = node.floats('start'), node.floats('end')
+        a1 = math.atan2(y1 - cy, x1 - cx)
+        sweep = math.radians(node.floats('angle')[0])
+    return cx, cy, math.hypot(x1 - cx, y1 - cy), a1, sweep
+
+
+def _arc_points(node):
+    geometry = arc_geometry(node)
+    if geometry is None:
+        return [tuple(node.floats('start')), tuple(node.floats('end'))]
+    cx, cy, radius, a1, sweep = geometry
+    steps = max(2, math.ceil(abs(sweep) / (2 * math.pi) * CIRCLE_SEGMENTS))
+    return [(cx + radius * math.cos(a1 + sweep * k / steps),
+             cy + radius * math.sin(a1 + sweep * k / steps)) for k in range(steps + 1)]
+
+
+def _polyline(node):
+    """Footprint-local points of a graphic item, closed shapes closed."""
+    if node.name == 'fp_line':
+        return [tuple(node.floats('start')), tuple(node.floats('end'))]
+    if node.name == 'fp_rect':
+        (x1, y1), (x2, y2) = node.floats('start'), node.floats('end')
+        return [(x1, y1), (x2, y1), (x2, y2), (x1, y2), (x1, y1)]
+    if node.name == 'fp_circle':
+        (cx, cy), (ex, ey) = node.floats('center'), node.floats('end')
+        r = math.hypot(ex - cx, ey - cy)
+        return [(cx + r * math.cos(a), cy + r * math.sin(a))
+                for a in (2 * math.pi * k / CIRCLE_SEGMENTS for k in range(CIRCLE_SEGMENTS + 1))]
+    if node.name == 'fp_arc':
+        return _arc_points(node)
+    if node.name == 'fp_poly':
+        points = [tuple(xy.floats()) for xy in node.find('pts').find_all('xy')]
+        return points + points[:1]
+    return []
+
+
+def _bbox(points):
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+    return (min(xs), min(ys), max(xs), max(ys)) if points else None
+
+
+def _union(*boxes):
+    boxes = [box for box in boxes if box]
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def parse_footprint(text, name, library=None, path=None, digest=None):
+    """LibraryFootprint from the text of one .kicad_mod."""
+    root, = parse_text(text)
+    if root.name not in ('footprint', 'module'):
+        raise SExprError(f'{path or name}: not a footprint')
+    layers = Counter()
+    pads = []
+    for pad in root.find_all('pad'):
+        number, kind, pad_shape = (pad.atoms() + ['', '', ''])[:3]
+        x, y, *angle = pad.floats('at') + [0.0]
+        width, height = (pad.floats('size') + [0.0, 0.0])[:2]
+        drill = pad.floats('drill')
+        pad_layers = tuple(pad.find('layers').atoms()) if pad.find('layers') is not None else ()
+        layers.update(pad_layers)
+        core, radius = shape(Pad('', number, '', pad_layers, kind, pad_shape, x, y,
+                                 width, height, angle[0], drill[0] if drill else 0.0, None))
+        bbox = _bbox(core)
+        bbox = (bbox[0] - radius, bbox[1] - radius, bbox[2] + radius, bbox[3] + radius)
+        pads.append(FootprintPad(number, kind, pad_shape, x, y, width, height, angle[0],
+                                 drill[0] if drill else 0.0, pad_layers, bbox))
+
+    outlines, boxes, fab = {}, {}, None
+    for node in root:
+        if not node.name.startswith('fp_') or node.name == 'fp_text':
+            continue
+        layer = node.value('layer')
+        points = _polyline(node)
+        if not points:
+            continue
+        layers[layer] += 1
+        box = _bbox(points)
+        boxes[layer] = _union(boxes.get(layer), box)
+        if layer.endswith('.Fab') and max(box[2] - box[0], box[3] - box[1]) >= MARKER_SIZE:
+            fab = _union(fab, box)
+        if layer.endswith(OUTLINE_SUFFIXES):
+            outlines.setdefault(layer, []).append(tuple(points))
+
+    courtyard = _union(*(box for layer, box in boxes.items() if layer.endswith('.CrtYd')))
+    silkscreen = _union(*(box for layer, box in boxes.items() if layer.endswith('.SilkS')))
+    bbox = _union(*boxes.values(), *(pad.bbox for pad in pads))
+    # EasyEDA imports have no courtyard and only a pin-1 dot on fab; their
+    # silkscreen outlines the part instead. None rather than a pads-only guess.
+    outline = fab or silkscreen
+    body = courtyard or (_union(outline, *(pad.bbox for pad in pads)) if outline else None)
+    attr = root.find('attr')
+    return LibraryFootprint(name, library, str(path) if path else None, digest,
+                            tuple(attr.atoms()) if attr is not None else (),
+                            tuple(pads), dict(layers),
+                            {layer: tuple(lines) for layer, lines in outlines.items()},
+                            courtyard, bbox, body)
+
+
+class FootprintIndex:
+    """Footprints of several libraries, refreshed by content hash."""
+
+    def __init__(self, libraries, cache_file=None):
+        self.libraries = [(nickname, Path(directory)) for nickname, directory in libraries]
+        first = self.libraries[0][1] if self.libraries else Path('.')
+        self.cache_file = Path(cache_file) if cache_file else \
+            first.resolve().parent / CACHE_DIR_NAME / CACHE_FILE_NAME
+        self.entries = {}      # resolved path -> LibraryFootprint
+        self.stats = {}
+        self._names = {}
+        self._dirty = False
+        self._read()
+
+    def _read(self):
+        state = load_pickle(self.cache_file)
+        if isinstance(state, dict) and state.get('version') == INDEX_VERSION:
+            self.entries = state.get('entries', {})
+
+    def update(self):
+        """Re-parse files whose content hash changed; drop deleted files."""
+        started = time.perf_counter()
+        entries, parsed = {}, 0
+        for nickname, directory in self.libraries:
+            for path in sorted(directory.glob('*.kicad_mod')):
+                key = str(path.resolve())
+                data = path.read_bytes()
+                digest = form_digest(data)
+                entry = self.entries.get(key)
+                if entry is None or entry.digest != digest or entry.library != nickname:
+                    entry = parse_footprint(data.decode('utf-8'), path.stem, nickname, key, digest)
+                    parsed += 1
+                entries[key] = entry
+        self._dirty = parsed > 0 or entries.keys() != self.entries.keys()
+        self.entries = entries
+        self._names = {}
+        for entry in entries.values():
+            if entry.library:
+                self._names.setdefault(f'{entry.library}:{entry.name}', entry)
+        for nickname, directory in self.libraries:
+            for key, entry in entries.items():
+                if entry.library == nickname and Path(key).parent == directory.resolve():
+                    self._names.setdefault(entry.name, entry)
+        self.stats = {'files': len(entries), 'parsed': parsed, 'reused': len(entries) - parsed,
+                      'ms': (time.perf_counter() - started) * 1000}
+        return self
+
+    def save(self):
+        """Write the index if anything changed since it was read."""
+        if not self._dirty:
+            return False
+        save_pickle(self.cache_file, {'version': INDEX_VERSION, 'entries': self.entries})
+        self._dirty = False
+        return True
+
+    def get(self, name, default=None):
+        """Footprint by 'nickname:name' or bare name."""
+        entry = self._names.get(name)
+        if entry is None and ':' in name:
+            entry = self._names.get(name.split(':', 1)[1])
+        return entry if entry is not None else default
+
+    def __getitem__(self, name):
+        entry = self.get(name)
+        if entry is None:
+            raise KeyError(name)
+        return entry
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def names(self):
+        """Bare names, sorted."""
+        return sorted(name for name in self._names if ':' not in name)
+
+
+def load_index(libraries, cache_file=None):
+    """One-shot: read the cache, refresh it from the libraries, save it."""
+    index = FootprintIndex(libraries, cache_file).update()
+    index.save()
+    return index
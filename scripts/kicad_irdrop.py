@@ -0,0 +1,236 @@
+"""
+DC voltage drop along the board's power rails (needs numpy and scipy).
+
+Each rail net of the board model (kicad_board.py) becomes a resistor
+network:
+
+  - track ends, via layers and pads are nodes; a track is cut where
+    another track ends on its centre line (a T-joint) and where a pad or
+    via overlaps it, and that point shares the pad's or via's node
+  - a track is a resistor of rho * length / (width * copper thickness)
+  - a via joins its layer nodes through its plated barrel,
+    rho * board thickness / (pi * (drill + plating) * plating)
+  - a through-hole pad joins its layers directly
+
+The rails are stacked block-diagonally into one sparse conductance matrix,
+each grounded at its source pad, and solved with one LU factorisation
+against a right-hand side holding every load case at once: each current of
+the sweep, shared across the rail's load connectors or drawn entirely
+through one of them. Drops and currents scale linearly with the load, so
+the sweep is exact, not an approximation.
+
+    result = solve_rails(board, RAILS, np.linspace(0.25, 1.0, 4))
+    result['+12V rail'].drop        # (cases, load pads) in volts
+
+Zone fills are not part of the network (the rails are routed with tracks;
+only GND has pours).
+"""
+
+import math
+from collections import defaultdict, namedtuple
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import splu
+
+from kicad_board import Pad, Track, Via, core_distance, shape
+from kicad_netlist import UnionFind
+
+
+COPPER_RESISTIVITY = 1.72e-5    # ohm mm at 20 °C
+TEMPERATURE_COEFFICIENT = 0.00393
+COPPER_THICKNESS = 0.035        # mm, 1 oz outer layers (the board has no stackup)
+VIA_PLATING = 0.018             # mm, conservative barrel plating
+BOARD_THICKNESS = 1.6           # mm, (general (thickness)) of zudo-pd.kicad_pcb
+EPSILON = 1e-4                  # mm
+
+# Rail net -> (source pad, full load current in A), from the design goals
+RAILS = {
+    '+12V rail': ('PTC1.2', 1.2),
+    '-12V rail': ('PTC3.2', 1.0),
+    '+5V rail': ('PTC2.2', 1.2),
+}
+
+Rail = namedtuple('Rail', 'net source connectors current')
+RailResult = namedtuple('RailResult', 'rail pads drop track_current tracks unreached')
+
+
+class RailNetwork:
+    """Nodes and resistors of one rail net."""
+
+    def __init__(self, board, net, resistivity=COPPER_RESISTIVITY,
+                 thickness=COPPER_THICKNESS, plating=VIA_PLATING,
+                 board_thickness=BOARD_THICKNESS):
+        self.net = net
+        self.uf = UnionFind()
+        self.keys = {}
+        self.resistors = []         # (node a, node b, ohms)
+        self.track_resistors = []   # (resistor index, Track)
+        self.pad_nodes = {}         # 'REF.NUM' -> node
+
+        items = board.net_items(net)
+        tracks = [item for item in items if type(item) is Track]
+        vias = [item for item in items if type(item) is Via]
+        pads = [item for item in items if type(item) is Pad]
+        copper = set(board.copper_layers)
+
+        for pad in pads:
+            layers = [layer for layer in pad.layers if layer in copper]
+            nodes = [self.node(('pad', pad.ref, pad.number, layer)) for layer in layers]
+            for node in nodes[1:]:
+                self.uf.union(nodes[0], node)
+            if nodes:
+                self.pad_nodes.setdefault(f'{pad.ref}.{pad.number}', nodes[0])
+        for via in vias:
+            nodes = [self.node(('via', via.x, via.y, layer)) for layer in via.layers]
+            area = math.pi * (via.drill + plating) * plating
+            for a, b in zip(nodes, nodes[1:]):
+                self.resistors.append((a, b, resistivity * board_thickness / area))
+
+        # Cut each track wherever something of the net touches it: another
+        # track's end on its centre line, or a pad or via its copper overlaps
+        # (tracks often run straight through connector pads)
+        ends = [(t.layer, x, y) for t in tracks for x, y in ((t.x1, t.y1), (t.x2, t.y2))]
+        taps = [(pad.layers, ('pad', pad.ref, pad.number), *shape(pad), pad.x, pad.y) for pad in pads]
+        taps += [(via.layers, ('via', via.x, via.y), [(via.x, via.y)], via.size / 2, via.x, via.y)
+                 for via in vias]
+        for track in tracks:
+            dx, dy = track.x2 - track.x1, track.y2 - track.y1
+            length2 = dx * dx + dy * dy
+            half = track.width / 2
+
+            def along(x, y):
+                t = ((x - track.x1) * dx + (y - track.y1) * dy) / length2 if length2 else 0.0
+                return min(max(t, 0.0), 1.0)
+
+            cuts = {0.0: [], 1.0: []}
+            for layer, x, y in ends:
+                t = along(x, y)
+                if layer == track.layer and 0 < t < 1 and \
+                        math.hypot(track.x1 + t * dx - x, track.y1 + t * dy - y) <= half:
+                    cuts.setdefault(t, [])
+            core = [(track.x1, track.y1), (track.x2, track.y2)]
+            for layers, key, tap_core, radius, x, y in taps:
+                if track.layer in layers and core_distance(core, tap_core) <= radius + half + EPSILON:
+                    cuts.setdefault(along(x, y), []).append(key + (track.layer,))
+
+            points = []
+            for t in sorted(cuts):
+                x, y = track.x1 + t * dx, track.y1 + t * dy
+                node = self.node(('end', track.layer, *self._grid(x, y)))
+                for key in cuts[t]:
+                    self.uf.union(node, self.node(key))
+                points.append((x, y, node))
+            for (xa, ya, a), (xb, yb, b) in zip(points, points[1:]):
+                length = math.hypot(xb - xa, yb - ya)
+                if length < EPSILON:
+                    self.uf.union(a, b)
+                    continue
+                self.track_resistors.append((len(self.resistors), track))
+                self.resistors.append((a, b, resistivity * length / (track.width * thickness)))
+
+    @staticmethod
+    def _grid(x, y):
+        return round(x / EPSILON), round(y / EPSILON)
+
+    def node(self, key):
+        node_id = self.keys.get(key)
+        if node_id is None:
+            node_id = self.keys[key] = self.uf.add()
+        return node_id
+
+    def compact(self):
+        """(number of nodes, {raw node: dense id}) after merging."""
+        roots = sorted({self.uf.find(node) for node in self.keys.values()})
+        dense = {root: i for i, root in enumerate(roots)}
+        return len(roots), {node: dense[self.uf.find(node)] for node in self.keys.values()}
+
+
+def rail_loads(board, net, source):
+    """Load pads of a rail: the pads of its connectors (J*), source excluded,
+    grouped by connector."""
+    connectors = defaultdict(list)
+    for pad in board.net_items(net):
+        name = f'{pad.ref}.{pad.number}' if type(pad) is Pad else None
+        if name and name != source and pad.ref.startswith('J'):
+            connectors[pad.ref].append(name)
+    return dict(sorted(connectors.items()))
+
+
+def solve_rails(board, rails, fractions, temperature=20.0, **copper):
+    """Solve every rail for every load case in one sparse factorisation.
+
+    `rails` maps net -> (source pad, full current); `fractions` scales the
+    full current for the sweep. Returns {net: RailResult} where `drop` is
+    (cases, load pads) volts and `track_current` is (cases, track pieces)
+    amps; cases are the sweep with the load shared by all connectors, then
+    the sweep with all of it through each connector in turn.
+    """
+    resistivity = copper.pop('resistivity', COPPER_RESISTIVITY) * \
+        (1 + TEMPERATURE_COEFFICIENT * (temperature - 20.0))
+    fractions = np.asarray(fractions, dtype=float)
+
+    layouts, rows, cols, values = [], [], [], []
+    offset = 0
+    for net, (source, current) in rails.items():
+        network = RailNetwork(board, net, resistivity=resistivity, **copper)
+        size, dense = network.compact()
+        connectors = rail_loads(board, net, source)
+        a = np.array([dense[r[0]] for r in network.resistors], dtype=np.int64)
+        b = np.array([dense[r[1]] for r in network.resistors], dtype=np.int64)
+        g = 1.0 / np.array([r[2] for r in network.resistors]) if network.resistors else np.zeros(0)
+        # Nodes cut off from the source (e.g. joined only by a pour) are left out
+        graph = coo_matrix((np.ones(len(a)), (a, b)), shape=(size, size))
+        _, labels = connected_components(graph, directed=False)
+        source_node = dense[network.pad_nodes[source]]
+        reached = labels == labels[source_node]
+        solved = np.flatnonzero(reached & (np.arange(size) != source_node))
+        index = np.full(size, -1, dtype=np.int64)
+        index[solved] = offset + np.arange(len(solved))
+        ia, ib = index[a], index[b]
+        for p, q in ((ia, ib), (ib, ia)):
+            keep = p >= 0
+            rows.append(p[keep])
+            cols.append(p[keep])
+            values.append(g[keep])
+            keep &= q >= 0
+            rows.append(p[keep])
+            cols.append(q[keep])
+            values.append(-g[keep])
+        layouts.append((Rail(net, source, connectors, current), network, dense, index,
+                        reached, source_node, a, b, g))
+        offset += len(solved)
+
+    sweep = len(fractions)
+    cases = sweep * (1 + max((len(layout[0].connectors) for layout in layouts), default=0))
+    rhs = np.zeros((offset, cases))
+    for rail, network, dense, index, *_ in layouts:
+        groups = [[index[dense[network.pad_nodes[pad]]] for pad in pads]
+                  for pads in rail.connectors.values()]
+        groups = [[node for node in nodes if node >= 0] for nodes in groups]
+        shared = [node for nodes in groups for node in nodes]
+        for node in shared:
+            rhs[node, :sweep] += fractions * rail.current / len(shared)
+        for c, nodes in enumerate(groups, 1):
+            for node in nodes:
+                rhs[node, c * sweep:(c + 1) * sweep] += fractions * rail.current / len(nodes)
+
+    matrix = coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                        shape=(offset, offset)).tocsc()
+    drops = splu(matrix).solve(rhs) if offset else rhs
+    # Two extra rows: the sources (0 V drop) and nodes not reached (NaN)
+    drops = np.vstack([drops, np.zeros((1, cases)), np.full((1, cases), np.nan)])
+
+    results = {}
+    for rail, network, dense, index, reached, source_node, a, b, g in layouts:
+        lookup = np.where(reached, index, offset + 1)
+        lookup[source_node] = offset
+        pads = [pad for pads in rail.connectors.values() for pad in pads]
+        pad_rows = lookup[[dense[network.pad_nodes[pad]] for pad in pads]]
+        pieces = [i for i, _ in network.track_resistors]
+        current = (drops[lookup[b[pieces]]] - drops[lookup[a[pieces]]]).T * g[pieces]
+        results[rail.net] = RailResult(rail, pads, drops[pad_rows].T, current,
+                                       [track for _, track in network.track_resistors],
+                                       [pad for pad, row in zip(pads, pad_rows) if row == offset + 1])
+    return results
@@ -0,0 +1,311 @@
+"""
+Netlist extraction from the hierarchical schematics, without KiCad.
+
+Every connection point of every sheet instance (wire ends, junctions,
+symbol pins, labels, sheet pins, no-connect markers) is interned as an
+integer id from its coordinates in KiCad's schematic unit (100 nm), and
+connectivity is resolved with one union-find over those ids:
+
+  - a wire joins its end points and every connection point lying on it
+    (T-joints, pins and labels dropped on a wire); wires that merely cross
+    stay separate, as in KiCad
+  - local labels join by name within a sheet instance, global labels and
+    power symbols by name across the design
+  - a hierarchical label joins the matching pin of its sheet symbol in the
+    parent sheet
+
+Each point is visited a constant number of times (wires look up the points
+on them through per-row and per-column sorted lists), so all sheets resolve
+in one near-linear pass. Net names follow KiCad's driver priority (global
+label and power symbol, then local label, hierarchical label, sheet pin,
+then "Net-(REF-Pin)"), so they match the names on the board:
+
+    netlist = build_netlist('zudo-pd.kicad_sch')
+    netlist.net_of('U2', '4')        # 'Net-(U2-Feedback)'
+    netlist.pins('GND rail')         # [('C1', '1'), ('C2', '1'), ...]
+
+Buses and bus entries are not used in this design and are not resolved.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
+
+from kicad_schematic import load_hierarchy, natural_key, symbol_reference
+
+
+UNITS_PER_MM = 10000    # KiCad schematic internal unit: 100 nm
+NETLIST_FORMS = {'uuid', 'sheet', 'symbol', 'lib_symbols', 'wire', 'junction', 'label',
+                 'global_label', 'hierarchical_label', 'no_connect'}
+
+# KiCad's driver priorities (connection_graph.h), higher wins
+PIN, SHEET_PIN, HIER_LABEL, LOCAL_LABEL, POWER_PIN, GLOBAL = range(1, 7)
+
+Pin = namedtuple('Pin', 'ref number name type sheet')
+
+
+class UnionFind:
+    """Disjoint sets over dense integer ids (path halving, union by size)."""
+
+    def __init__(self):
+        self.parent = []
+        self.size = []
+
+    def add(self):
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        return len(self.parent) - 1
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+
+def to_units(value):
+    return int(round(value * UNITS_PER_MM))
+
+
+def symbol_transform(x, y, angle, mirror):
+    """Map library pin coordinates (y up) to sheet coordinates (y down)."""
+    a = math.radians(angle)
+    c, s = round(math.cos(a)), round(math.sin(a))
+
+    def place(px, py):
+        py = -py
+        if mirror == 'x':
+            py = -py
+        elif mirror == 'y':
+            px = -px
+        return x + px * c + py * s, y - px * s + py * c
+    return place
+
+
+def library_pins(lib_symbols):
+    """{lib_id: [(unit, body style, pin node)]} from a sheet's embedded library."""
+    pins = {}
+    if lib_symbols is None:
+        return pins
+    for definition in lib_symbols.find_all('symbol'):
+        lib_id = definition.items[0]
+        entries = []
+        for unit in definition.find_all('symbol'):
+            parts = unit.items[0].rsplit('_', 2)
+            # Unit or body style 0 means common to all units or styles
+            unit_no, style = (int(parts[1]), int(parts[2])) if len(parts) == 3 else (0, 0)
+            entries.extend((unit_no, style, pin) for pin in unit.find_all('pin'))
+        entries.extend((0, 0, pin) for pin in definition.find_all('pin'))
+        pins[lib_id] = (entries, definition.find('power') is not None)
+    return pins
+
+
+def _hidden(node):
+    if node.find('hide') is not None and node.value('hide') in (None, 'yes'):
+        return True
+    return 'hide' in node.atoms()
+
+
+class Netlist:
+    """Resolved nets: {net name: [Pin]} plus a (ref, number) -> net lookup."""
+
+    def __init__(self, nets, no_connects):
+        self.nets = nets
+        self.no_connects = no_connects
+        self._pin_net = {(pin.ref, pin.number): name for name, pins in nets.items() for pin in pins}
+
+    def net_of(self, ref, number):
+        return self._pin_net.get((ref, str(number)))
+
+    def pins(self, net):
+        return [(pin.ref, pin.number) for pin in self.nets.get(net, ())]
+
+    def table(self):
+        """[(net name, 'REF.PIN REF.PIN ...')] sorted by name."""
+        return [(name, ' '.join(f'{pin.ref}.{pin.number}' for pin in pins))
+                for name, pins in sorted(self.nets.items())]
+
+
+class _Builder:
+    def __init__(self):
+        self.uf = UnionFind()
+        self.ids = {}
+        self.drivers = defaultdict(list)     # point id -> [(priority, -depth, name)]
+        self.pins = []                       # (point id, Pin)
+        self.no_connect_ids = []
+
+    def node(self, key):
+        node_id = self.ids.get(key)
+        if node_id is None:
+            node_id = self.ids[key] = self.uf.add()
+        return node_id
+
+    def add_sheet(self, sheet_id, sheet, depth, prefix, child_paths):
+        root = sheet.root
+        points = set()
+
+        def at(node):
+            x, y = node.floats('at')[:2]
+            point = (to_units(x), to_units(y))
+            points.add(point)
+            return self.node((sheet_id, *point))
+
+        wires = []
+        for wire in root.find_all('wire'):
+            ends = [tuple(to_units(v) for v in xy.floats()) for xy in wire.find('pts').find_all('xy')]
+            wires.append(ends)
+            points.update(ends)
+        for junction in root.find_all('junction'):
+            at(junction)
+        for marker in root.find_all('no_connect'):
+            self.no_connect_ids.append(at(marker))
+
+        for label in root.find_all('label'):
+            name = label.items[0]
+            self.uf.union(at(label), self.node(('local', sheet_id, name)))
+            self.drivers[at(label)].append((LOCAL_LABEL, -depth, prefix + name))
+        for label in root.find_all('global_label'):
+            name = label.items[0]
+            self.uf.union(at(label), self.node(('global', name)))
+            self.drivers[at(label)].append((GLOBAL, 0, name))
+        for label in root.find_all('hierarchical_label'):
+            name = label.items[0]
+            self.uf.union(at(label), self.node(('hier', sheet_id, name)))
+            self.drivers[at(label)].append((HIER_LABEL, -depth, prefix + name))
+
+        for child in root.find_all('sheet'):
+            child_id = child_paths.get(child.value('uuid'))
+            for pin in child.find_all('pin'):
+                name = pin.items[0]
+                point = at(pin)
+                self.drivers[point].append((SHEET_PIN, -depth, prefix + name))
+                if child_id is not None:
+                    self.uf.union(point, self.node(('hier', child_id, name)))
+
+        library = library_pins(root.find('lib_symbols'))
+        for symbol in root.find_all('symbol'):
+            entries, is_power = library.get(symbol.value('lib_id'), ((), False))
+            ref = symbol_reference(symbol, sheet.path) or '?'
+            value = symbol.property('Value', '')
+            x, y, *angle = symbol.floats('at') + [0.0]
+            place = symbol_transform(x, y, angle[0], symbol.value('mirror'))
+            unit = int(symbol.value('unit', 1))
+            style = int(symbol.value('body_style', symbol.value('convert', 1)))
+            for unit_no, pin_style, pin in entries:
+                if (unit_no not in (0, unit)) or (pin_style not in (0, style)):
+                    continue
+                px, py = place(*pin.floats('at')[:2])
+                point_key = (to_units(px), to_units(py))
+                points.add(point_key)
+                point = self.node((sheet_id, *point_key))
+                pin_type = pin.atoms()[0] if pin.atoms() else ''
+                pin_name = pin.value('name', '')
+                if is_power:
+                    # Power symbols name a global net; flags (power_out) just mark it
+                    if pin_type == 'power_in':
+                        self.uf.union(point, self.node(('global', value)))
+                        self.drivers[point].append((POWER_PIN, 0, value))
+                    continue
+                if pin_type == 'power_in' and _hidden(pin):
+                    # Legacy invisible power pins join the net of their name
+                    self.uf.union(point, self.node(('global', pin_name)))
+                    self.drivers[point].append((POWER_PIN, 0, pin_name))
+                self.pins.append((point, Pin(ref, pin.value('number', ''), pin_name,
+                                             pin_type, sheet.name)))
+
+        self._connect_wires(sheet_id, wires, points)
+
+    def _connect_wires(self, sheet_id, wires, points):
+        rows, columns = defaultdict(list), defaultdict(list)
+        for x, y in points:
+            rows[y].append(x)
+            columns[x].append(y)
+        for values in rows.values():
+            values.sort()
+        for values in columns.values():
+            values.sort()
+
+        for ends in wires:
+            for (x1, y1), (x2, y2) in zip(ends, ends[1:]):
+                first = self.node((sheet_id, x1, y1))
+                if y1 == y2:
+                    xs = rows[y1]
+                    lo, hi = sorted((x1, x2))
+                    on_wire = [(x, y1) for x in xs[bisect_left(xs, lo):bisect_right(xs, hi)]]
+                elif x1 == x2:
+                    ys = columns[x1]
+                    lo, hi = sorted((y1, y2))
+                    on_wire = [(x1, y) for y in ys[bisect_left(ys, lo):bisect_right(ys, hi)]]
+                else:
+                    on_wire = [p for p in points if _on_segment(p, x1, y1, x2, y2)]
+                for x, y in on_wire:
+                    self.uf.union(first, self.node((sheet_id, x, y)))
+
+    def resolve(self):
+        find = self.uf.find
+        members = defaultdict(list)
+        for point, pin in self.pins:
+            members[find(point)].append(pin)
+        drivers = defaultdict(list)
+        for point, candidates in self.drivers.items():
+            drivers[find(point)].extend(candidates)
+        no_connect = {find(point) for point in self.no_connect_ids}
+
+        nets, flagged = {}, set()
+        for root, pins in members.items():
+            pins.sort(key=lambda pin: (natural_key(pin.ref), natural_key(pin.number)))
+            if drivers[root]:
+                # Highest priority, then the sheet nearest the root, then by name
+                name = min(drivers[root], key=lambda d: (-d[0], -d[1], d[2]))[2]
+            else:
+                name = min((_default_name(pin, unconnected=len(pins) == 1) for pin in pins),
+                           key=_pin_driver_key)
+            nets.setdefault(name, []).extend(pins)
+            if root in no_connect:
+                flagged.add(name)
+        return Netlist(nets, flagged)
+
+
+def _default_name(pin, unconnected=False):
+    """KiCad's name for a net driven by nothing but pins."""
+    named = pin.name not in ('', '~', pin.number)
+    if unconnected:
+        return f"unconnected-({pin.ref}-{f'{pin.name}-' if named else ''}Pad{pin.number})"
+    return f'Net-({pin.ref}-{pin.name})' if named else f'Net-({pin.ref}-Pad{pin.number})'
+
+
+def _pin_driver_key(name):
+    # KiCad prefers a named pin ("Net-(U2-Feedback)") over "-PadN", then sorts
+    return ('-Pad' in name, name)
+
+
+def _on_segment(point, x1, y1, x2, y2):
+    x, y = point
+    if (x - x1) * (y2 - y1) != (y - y1) * (x2 - x1):
+        return False
+    return min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2)
+
+
+def build_netlist(root_file):
+    """Resolve the nets of the schematic hierarchy rooted at `root_file`."""
+    sheets = load_hierarchy(root_file, forms=NETLIST_FORMS)
+    builder = _Builder()
+    for sheet_id, sheet in enumerate(sheets):
+        depth = sheet.path.count('/') - 1
+        names = [s.name for s in sheets[1:] if sheet.path.startswith(s.path)]
+        prefix = '/' + ''.join(f'{name}/' for name in names)
+        child_paths = {s.path.rsplit('/', 1)[1]: i for i, s in enumerate(sheets)
+                       if s.path.rsplit('/', 1)[0] == sheet.path}
+        builder.add_sheet(sheet_id, sheet, depth, prefix, child_paths)
+    return builder.resolve()
@@ -0,0 +1,80 @@
+"""
+Hierarchical schematic loading for the KiCad tools.
+
+zudo-pd.kicad_sch is the root sheet; its `(sheet ...)` forms point at the
+sub-sheets (usb-pd-input, dc-dc-conversion, linear-regulation, output).
+`load_hierarchy` walks them depth first and returns one Sheet per
+instance, with the instance path KiCad uses in `(instances ...)` blocks,
+so symbol references resolve correctly even when a sheet file is used
+more than once.
+
+    for sheet in load_hierarchy('zudo-pd.kicad_sch'):
+        for symbol, ref in sheet_symbols(sheet):
+            print(sheet.name, ref, symbol.property('Value'))
+"""
+
+import re
+from collections import namedtuple
+from pathlib import Path
+
+from kicad_sexpr import load
+
+
+SHEET_FORMS = {'uuid', 'sheet', 'symbol', 'wire', 'junction', 'label',
+               'global_label', 'hierarchical_label', 'no_connect', 'lib_symbols'}
+
+Sheet = namedtuple('Sheet', 'name file path root')
+
+
+def load_hierarchy(root_file, forms=SHEET_FORMS):
+    """Load the root sheet and every sub-sheet instance beneath it.
+
+    Returns Sheets in depth-first order (root first). `path` is the
+    instance path ('/root-uuid/sheet-uuid/...'); `root` is the parsed file
+    with only `forms` materialised (parsed once per file).
+    """
+    root_file = Path(root_file)
+    parsed = {}
+
+    def parse(file):
+        if file not in parsed:
+            parsed[file] = load(file, forms=forms | {'uuid', 'sheet'})
+        return parsed[file]
+
+    root = parse(root_file)
+    sheets = []
+
+    def walk(name, file, path, node, stack):
+        sheets.append(Sheet(name, file, path, node))
+        for child in node.find_all('sheet'):
+            child_file = file.parent / child.property('Sheetfile', '')
+            if child_file.resolve() in stack or not child_file.is_file():
+                continue
+            walk(child.property('Sheetname', child_file.stem), child_file,
+                 f"{path}/{child.value('uuid')}", parse(child_file),
+                 stack | {child_file.resolve()})
+
+    walk(root_file.stem, root_file, f"/{root.value('uuid')}", root, {root_file.resolve()})
+    return sheets
+
+
+def symbol_reference(symbol, path):
+    """Reference of a placed symbol in the sheet instance at `path`."""
+    instances = symbol.find('instances')
+    if instances is not None:
+        for project in instances.find_all('project'):
+            for instance in project.find_all('path'):
+                if instance.value() == path:
+                    return instance.value('reference')
+    return symbol.property('Reference')
+
+
+def sheet_symbols(sheet):
+    """(symbol node, reference) for each placed symbol of one sheet instance."""
+    return [(symbol, symbol_reference(symbol, sheet.path))
+            for symbol in sheet.root.find_all('symbol')]
+
+
+def natural_key(ref):
+    """Sort key putting C2 before C10."""
+    return [int(piece) if piece.isdigit() else piece for piece in re.split(r'(\d+)', ref)]
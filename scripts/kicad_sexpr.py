@@ -0,0 +1,239 @@
+"""
+Streaming S-expression parser for KiCad files (.kicad_pcb, .kicad_sch,
+.kicad_mod, .kicad_sym).
+
+The file is memory-mapped and tokenised with one compiled regular expression,
+so the scan runs in C and the Python loop only builds the tree. Nodes use
+`__slots__` and keep atoms as plain strings (numbers are converted on access),
+which keeps a 1.5 MB board to a few hundred thousand small objects.
+
+Lazy mode materialises only the requested top-level forms. KiCad writes every
+top-level form on a line starting with one tab, so their byte ranges are
+found with a single regex pass over the mapped file without tokenising the
+rest:
+
+    board = load('zudo-pd.kicad_pcb', forms={'segment', 'via'})
+    for seg in board.find_all('segment'):
+        (x1, y1), (x2, y2) = seg.find('start').floats(), seg.find('end').floats()
+
+`top_level_forms` exposes those byte ranges (used by the incremental cache).
+"""
+
+import math
+import mmap
+import re
+from pathlib import Path
+
+
+TOKEN_RE = re.compile(r'\(|\)|"(?:[^"\\]|\\.)*"|[^\s()"]+')
+# A top-level form as written by KiCad's formatter: newline, one tab, "("
+TOP_LEVEL_RE = re.compile(rb'\n\t\(([^\s()"]+)')
+# Hand-edited or foreign formatting: a form opened on a space-indented line
+FOREIGN_INDENT_RE = re.compile(rb'\n +\(')
+# Only what changes nesting depth (used by the exact fallback scan)
+STRUCTURE_RE = re.compile(rb'\(|\)|"(?:[^"\\]|\\.)*"')
+ESCAPES = {'\\"': '"', '\\\\': '\\', '\\n': '\n', '\\t': '\t'}
+ESCAPE_RE = re.compile(r'\\.')
+
+
+class SExprError(ValueError):
+    """Raised for unbalanced or otherwise malformed S-expressions."""
+
+
+class Node:
+    """One parenthesised form: `(name item item ...)`.
+
+    `items` holds the arguments in order: nested Nodes and atoms (str).
+    """
+
+    __slots__ = ('name', 'items')
+
+    def __init__(self, name, items):
+        self.name = name
+        self.items = items
+
+    def __repr__(self):
+        return f'<Node {self.name} ({len(self.items)} items)>'
+
+    def __reduce__(self):
+        # Compact pickles for the parse cache (no per-node slot dicts)
+        return Node, (self.name, self.items)
+
+    def __iter__(self):
+        """Iterate the child nodes (atoms are skipped)."""
+        return (item for item in self.items if type(item) is Node)
+
+    def find(self, name):
+        """Return the first child node called `name`, or None."""
+        for item in self.items:
+            if type(item) is Node and item.name == name:
+                return item
+        return None
+
+    def find_all(self, name):
+        """Return every child node called `name`."""
+        return [item for item in self.items if type(item) is Node and item.name == name]
+
+    def atoms(self):
+        """Return the atom (string) arguments in order."""
+        return [item for item in self.items if type(item) is str]
+
+    def value(self, name=None, default=None):
+        """First atom of this node, or of its child `name`."""
+        node = self if name is None else self.find(name)
+        if node is not None:
+            for item in node.items:
+                if type(item) is str:
+                    return item
+        return default
+
+    def floats(self, name=None):
+        """Numeric atoms of this node (or of child `name`) as floats."""
+        node = self if name is None else self.find(name)
+        if node is None:
+            return []
+        return [float(item) for item in node.items if type(item) is str and _is_number(item)]
+
+    def property(self, key, default=None):
+        """Value of a `(property "key" "value" ...)` child (footprints, symbols)."""
+        for item in self.items:
+            if type(item) is Node and item.name == 'property' and item.items and item.items[0] == key:
+                return item.items[1] if len(item.items) > 1 else default
+        return default
+
+
+def _is_number(text):
+    # Words float() accepts ('inf', 'nan') are names, not numbers, in KiCad files
+    try:
+        return math.isfinite(float(text))
+    except ValueError:
+        return False
+
+
+def _unquote(token):
+    body = token[1:-1]
+    if '\\' in body:
+        body = ESCAPE_RE.sub(lambda m: ESCAPES.get(m.group(0), m.group(0)[1]), body)
+    return body
+
+
+def parse_text(text):
+    """Parse S-expression text into a list of top-level Nodes."""
+    stack = []
+    items = []
+    push = stack.append
+    pop = stack.pop
+    for token in TOKEN_RE.findall(text):
+        if token == '(':
+            push(items)
+            items = []
+        elif token == ')':
+            if not stack:
+                raise SExprError('unbalanced ")"')
+            node = Node(items[0], items[1:]) if items and type(items[0]) is str else Node('', items)
+            items = pop()
+            items.append(node)
+        elif token[0] == '"':
+            items.append(_unquote(token))
+        else:
+            items.append(token)
+    if stack:
+        raise SExprError(f'{len(stack)} unclosed "("')
+    return [item for item in items if type(item) is Node]
+
+
+def parse(data):
+    """Parse a whole document (str or bytes) and return its root Node."""
+    if not isinstance(data, str):
+        data = bytes(data).decode('utf-8')
+    forms = parse_text(data)
+    if len(forms) != 1:
+        raise SExprError(f'expected one root form, found {len(forms)}')
+    return forms[0]
+
+
+def _scan_forms(buf, pos=0, endpos=None, depth=0):
+    """Exact scan: track depth over every paren between `pos` and `endpos`.
+
+    Returns ([(name, start, end)] of the depth-2 forms closed in the range,
+    depth at `endpos`).
+    """
+    forms, start = [], None
+    endpos = len(buf) if endpos is None else endpos
+    for match in STRUCTURE_RE.finditer(buf, pos, endpos):
+        token = match.group(0)
+        if token == b'(':
+            depth += 1
+            if depth == 2:
+                start = match.start()
+        elif token == b')':
+            if depth == 2 and start is not None:
+                name = re.match(rb'\(([^\s()"]+)', buf[start:start + 128])
+                forms.append((name.group(1).decode() if name else '', start, match.end()))
+            depth -= 1
+    return forms, depth
+
+
+def top_level_forms(buf):
+    """Return [(name, start, end)] byte ranges of the root's child forms.
+
+    Uses KiCad's one-tab indentation to find the forms with one regex pass.
+    Forms written on the root's own first line (older footprint files) are
+    found by an exact scan of that line; anything that does not look
+    KiCad-formatted (no tab-indented forms, space indentation) falls back to
+    an exact scan of the whole file.
+    """
+    starts = [(m.group(1).decode(), m.start() + 2) for m in TOP_LEVEL_RE.finditer(buf)]
+    root_end = buf.rfind(b')')
+    if not starts or root_end < 0 or FOREIGN_INDENT_RE.search(buf):
+        return _exact_forms(buf)
+
+    forms, depth = _scan_forms(buf, 0, starts[0][1])
+    if depth != 1:
+        return _exact_forms(buf)
+    for i, (name, start) in enumerate(starts):
+        limit = starts[i + 1][1] if i + 1 < len(starts) else root_end
+        end = buf.rfind(b')', start, limit) + 1
+        if end <= start:
+            return _exact_forms(buf)
+        forms.append((name, start, end))
+    return forms
+
+
+def _exact_forms(buf):
+    forms, depth = _scan_forms(buf)
+    if depth:
+        raise SExprError(f'{depth} unclosed "("')
+    return forms
+
+
+def root_name(buf):
+    match = re.match(rb'\s*\(([^\s()"]+)', buf[:256])
+    if not match:
+        raise SExprError('no root form')
+    return match.group(1).decode()
+
+
+def parse_forms(buf, ranges):
+    """Parse the given (name, start, end) ranges of `buf` into Nodes."""
+    nodes = []
+    for _, start, end in ranges:
+        nodes.extend(parse_text(buf[start:end].decode('utf-8')))
+    return nodes
+
+
+def load(path, forms=None):
+    """Parse a KiCad file through a memory map and return its root Node.
+
+    With `forms` (a set of top-level form names) only those children are
+    materialised, in file order; everything else is skipped unparsed.
+    """
+    path = Path(path)
+    with open(path, 'rb') as f:
+        if path.stat().st_size == 0:
+            raise SExprError(f'{path} is empty')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if forms is None:
+                return parse(buf[:])
+            ranges = [r for r in top_level_forms(buf) if r[0] in forms]
+            return Node(root_name(buf), parse_forms(buf, ranges))
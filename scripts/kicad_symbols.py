@@ -0,0 +1,159 @@
+"""
+Cached pin index of a KiCad symbol library (.kicad_sym).
+
+Each symbol is reduced once to a LibrarySymbol (pin table, body box,
+properties) and the index is pickled to `.kicad-cache/` keyed by the hash
+of each symbol's top-level form. `update` splits the library with
+kicad_sexpr.top_level_forms, hashes every symbol and parses only those
+whose text changed, so a refresh after editing one symbol parses one
+symbol:
+
+    symbols = load_symbols('symbols/zudo-pd.kicad_sym')
+    [(pin.number, pin.name, pin.side) for pin in symbols['LM2596S-ADJ'].pins]
+    symbols.stats                  # {'symbols': 70, 'parsed': 1, 'reused': 71, ...}
+
+Coordinates are symbol-editor mm with y up. `side` is the body edge a
+pin sticks out of: a pin pointing right (angle 0) is on the left edge.
+Names keep KiCad markup such as `~{ON}/OFF`. When the library defines a
+symbol twice the first definition is kept and the name is listed in
+`duplicates`.
+"""
+
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from kicad_cache import CACHE_DIR_NAME, form_digest, load_pickle, save_pickle
+from kicad_sexpr import SExprError, parse_text, root_name, top_level_forms
+
+
+INDEX_VERSION = 1
+# Pin angle (direction from the pin's end towards the body) -> body edge
+PIN_SIDES = {0: 'left', 90: 'bottom', 180: 'right', 270: 'top'}
+
+SymbolPin = namedtuple('SymbolPin', 'number name side x y length type unit hidden')
+LibrarySymbol = namedtuple('LibrarySymbol', 'name extends properties pins body digest')
+
+
+def _hidden(node):
+    hide = node.find('hide')
+    if hide is not None and hide.value() in (None, 'yes'):
+        return True
+    return 'hide' in node.atoms()
+
+
+def _bbox(points):
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+    return (min(xs), min(ys), max(xs), max(ys)) if points else None
+
+
+def parse_symbol(node, digest=None):
+    """LibrarySymbol from one top-level `(symbol ...)` node."""
+    name = node.items[0]
+    pins, corners = [], []
+    units = [(0, node)]
+    for unit in node.find_all('symbol'):
+        parts = unit.items[0].rsplit('_', 2)
+        units.append((int(parts[1]) if len(parts) == 3 else 0, unit))
+    for unit_no, unit in units:
+        for rectangle in unit.find_all('rectangle'):
+            corners += [tuple(rectangle.floats('start')), tuple(rectangle.floats('end'))]
+        for pin in unit.find_all('pin'):
+            x, y, *angle = pin.floats('at') + [0.0]
+            kind = (pin.atoms() + [''])[0]
+            pin_name = pin.value('name', '')
+            pins.append(SymbolPin(pin.value('number', ''), '' if pin_name == '~' else pin_name,
+                                  PIN_SIDES.get(round(angle[0]) % 360, 'left'), x, y,
+                                  (pin.floats('length') or [0.0])[0], kind, unit_no, _hidden(pin)))
+    body = _bbox(corners) or _bbox([(pin.x, pin.y) for pin in pins])
+    properties = {prop.items[0]: prop.items[1] for prop in node.find_all('property')
+                  if len(prop.items) > 1 and type(prop.items[1]) is str}
+    return LibrarySymbol(name, node.value('extends'), properties, tuple(pins), body, digest)
+
+
+class SymbolIndex:
+    """Symbols of one .kicad_sym, refreshed by per-symbol content hash."""
+
+    def __init__(self, path, cache_file=None):
+        self.path = Path(path).resolve()
+        self.cache_file = Path(cache_file) if cache_file else \
+            self.path.parent / CACHE_DIR_NAME / f'{self.path.name}.symbols.pickle'
+        self.symbols = {}
+        self.duplicates = []
+        self.stats = {}
+        self._by_digest = {}
+        self._dirty = False
+        self._read()
+
+    def _read(self):
+        state = load_pickle(self.cache_file)
+        if isinstance(state, dict) and state.get('version') == INDEX_VERSION:
+            self._by_digest = state.get('symbols', {})
+
+    def update(self):
+        """Re-parse symbols whose text changed; drop removed ones."""
+        started = time.perf_counter()
+        buf = self.path.read_bytes()
+        if root_name(buf) != 'kicad_symbol_lib':
+            raise SExprError(f'{self.path}: not a symbol library')
+        by_digest, symbols, duplicates, parsed = {}, {}, [], 0
+        for name, start, end in top_level_forms(buf):
+            if name != 'symbol':
+                continue
+            digest = form_digest(buf[start:end])
+            symbol = self._by_digest.get(digest)
+            if symbol is None:
+                node, = parse_text(buf[start:end].decode('utf-8'))
+                symbol = parse_symbol(node, digest)
+                parsed += 1
+            by_digest[digest] = symbol
+            if symbol.name in symbols:
+                duplicates.append(symbol.name)
+            else:
+                symbols[symbol.name] = symbol
+        # Derived symbols draw the parent's body and pins
+        for name, symbol in symbols.items():
+            parent = symbols.get(symbol.extends)
+            if parent is not None and not symbol.pins:
+                symbols[name] = symbol._replace(pins=parent.pins, body=parent.body)
+        self._dirty = parsed > 0 or by_digest.keys() != self._by_digest.keys()
+        self._by_digest = by_digest
+        self.symbols = symbols
+        self.duplicates = duplicates
+        self.stats = {'symbols': len(symbols), 'parsed': parsed, 'reused': len(by_digest) - parsed,
+                      'ms': (time.perf_counter() - started) * 1000}
+        return self
+
+    def save(self):
+        """Write the index if anything changed since it was read."""
+        if not self._dirty:
+            return False
+        save_pickle(self.cache_file, {'version': INDEX_VERSION, 'symbols': self._by_digest})
+        self._dirty = False
+        return True
+
+    def get(self, name, default=None):
+        """Symbol by name or 'nickname:name' lib_id."""
+        symbol = self.symbols.get(name)
+        if symbol is None and ':' in name:
+            symbol = self.symbols.get(name.split(':', 1)[1])
+        return symbol if symbol is not None else default
+
+    def __getitem__(self, name):
+        symbol = self.get(name)
+        if symbol is None:
+            raise KeyError(name)
+        return symbol
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def names(self):
+        return sorted(self.symbols)
+
+
+def load_symbols(path, cache_file=None):
+    """One-shot: read the cache, refresh it from the library, save it."""
+    index = SymbolIndex(path, cache_file).update()
+    index.save()
+    return index
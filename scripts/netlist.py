@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Print the resolved netlist of the schematic hierarchy (no KiCad needed).
+
+Builds the nets of zudo-pd.kicad_sch and its sub-sheets with
+kicad_netlist.py and prints a net -> pins table, one net per line.
+
+Usage:
+    python3 scripts/netlist.py                    # Every net
+    python3 scripts/netlist.py --net GND          # One net's pins
+    python3 scripts/netlist.py --pin U2 4         # Net of a pin
+    python3 scripts/netlist.py --json nets.json   # {net: ["REF.PIN", ...]}
+    python3 scripts/netlist.py --check-board      # Pins whose board net differs
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from kicad_board import load_board
+from kicad_netlist import build_netlist
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SCHEMATIC = REPO_ROOT / 'zudo-pd.kicad_sch'
+DEFAULT_BOARD = REPO_ROOT / 'zudo-pd.kicad_pcb'
+
+
+def check_board(netlist, board_file):
+    """Print pins whose net on the board differs; return the count."""
+    board = load_board(board_file)
+    differences = 0
+    seen = set()
+    for pad in board.pads:
+        key = (pad.ref, pad.number)
+        net = netlist.net_of(*key)
+        if net is None or key in seen:
+            continue
+        seen.add(key)
+        if net != pad.net:
+            differences += 1
+            print(f"✗ {pad.ref}.{pad.number}: schematic {net}, board {pad.net or '(no net)'}")
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resolve the schematic netlist.')
+    parser.add_argument('--schematic', type=Path, default=DEFAULT_SCHEMATIC,
+                        help=f'root schematic (default {DEFAULT_SCHEMATIC.name})')
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument('--net', metavar='NAME', help="print one net's pins")
+    query.add_argument('--pin', nargs=2, metavar=('REF', 'NUMBER'), help='print the net of a pin')
+    query.add_argument('--json', type=Path, metavar='PATH', help='write {net: [REF.PIN]} as JSON')
+    query.add_argument('--check-board', action='store_true',
+                       help=f'compare pin nets with {DEFAULT_BOARD.name}')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    netlist = build_netlist(args.schematic)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.net:
+        pins = netlist.pins(args.net)
+        if not pins:
+            print(f"✗ No net {args.net}")
+            sys.exit(1)
+        print(' '.join(f'{ref}.{number}' for ref, number in pins))
+    elif args.pin:
+        net = netlist.net_of(*args.pin)
+        if net is None:
+            print(f"✗ No pin {'.'.join(args.pin)}")
+            sys.exit(1)
+        print(net)
+    elif args.json:
+        args.json.write_text(json.dumps({name: pins.split() for name, pins in netlist.table()},
+                                        indent=2) + '\n', encoding='utf-8')
+        print(f"✓ Wrote {len(netlist.nets)} nets to {args.json}")
+    elif args.check_board:
+        differences = check_board(netlist, DEFAULT_BOARD)
+        if differences:
+            print(f"\n{differences} pin(s) differ between schematic and board")
+            sys.exit(1)
+        print("✓ Schematic and board nets match")
+    else:
+        width = max(len(name) for name in netlist.nets)
+        for name, pins in netlist.table():
+            print(f"{name:<{width}}  {pins}")
+        print(f"\n{len(netlist.nets)} nets ({elapsed_ms:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
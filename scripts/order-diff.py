@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Show what changed between JLCPCB order snapshots (needs numpy).
+
+Compares BOM rows, CPL placement (position, rotation, side) and the
+Gerber/drill layers (XOR of the rasterised images) between snapshot
+folders of jlcpcb-order-snapshots/ (see jlcpcb_diff.py). With no
+arguments every snapshot is compared with the next one; each snapshot is
+parsed once. Exits with status 1 when anything differs.
+
+Usage:
+    python3 scripts/order-diff.py                          # Consecutive snapshots
+    python3 scripts/order-diff.py --all-pairs              # Every pair
+    python3 scripts/order-diff.py A B                      # Two folders
+    python3 scripts/order-diff.py A B --xor-png diff/      # Also write XOR images
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+from gerber import write_png
+from jlcpcb_diff import DEFAULT_DPI, Snapshot, diff_bom, diff_cpl, diff_gerbers, find_snapshots, hole_changes
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SNAPSHOTS = REPO_ROOT / 'jlcpcb-order-snapshots'
+
+
+def compare(a, b, dpi, xor_dir):
+    """Print the differences of one pair; return True if there are any."""
+    print(f"\n{a.name} -> {b.name}")
+    differs = False
+    for label, changes, present in (('BOM', diff_bom(a, b), a.bom or b.bom),
+                                    ('CPL', diff_cpl(a, b), a.cpl or b.cpl)):
+        if not present:
+            continue
+        if not changes:
+            print(f"  ✓ {label}: no changes")
+        for change in changes:
+            print(f"  ✗ {label} {change.ref} {change.kind}: {change.detail}")
+        differs |= bool(changes)
+
+    layer_diffs = diff_gerbers(a, b, dpi)
+    if not layer_diffs:
+        missing = [s.name for s in (a, b) if s.gerber_source is None]
+        print(f"  - Gerbers: none in {', '.join(missing)}")
+        return differs
+    changed = [d for d in layer_diffs if d.status != 'same']
+    if not changed:
+        print(f"  ✓ Gerbers: no changes ({len(layer_diffs)} layers at {dpi} dpi)")
+    for d in changed:
+        if d.status == 'changed':
+            x1, y1, x2, y2 = d.bbox
+            print(f"  ✗ {d.layer}: {d.area:.2f} mm² differ within "
+                  f"({x1:.2f}, {y1:.2f})-({x2:.2f}, {y2:.2f})")
+            if xor_dir:
+                bounds = _pair_bounds(a, b)
+                xor_dir.mkdir(parents=True, exist_ok=True)
+                write_png(xor_dir / f"{d.layer.replace(',', '_')}.png",
+                          a.image(d.layer, bounds, dpi) ^ b.image(d.layer, bounds, dpi))
+        else:
+            print(f"  ✗ {d.layer}: {d.status}")
+    for key, (added, removed) in sorted(hole_changes(a, b).items()):
+        print(f"  ✗ {key}: {added} holes added, {removed} removed")
+    return differs or bool(changed)
+
+
+def _pair_bounds(a, b):
+    (ax1, ay1, ax2, ay2), (bx1, by1, bx2, by2) = a.fabrication.bounds, b.fabrication.bounds
+    return min(ax1, bx1), min(ay1, by1), max(ax2, bx2), max(ay2, by2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare JLCPCB order snapshots.')
+    parser.add_argument('snapshots', nargs='*', type=Path,
+                        help='snapshot folders (default: every folder in jlcpcb-order-snapshots/)')
+    parser.add_argument('--all-pairs', action='store_true', help='compare every pair, not just neighbours')
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI,
+                        help=f'raster resolution for the Gerber XOR (default {DEFAULT_DPI})')
+    parser.add_argument('--xor-png', type=Path, metavar='DIR',
+                        help='write the XOR image of each changed layer (two snapshots only)')
+    args = parser.parse_args()
+
+    if args.snapshots:
+        snapshots = [Snapshot(path, REPO_ROOT if path.resolve().is_relative_to(REPO_ROOT) else None)
+                     for path in (p.resolve() for p in args.snapshots)]
+    else:
+        snapshots = find_snapshots(SNAPSHOTS)
+    if len(snapshots) < 2:
+        print("✗ Need at least two snapshots to compare")
+        sys.exit(1)
+
+    pairs = itertools.combinations(snapshots, 2) if args.all_pairs else zip(snapshots, snapshots[1:])
+    xor_dir = args.xor_png if len(snapshots) == 2 else None
+    started = time.perf_counter()
+    differs = False
+    count = 0
+    for a, b in pairs:
+        differs |= compare(a, b, args.dpi, xor_dir)
+        count += 1
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"\n{count} pair(s) compared ({elapsed_ms:.0f} ms)")
+    if differs:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()